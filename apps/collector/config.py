@@ -25,6 +25,16 @@ NDL_DATE_UNTIL = os.environ.get("NDL_DATE_UNTIL", date.today().isoformat())
 NDL_API_BASE = "https://kokkai.ndl.go.jp/api/speech"
 NDL_RATE_LIMIT_SEC = 0.5  # 1リクエスト / 0.5秒
 
+# ============================================================
+# スクレイピングのホスト別予算（utils.host_budget）
+# ============================================================
+# ホスト → (同時リクエスト数, リクエスト開始間隔の下限秒)
+HOST_BUDGETS: dict[str, tuple[int, float]] = {
+    "www.sangiin.go.jp": (3, 0.4),
+    "www.shugiin.go.jp": (3, 0.4),
+}
+DEFAULT_HOST_BUDGET: tuple[int, float] = (1, 1.0)
+
 # ============================================================
 # 政党名正規化マップ
 # 会派名(部分一致) → 表示用政党名
@@ -69,20 +79,31 @@ PARTY_MAP_KEYS_SORTED = sorted(PARTY_MAP.keys(), key=len, reverse=True)
 RULING_PARTIES: list[str] = ["自民党", "日本維新の会"]
 
 # ============================================================
-# 質問主意書 — セッション別最大番号（衆議院）
+# 国会回次レジストリ（session_registry.py）
 # ============================================================
-SESSION_MAX: dict[int, int] = {
+# レジストリが未保存のときに探索を始める回次（既知の回次。古くても探索で追いつく）
+SESSION_REGISTRY_SEED = 221
+# 質問主意書・請願の収集開始回次
+QUESTION_START_SESSION = 196
+PETITION_START_SESSION = 196
+# 閉会した回次の衆院質問主意書の最終番号（旧 SESSION_MAX の手動管理値）
+# レジストリ初回作成時の question_counts の初期値。保存済みの questions の最大番号の方が大きければそちらを使う
+QUESTION_COUNT_SEED: dict[int, int] = {
     196: 487, 197: 145, 198: 309, 199: 20,
     200: 186, 201: 276, 202: 31, 203: 83,
     204: 236, 205: 22, 206: 22, 207: 42,
     208: 156, 209: 41, 210: 68, 211: 156,
     212: 141, 213: 206, 214: 56, 215: 51,
     216: 107, 217: 352, 218: 21, 219: 205,
-    220: 8, 221: 9999,  # 進行中 — 早期終了ロジックで実際の件数に合わせて停止する
+    220: 8,
 }
-# SESSION_MAX に含まれていない新しいセッションを動的に発見して追加する際の開始点
-# shitsumon_scraper.py が max(SESSION_MAX) + 1 以降も自動試行する
-SESSION_MAX_NEXT_START = max(SESSION_MAX) + 1
+
+# ============================================================
+# 未確定レコードの再確認キュー（sources/refresh_queue.py）
+# ============================================================
+REFRESH_PAGE_BUDGET = 200       # 1回の実行で再確認に使うページ数の上限
+REFRESH_BACKOFF_BASE_DAYS = 1   # n 回目の再確認で未確定なら BASE × 2^(n−1) 日後に再確認する
+REFRESH_BACKOFF_MAX_DAYS = 32
 
 # ============================================================
 # ワードクラウド — ストップワード
@@ -128,10 +149,28 @@ PROCEDURAL_ROLES: tuple[str, ...] = ("委員長", "会長", "議長")
 # 200bytes/行 × 500,000行 ≈ 100MB。Supabase 無料プランの容量制限を守るための安全水準
 SPEECHES_MAX_ROWS = 500_000
 
+# ============================================================
+# スコア再計算（processors/scoring.py）
+# ============================================================
+# 日次は score_journal の差分のみ適用し、この日数ごとに全件走査で検証・補正する
+SCORING_FULL_RECONCILE_DAYS = 7
+
+# ============================================================
+# 政党採決一致率（sources/vote_alignment.py）
+# ============================================================
+# 日次は新しい採決ページの差分のみ適用し、この日数ごとに全件再計算で検証・置換する
+ALIGNMENT_FULL_REBUILD_DAYS = 7
+
 # ============================================================
 # Supabase バッチサイズ
 # ============================================================
 UPSERT_BATCH_SIZE = 500  # 大量upsert時の分割サイズ
+IN_FILTER_CHUNK = 200    # in_ フィルタ1回あたりの値の数（URL 長制限対策、db.delete_in / update_in）
+SUPABASE_MAX_ROWS = 1000 # PostgREST の max_rows（1レスポンスの行数上限。超えた分は黙って切り捨てられる）
+
+# 全件走査（db.fetch_columns）の並行度
+SCAN_PARTITIONS = 8  # キー範囲の分割数
+SCAN_WORKERS = 4     # 同時リクエスト数の上限
 
 # ============================================================
 # ログ設定
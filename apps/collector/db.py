@@ -1,17 +1,29 @@
 """
 はたらく議員 — DB接続・ヘルパー
-Supabase クライアントのシングルトン管理、リトライ付きクエリ、バッチ upsert を提供する。
+Supabase クライアントのシングルトン管理、リトライ付きクエリ、バッチ upsert、列指向の全件取得を提供する。
 """
 
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from typing import Any
 
 from supabase import create_client, Client
 
-from config import SUPABASE_URL, SUPABASE_KEY, UPSERT_BATCH_SIZE
+from config import (
+    SUPABASE_URL,
+    SUPABASE_KEY,
+    UPSERT_BATCH_SIZE,
+    IN_FILTER_CHUNK,
+    SCAN_PARTITIONS,
+    SCAN_WORKERS,
+    SUPABASE_MAX_ROWS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +127,56 @@ def batch_upsert(
     return total
 
 
+# ============================================================
+# バッチ UPDATE（upsert 不可のテーブル向け）
+# ============================================================
+def bulk_update(
+    table: str,
+    rows: list[dict[str, Any]],
+    *,
+    key: str = "id",
+    batch_size: int = UPSERT_BATCH_SIZE,
+    label: str | None = None,
+) -> int:
+    """
+    rows を batch_size ごとに bulk_update RPC（migrations/015）で一括 UPDATE する。
+    INSERT は行わないため、members のように upsert が NOT NULL 違反を起こすテーブルにも使える。
+
+    全行が同じキー集合を持つこと（欠けたカラムは NULL で上書きされるため事前に検証する）。
+
+    Returns
+    -------
+    int
+        UPDATE された行数の合計（DB に存在しない key の行は含まない）。
+    """
+    if not rows:
+        return 0
+
+    columns = set(rows[0])
+    if key not in columns:
+        raise ValueError(f"bulk_update: rows must contain key column '{key}'")
+    for row in rows:
+        if set(row) != columns:
+            raise ValueError(f"bulk_update: inconsistent columns {sorted(row)} != {sorted(columns)}")
+
+    label = label or f"bulk_update:{table}"
+    client = get_client()
+    total = 0
+
+    for i in range(0, len(rows), batch_size):
+        chunk = rows[i : i + batch_size]
+        result = execute_with_retry(
+            lambda c=chunk: client.rpc(
+                "bulk_update", {"p_table": table, "p_rows": c, "p_key": key}
+            ),
+            label=f"{label}[{i}:{i+len(chunk)}]",
+        )
+        total += result.data or 0
+        logger.info("[%s] updated %d / %d", label, i + len(chunk), len(rows))
+
+    return total
+
+
 # ============================================================
 # 便利クエリ
 # ============================================================
@@ -138,18 +200,277 @@ def fetch_all(
     return result.data or []
 
 
+# ============================================================
+# 列指向の全件取得（大きなテーブルの集計用）
+# ============================================================
+class DictColumn:
+    """
+    辞書エンコードした文字列列。codes[i] は values のインデックス（None は -1）。
+    同じ文字列（member_id・委員会名・bill_title 等）は values に1回だけ保持する。
+    """
+
+    __slots__ = ("codes", "values", "_index")
+
+    def __init__(self) -> None:
+        self.codes: array = array("i")
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: str | None) -> None:
+        self.codes.append(self.encode(value))
+
+    def code_of(self, value: str) -> int:
+        """value のコードを返す（未出現なら -1）。"""
+        return self._index.get(value, -1)
+
+    def value(self, i: int) -> str | None:
+        code = self.codes[i]
+        return self.values[code] if code >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class DictListColumn(DictColumn):
+    """
+    text[] 列（submitter_ids 等）。要素を辞書エンコードして codes に連結し、
+    行 i の要素は codes[offsets[i]:offsets[i + 1]]。
+    """
+
+    __slots__ = ("offsets",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.offsets: array = array("i", [0])
+
+    def append(self, values: list[str] | None) -> None:  # type: ignore[override]
+        for v in (values or []):
+            self.codes.append(self.encode(v))
+        self.offsets.append(len(self.codes))
+
+    def row(self, i: int) -> array:
+        return self.codes[self.offsets[i] : self.offsets[i + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def _new_column(kind: str):
+    if kind == "str":
+        return DictColumn()
+    if kind == "strs":
+        return DictListColumn()
+    if kind == "int":
+        return array("q")
+    if kind == "date":
+        return array("i")
+    if kind == "bool":
+        return array("b")
+    raise ValueError(f"unknown column kind: {kind}")
+
+
+def _append_value(col, kind: str, value: Any) -> None:
+    if kind in ("str", "strs"):
+        col.append(value)
+    elif kind == "date":
+        # ISO 日付 → 序数（date.toordinal）。None は 0
+        col.append(date.fromisoformat(value[:10]).toordinal() if value else 0)
+    else:
+        col.append(int(value) if value is not None else 0)
+
+
+def _count_rows(client, table: str, column: str, filters: dict[str, Any] | None) -> int:
+    def q():
+        query = client.table(table).select(column, count="exact").limit(0)
+        for col, val in (filters or {}).items():
+            query = query.eq(col, val)
+        return query
+    return execute_with_retry(q, label=f"count:{table}").count or 0
+
+
+def _key_bounds(client, table: str, key: str, partitions: int, page: int) -> list[Any]:
+    """
+    key 順で行数をおおよそ partitions 等分する境界値を、統計情報のヒストグラム
+    （scan_key_bounds RPC、migrations/031）から選ぶ。テーブル本体は読まない。
+    統計がない（未 ANALYZE）か推定行数が page 以下なら [] を返す（分割しない）。
+    """
+    stats = execute_with_retry(
+        lambda: client.rpc("scan_key_bounds", {"p_table": table, "p_key": key}),
+        label=f"bounds:{table}",
+    ).data or {}
+    hist = stats.get("bounds") or []
+    if (stats.get("rows") or 0) <= page or len(hist) < 3:
+        return []
+    bounds: list[Any] = []
+    for k in range(1, partitions):
+        b = hist[k * (len(hist) - 1) // partitions]
+        if not bounds or b != bounds[-1]:
+            bounds.append(b)
+    return bounds
+
+
+def fetch_columns(
+    table: str,
+    columns: dict[str, str],
+    *,
+    key: str | None = "id",
+    order_by: tuple[str, ...] = (),
+    filters: dict[str, Any] | None = None,
+    page: int = SUPABASE_MAX_ROWS,
+    partitions: int = SCAN_PARTITIONS,
+    strict: bool = False,
+    label: str | None = None,
+) -> dict[str, Any]:
+    """
+    テーブルを全件ページングで取得し、ページごとに型付きの列配列へ詰め替える。
+    dict のリストを保持しないため、数十万行の走査でもピークメモリが小さい。
+
+    推定行数が page を超える場合はキー空間を partitions 個の範囲に分割し、
+    SCAN_WORKERS 本のスレッドで並行に走査する（1リクエストの往復待ちが律速のため）。
+    行の並び順は保証しない（集計用途のみ）。
+
+    Parameters
+    ----------
+    columns : dict[str, str]
+        {列名: 種別}。種別は以下のいずれか。
+          "str"  → DictColumn（辞書エンコード）
+          "strs" → DictListColumn（text[] 列）
+          "int"  → array("q")（None は 0）
+          "date" → array("i")（date.toordinal の値。None は 0）
+          "bool" → array("b")（None は 0）
+    key : str | None
+        キーセットページングに使う一意列（OFFSET 不使用で statement timeout 回避）。
+        境界値を統計情報のヒストグラムから選び（_key_bounds）、
+        (境界, 次の境界] の範囲ごとにキーセット走査する。
+        None の場合は .range() による OFFSET ページングを使い、ページ単位で並行取得する
+        （単一の一意列がないテーブル用。order_by で並びを固定する）。
+    filters : dict | None
+        {column: value} の等価フィルタ。
+    page : int
+        1リクエストの行数。サーバーの max_rows（SUPABASE_MAX_ROWS）を超える値は切り詰める。
+        サーバーが page 未満しか返さなくても、空のページが返るまで走査を続ける。
+    partitions : int
+        キー範囲の分割数。1 なら逐次走査。
+    strict : bool
+        True なら走査前に件数を取得し、取得行数がそれより少なければ RuntimeError。
+        全件が揃わないと結果が誤る用途（索引の構築など）で使う。走査中に増えた行は問題にならない。
+
+    Returns
+    -------
+    dict[str, Any]
+        {列名: 列配列}。全列の長さは取得行数に等しい。
+    """
+    client = get_client()
+    label = label or f"fetch_columns:{table}"
+    page = min(page, SUPABASE_MAX_ROWS)
+    cols = {name: _new_column(kind) for name, kind in columns.items()}
+    select_cols = list(columns)
+    if key and key not in columns:
+        select_cols.append(key)
+    select = ", ".join(select_cols)
+    lock = threading.Lock()
+    fetched = 0
+
+    def base_query():
+        q = client.table(table).select(select)
+        for col, val in (filters or {}).items():
+            q = q.eq(col, val)
+        return q
+
+    def append_batch(batch: list[dict[str, Any]]) -> None:
+        nonlocal fetched
+        with lock:
+            for row in batch:
+                for name, kind in columns.items():
+                    _append_value(cols[name], kind, row.get(name))
+            fetched += len(batch)
+
+    def scan_range(lo: Any, hi: Any) -> None:
+        last_key = lo
+        while True:
+            def q(lk=last_key):
+                query = base_query().order(key).limit(page)
+                if lk is not None:
+                    query = query.gt(key, lk)
+                if hi is not None:
+                    query = query.lte(key, hi)
+                return query
+            batch = execute_with_retry(q, label=f"{label}:{lo}:{last_key}").data or []
+            if not batch:
+                break
+            append_batch(batch)
+            last_key = batch[-1][key]
+
+    def scan_offset(start: int, end: int | None) -> None:
+        # [start, end) を読み切るまで、実際に返った行数だけ OFFSET を進める
+        # end=None（最後の範囲）は空のページが返るまで読む（件数取得後に増えた行も拾う）
+        offset = start
+        while end is None or offset < end:
+            def q(o=offset):
+                query = base_query()
+                for col in order_by:
+                    query = query.order(col)
+                return query.range(o, (end if end is not None else o + page) - 1)
+            batch = execute_with_retry(q, label=f"{label}:{offset}").data or []
+            if not batch:
+                break
+            append_batch(batch)
+            offset += len(batch)
+
+    total = _count_rows(client, table, key or select_cols[0], filters) if strict or not key else 0
+    if key:
+        bounds = _key_bounds(client, table, key, partitions, page) if partitions > 1 else []
+        tasks = [(scan_range, lo, hi) for lo, hi in zip([None, *bounds], [*bounds, None])]
+    else:
+        starts = list(range(0, total, page)) or [0]
+        tasks = [(scan_offset, o, e) for o, e in zip(starts, [*starts[1:], None])]
+
+    if len(tasks) == 1:
+        tasks[0][0](*tasks[0][1:])
+    elif tasks:
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(tasks))) as pool:
+            for future in [pool.submit(fn, *args) for fn, *args in tasks]:
+                future.result()
+
+    if fetched < total and strict:
+        raise RuntimeError(f"[{label}] 取得行数 {fetched} が件数 {total} より少ない（走査中の削除か取得漏れ）")
+    if fetched < total:
+        logger.warning("[%s] 取得行数 %d が件数 %d より少ない（走査中の削除か取得漏れ）", label, fetched, total)
+    logger.info("[%s] %d rows (%d tasks)", label, fetched, len(tasks))
+    return cols
+
+
 def fetch_setting(key: str) -> str | None:
     """site_settings から値を取得する。"""
     client = get_client()
     result = execute_with_retry(
-        lambda: client.table("site_settings").select("value").eq("key", key).single(),
+        lambda: client.table("site_settings").select("value").eq("key", key).maybe_single(),
         label=f"setting:{key}",
     )
-    if result.data:
+    if result is not None and result.data:
         return result.data.get("value") or None
     return None
 
 
+def save_setting(key: str, value: str) -> None:
+    """site_settings に値を保存する（key で upsert）。"""
+    client = get_client()
+    execute_with_retry(
+        lambda: client.table("site_settings").upsert({"key": key, "value": value}, on_conflict="key"),
+        label=f"save_setting:{key}",
+    )
+
+
 def delete_rows(table: str, column: str, value: Any, *, label: str = "") -> None:
     """テーブルから条件に合う行を削除する。"""
     client = get_client()
@@ -157,3 +478,75 @@ def delete_rows(table: str, column: str, value: Any, *, label: str = "") -> None
         lambda: client.table(table).delete().eq(column, value),
         label=label or f"delete:{table}:{column}={value}",
     )
+
+
+# ============================================================
+# 値リストによる一括 DELETE / UPDATE
+# ============================================================
+def delete_in(
+    table: str,
+    column: str,
+    values: list[Any],
+    *,
+    chunk_size: int = IN_FILTER_CHUNK,
+    label: str | None = None,
+) -> int:
+    """
+    column が values のいずれかに一致する行を削除する。
+    values を chunk_size ごとの in_ フィルタに分け、1チャンク1リクエスト（リトライ付き）で実行する。
+
+    Returns
+    -------
+    int
+        削除された行数の合計。
+    """
+    label = label or f"delete_in:{table}"
+    client = get_client()
+    values = list(dict.fromkeys(values))
+    total = 0
+
+    for i in range(0, len(values), chunk_size):
+        chunk = values[i : i + chunk_size]
+        result = execute_with_retry(
+            lambda c=chunk: client.table(table).delete().in_(column, c),
+            label=f"{label}[{i}:{i+len(chunk)}]",
+        )
+        total += len(result.data or [])
+    if values:
+        logger.info("[%s] deleted %d rows (%d values)", label, total, len(values))
+    return total
+
+
+def update_in(
+    table: str,
+    patch: dict[str, Any],
+    column: str,
+    values: list[Any],
+    *,
+    chunk_size: int = IN_FILTER_CHUNK,
+    label: str | None = None,
+) -> int:
+    """
+    column が values のいずれかに一致する行に同じ patch を適用する。
+    行ごとに値が異なる更新は bulk_update を使う。
+
+    Returns
+    -------
+    int
+        更新された行数の合計。
+    """
+    label = label or f"update_in:{table}"
+    client = get_client()
+    values = list(dict.fromkeys(values))
+    total = 0
+
+    for i in range(0, len(values), chunk_size):
+        chunk = values[i : i + chunk_size]
+        result = execute_with_retry(
+            lambda c=chunk: client.table(table).update(patch).in_(column, c),
+            label=f"{label}[{i}:{i+len(chunk)}]",
+        )
+        total += len(result.data or [])
+    if values:
+        logger.info("[%s] updated %d rows (%d values)", label, total, len(values))
+    return total
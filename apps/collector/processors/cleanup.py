@@ -16,7 +16,7 @@ import argparse
 import logging
 import sys
 
-from db import get_client, execute_with_retry
+from db import get_client, execute_with_retry, delete_in, fetch_columns
 
 logger = logging.getLogger("cleanup")
 
@@ -123,18 +123,22 @@ def check_orphans() -> None:
 
     tables_to_check = ["speeches", "questions", "committee_members"]
     optional_tables = ["sangiin_questions", "votes", "member_keywords"]
+    # member_keywords は単一の一意列を持たない（PK: member_id, word）
+    scan_keys = {"member_keywords": (None, ("member_id", "word"))}
 
     for table in tables_to_check + optional_tables:
+        key, order_by = scan_keys.get(table, ("id", ()))
         try:
-            rows = execute_with_retry(
-                lambda t=table: client.table(t).select("member_id").limit(10000),
+            col = fetch_columns(
+                table, {"member_id": "str"}, key=key, order_by=order_by,
                 label=f"orphan_check:{table}",
-            ).data or []
+            )["member_id"]
         except Exception:
             logger.info("Table %s not found, skipping.", table)
             continue
 
-        orphans = {r["member_id"] for r in rows if r.get("member_id") and r["member_id"] not in member_ids}
+        # 辞書エンコード済みなので distinct な member_id だけを照合すればよい
+        orphans = {v for v in col.values if v and v not in member_ids}
         if orphans:
             logger.warning("Table %s has %d orphan member_ids:", table, len(orphans))
             for oid in list(orphans)[:10]:
@@ -180,11 +184,7 @@ def truncate_speeches(max_rows: int | None = None) -> None:
             logger.warning("削除対象行を取得できませんでした（%d/%d削除済み）", deleted, to_delete)
             break
 
-        ids = [r["id"] for r in rows]
-        execute_with_retry(
-            lambda b=ids: client.table("speeches").delete().in_("id", b),
-            label=f"delete_speeches:{deleted}",
-        )
+        delete_in("speeches", "id", [r["id"] for r in rows], label=f"delete_speeches:{deleted}")
         deleted += len(rows)
         logger.info("削除済み: %d / %d", deleted, to_delete)
 
@@ -5,132 +5,522 @@ members テーブルの speech_count / session_count / question_count を更新
 
 upsert（INSERT + ON CONFLICT UPDATE）は name NOT NULL 違反を起こすため使わない。
 members テーブルへの書き込みは UPDATE のみ（既存行の更新に限定する）。
+現在値と比較して変化した議員のみを bulk_update RPC でまとめて UPDATE する。
+
+カウンター更新後、calculator.py の一括版で全議員の活動スコアを算出し
+score_* 列に書き込む（update_activity_scores）。続けて院・政党・選挙区分ごとの
+パーセンタイルを member_percentiles に書き込む（update_member_percentiles）。
+
+日次（update_scores）は score_journal（migrations/016 のトリガーが記録する差分）のうち
+ウォーターマーク以降の行だけを適用する。SCORING_FULL_RECONCILE_DAYS ごとに
+recalculate_scores（全件走査）を実行し、差分更新の結果を検証・補正する。
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
+import os
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from config import SCORING_FULL_RECONCILE_DAYS
+from db import (
+    DictColumn,
+    DictListColumn,
+    batch_upsert,
+    bulk_update,
+    execute_with_retry,
+    fetch_columns,
+    fetch_setting,
+    get_client,
+    save_setting,
+)
 
-from db import get_client, execute_with_retry
+# calculator.py はリポジトリ直下にある
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from calculator import SCORE_FIELDS, calculate_scores  # noqa: E402
 
 logger = logging.getLogger("run_scoring")
 
 PAGE = 2000
 
+# members に書き込むカウンター列
+COUNTER_COLUMNS = ("speech_count", "session_count", "question_count", "bill_count", "petition_count")
 
-def _fetch_all(table: str, select: str) -> list[dict]:
-    """テーブルを全件カーソルページングで取得する（OFFSET 不使用で statement timeout 回避）。"""
-    client = get_client()
-    rows: list[dict] = []
-    last_id: str = ""
-    cols = [s.strip() for s in select.split(",")]
-    select_with_id = select if "id" in cols else select + ", id"
-    while True:
-        result = execute_with_retry(
-            lambda lid=last_id: (
-                client.table(table)
-                .select(select_with_id)
-                .order("id")
-                .gt("id", lid)
-                .limit(PAGE)
-            ),
-            label=f"fetch:{table}:{len(rows)}",
-        )
-        batch = result.data or []
-        rows.extend(batch)
-        if not batch:
-            break
-        last_id = batch[-1]["id"]
-    return rows
+# score_journal.source → 増減するカウンター列
+JOURNAL_COUNTER: dict[str, str] = {
+    "speeches":          "speech_count",
+    "questions":         "question_count",
+    "sangiin_questions": "question_count",
+    "bills":             "bill_count",
+    "petitions":         "petition_count",
+    "sangiin_petitions": "petition_count",
+}
 
+# ScoreBreakdown のフィールド → members の列
+SCORE_COLUMNS: dict[str, str] = {name: f"score_{name}" for name in SCORE_FIELDS}
 
-def recalculate_scores() -> None:
-    client = get_client()
+# 入力データ（出席率・委員会出席率）を収集していない指標。列は NULL のまま書き込まない。
+UNSCORED_FIELDS = ("attendance", "committee")
 
-    # ── 全議員 ID を取得 ──────────────────────────────────────
-    members = execute_with_retry(
-        lambda: client.table("members").select("id").limit(2000),
-        label="fetch_member_ids",
+# パーセンタイルを算出するグループ（members の列）
+PERCENTILE_SCOPES = ("house", "party", "election_type")
+
+# site_settings のキー
+WATERMARK_KEY = "scoring_journal_watermark"  # 適用済み score_journal.id の最大値
+LAST_FULL_KEY = "scoring_last_full_at"       # 最後に全件走査した日（ISO 形式）
+
+# 全件走査中に score_journal が進んだ場合の走査の試行回数
+FULL_SCAN_ATTEMPTS = 3
+
+# in_ フィルタ1回あたりの ID 数（URL 長制限対策）
+IN_CHUNK = 100
+
+# セッションキー (spoken_at 序数 << SESSION_KEY_BITS) | (委員会コード + 1) の委員会部分のビット数
+SESSION_KEY_BITS = 20
+
+
+def _count_codes(col: DictColumn | DictListColumn, counts: dict[str, int]) -> None:
+    """列のコード出現回数を数えて member_id 別に counts へ加算する（None は除く）。"""
+    for code, n in Counter(col.codes).items():
+        if code >= 0:
+            counts[col.values[code]] += n
+
+
+def _journal_head(client) -> int:
+    """score_journal の現在の最大 id を返す（空なら 0）。"""
+    rows = execute_with_retry(
+        lambda: client.table("score_journal").select("id").order("id", desc=True).limit(1),
+        label="journal_head",
     ).data or []
-    all_ids = [m["id"] for m in members]
-    logger.info("対象議員: %d 名", len(all_ids))
+    return rows[0]["id"] if rows else 0
+
+
+def _advance_watermark(client, head: int) -> None:
+    """ウォーターマークを head に進め、適用済みのジャーナル行を削除する。"""
+    save_setting(WATERMARK_KEY, str(head))
+    execute_with_retry(
+        lambda: client.table("score_journal").delete().lte("id", head),
+        label=f"journal_trim:{head}",
+    )
 
+
+def _scan_counters() -> dict[str, dict[str, int]]:
+    """全テーブルを走査して カウンター列 → {member_id: 値} を返す。"""
     # ── speech_count / session_count ──────────────────────────
     logger.info("speeches を集計中...")
-    speeches = _fetch_all("speeches", "member_id, spoken_at, committee, is_procedural")
-    logger.info("speeches 取得: %d 件", len(speeches))
-
-    speech_counts: dict[str, int] = defaultdict(int)
-    session_sets: dict[str, set] = defaultdict(set)
+    speeches = fetch_columns(
+        "speeches",
+        {"member_id": "str", "spoken_at": "date", "committee": "str", "is_procedural": "bool"},
+    )
+    member_col = speeches["member_id"]
+    logger.info("speeches 取得: %d 件", len(member_col))
 
-    for s in speeches:
-        mid = s.get("member_id")
-        if not mid:
+    # member_id コード別に集計する。セッションは (spoken_at, committee) を1つの int に詰める。
+    n_codes = len(member_col.values)
+    speech_by_code = [0] * n_codes
+    sessions_by_code: list[set[int]] = [set() for _ in range(n_codes)]
+    for mcode, day, ccode, procedural in zip(
+        member_col.codes, speeches["spoken_at"], speeches["committee"].codes, speeches["is_procedural"],
+    ):
+        if mcode < 0 or procedural:
             continue
-        if not s.get("is_procedural"):
-            speech_counts[mid] += 1
-            session_sets[mid].add((s.get("spoken_at"), s.get("committee")))
+        speech_by_code[mcode] += 1
+        sessions_by_code[mcode].add((day << SESSION_KEY_BITS) | (ccode + 1))
 
-    matched = sum(1 for mid in all_ids if speech_counts.get(mid, 0) > 0)
-    logger.info("発言あり議員: %d / %d", matched, len(all_ids))
+    speech_counts = {mid: speech_by_code[c] for c, mid in enumerate(member_col.values)}
+    session_counts = {mid: len(sessions_by_code[c]) for c, mid in enumerate(member_col.values)}
+    del speeches, member_col, sessions_by_code
 
     # ── question_count ────────────────────────────────────────
     logger.info("questions を集計中...")
     question_counts: dict[str, int] = defaultdict(int)
 
     for table in ("questions", "sangiin_questions"):
-        rows = _fetch_all(table, "member_id")
-        for row in rows:
-            mid = row.get("member_id")
-            if mid:
-                question_counts[mid] += 1
-        logger.info("%s 取得: %d 件", table, len(rows))
+        col = fetch_columns(table, {"member_id": "str"})["member_id"]
+        _count_codes(col, question_counts)
+        logger.info("%s 取得: %d 件", table, len(col))
 
     # ── bill_count ────────────────────────────────────────────
     logger.info("bills を集計中...")
     bill_counts: dict[str, int] = defaultdict(int)
-    bills = _fetch_all("bills", "submitter_ids")
-    for bill in bills:
-        for mid in (bill.get("submitter_ids") or []):
-            bill_counts[mid] += 1
-    logger.info("bills 取得: %d 件", len(bills))
+    col = fetch_columns("bills", {"submitter_ids": "strs"})["submitter_ids"]
+    _count_codes(col, bill_counts)
+    logger.info("bills 取得: %d 件", len(col))
 
     # ── petition_count ────────────────────────────────────────
     logger.info("petitions を集計中...")
     petition_counts: dict[str, int] = defaultdict(int)
     for table in ("petitions", "sangiin_petitions"):
-        rows = _fetch_all(table, "introducer_ids")
-        for row in rows:
-            for mid in (row.get("introducer_ids") or []):
-                petition_counts[mid] += 1
-        logger.info("%s 取得: %d 件", table, len(rows))
-
-    # ── members を UPDATE（upsert は使わない） ─────────────────
-    logger.info("members を更新中...")
-    updated = 0
-    for mid in all_ids:
-        patch = {
-            "speech_count":   speech_counts.get(mid, 0),
-            "session_count":  len(session_sets.get(mid, set())),
-            "question_count": question_counts.get(mid, 0),
-            "bill_count":     bill_counts.get(mid, 0),
-            "petition_count": petition_counts.get(mid, 0),
-        }
-        execute_with_retry(
-            lambda m=mid, p=patch: client.table("members").update(p).eq("id", m),
-            label=f"upd:{mid}",
+        col = fetch_columns(table, {"introducer_ids": "strs"})["introducer_ids"]
+        _count_codes(col, petition_counts)
+        logger.info("%s 取得: %d 件", table, len(col))
+
+    return {
+        "speech_count":   speech_counts,
+        "session_count":  session_counts,
+        "question_count": question_counts,
+        "bill_count":     bill_counts,
+        "petition_count": petition_counts,
+    }
+
+
+def recalculate_scores() -> int:
+    """
+    全テーブルを走査してカウンターを再計算する。変化した議員数を返す。
+
+    走査は複数リクエストにまたがり単一のスナップショットではないため、走査の前後で
+    score_journal の最大 id を比べる。走査中にジャーナルが進んだ場合、その行が走査結果に
+    含まれたかは行ごとに分からないため再走査する。FULL_SCAN_ATTEMPTS 回で安定しなければ
+    その結果を書き込み、全件走査の日付を記録せずに次回の実行でも全件走査して補正する。
+    いずれの場合もウォーターマークは走査後の位置まで進める（差分として二重に適用しない）。
+    """
+    client = get_client()
+
+    for attempt in range(1, FULL_SCAN_ATTEMPTS + 1):
+        head = _journal_head(client)
+        counts = _scan_counters()
+        end_head = _journal_head(client)
+        if end_head == head or attempt == FULL_SCAN_ATTEMPTS:
+            break
+        logger.warning(
+            "走査中に score_journal が進みました (id %d → %d)。再走査します (%d/%d)",
+            head, end_head, attempt, FULL_SCAN_ATTEMPTS,
         )
-        updated += 1
+    stable = end_head == head
 
+    # ── 全議員 ID と現在のカウンター値を取得 ─────────────────
+    members = execute_with_retry(
+        lambda: client.table("members").select("id, " + ", ".join(COUNTER_COLUMNS)).limit(2000),
+        label="fetch_member_counts",
+    ).data or []
+    all_ids = [m["id"] for m in members]
+    logger.info("対象議員: %d 名", len(all_ids))
+
+    matched = sum(1 for mid in all_ids if counts["speech_count"].get(mid, 0) > 0)
+    logger.info("発言あり議員: %d / %d", matched, len(all_ids))
+
+    # ── 変化した議員のみ members を UPDATE（upsert は使わない） ──
+    current = {m["id"]: m for m in members}
+    changed: list[dict] = []
+    for mid in all_ids:
+        patch = {column: counts[column].get(mid, 0) for column in COUNTER_COLUMNS}
+        if any(current[mid].get(col) != patch[col] for col in COUNTER_COLUMNS):
+            changed.append({"id": mid, **patch})
+
+    logger.info("カウンター変化あり: %d / %d 名", len(changed), len(all_ids))
+    updated = bulk_update("members", changed, label="members_counts")
     logger.info("更新完了: %d 名", updated)
 
+    _advance_watermark(client, end_head)
+    if stable:
+        save_setting(LAST_FULL_KEY, date.today().isoformat())
+    else:
+        logger.warning("走査中のジャーナルが安定しなかったため、次回も全件走査で補正します")
+    return len(changed)
+
+
+def _fetch_journal(client, after: int) -> list[dict]:
+    """score_journal の id > after の行を id 順に全件取得する。"""
+    rows: list[dict] = []
+    last_id = after
+    while True:
+        batch = execute_with_retry(
+            lambda lid=last_id: (
+                client.table("score_journal")
+                .select("id, source, sign, member_ids, spoken_at, committee")
+                .order("id")
+                .gt("id", lid)
+                .limit(PAGE)
+            ),
+            label=f"fetch:score_journal:{len(rows)}",
+        ).data or []
+        if not batch:
+            break
+        rows.extend(batch)
+        last_id = batch[-1]["id"]
+    return rows
+
+
+def _session_count_deltas(client, session_delta: dict[tuple, int]) -> dict[str, int]:
+    """
+    (member_id, spoken_at, committee) ごとの発言数の純増減から session_count の増減を求める。
+
+    差分適用後の speeches（現在値）を対象キーの分だけ数え、
+    現在の件数 n と適用前の件数 n - delta のそれぞれが 0 より大きいかで
+    「セッションが新たに生じた / 消えた」を判定する。
+    """
+    keys = {k: d for k, d in session_delta.items() if d != 0}
+    if not keys:
+        return {}
+
+    member_ids = sorted({k[0] for k in keys})
+    dates = sorted({k[1] for k in keys if k[1]})
+    # spoken_at が NULL の発言も全件走査と同じく1つのセッションとして数える
+    date_filters = [
+        lambda q, d=dates[j : j + IN_CHUNK]: q.in_("spoken_at", d)
+        for j in range(0, len(dates), IN_CHUNK)
+    ]
+    if any(k[1] is None for k in keys):
+        date_filters.append(lambda q: q.is_("spoken_at", "null"))
+
+    now_counts: dict[tuple, int] = defaultdict(int)
+    for i in range(0, len(member_ids), IN_CHUNK):
+        chunk = member_ids[i : i + IN_CHUNK]
+        for j, date_filter in enumerate(date_filters):
+            last_id = ""
+            while True:
+                # is_procedural が NULL の発言は議事進行ではない（トリガー・全件走査と同じ判定）
+                batch = execute_with_retry(
+                    lambda c=chunk, f=date_filter, lid=last_id: f(
+                        client.table("speeches")
+                        .select("id, member_id, spoken_at, committee")
+                        .in_("member_id", c)
+                        .or_("is_procedural.is.null,is_procedural.is.false")
+                    )
+                    .order("id")
+                    .gt("id", lid)
+                    .limit(PAGE),
+                    label=f"fetch:speeches_sessions:{i}:{j}",
+                ).data or []
+                if not batch:
+                    break
+                for sp in batch:
+                    now_counts[(sp["member_id"], sp["spoken_at"], sp["committee"])] += 1
+                last_id = batch[-1]["id"]
+
+    deltas: dict[str, int] = defaultdict(int)
+    for key, d in keys.items():
+        n_now = now_counts.get(key, 0)
+        deltas[key[0]] += int(n_now > 0) - int(n_now - d > 0)
+    return deltas
+
+
+def apply_score_deltas() -> int:
+    """
+    ウォーターマーク以降の score_journal を members のカウンターに加減算する。
+    変化した議員数を返す。
+
+    members の UPDATE 後にウォーターマークを進めるため、途中で失敗した場合は
+    次回に同じ差分が再適用されうる。その誤差は次回の全件走査で補正される。
+    """
+    client = get_client()
+    watermark = int(fetch_setting(WATERMARK_KEY) or 0)
+    entries = _fetch_journal(client, watermark)
+    logger.info("score_journal: id > %d の差分 %d 件", watermark, len(entries))
+    if not entries:
+        return 0
+
+    counter_delta: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    session_delta: dict[tuple, int] = defaultdict(int)
+    for e in entries:
+        col = JOURNAL_COUNTER.get(e["source"])
+        if col is None:
+            continue
+        for mid in (e.get("member_ids") or []):
+            counter_delta[mid][col] += e["sign"]
+            if e["source"] == "speeches":
+                session_delta[(mid, e.get("spoken_at"), e.get("committee"))] += e["sign"]
+
+    for mid, d in _session_count_deltas(client, session_delta).items():
+        counter_delta[mid]["session_count"] += d
+
+    # 対象議員の現在値を取得して差分を適用
+    affected = sorted(mid for mid, cols in counter_delta.items() if any(cols.values()))
+    changed: list[dict] = []
+    for i in range(0, len(affected), IN_CHUNK):
+        chunk = affected[i : i + IN_CHUNK]
+        current = execute_with_retry(
+            lambda c=chunk: client.table("members").select("id, " + ", ".join(COUNTER_COLUMNS)).in_("id", c),
+            label=f"fetch_member_counts:{i}",
+        ).data or []
+        for m in current:
+            d = counter_delta[m["id"]]
+            row = {"id": m["id"]}
+            for col in COUNTER_COLUMNS:
+                row[col] = (m.get(col) or 0) + d.get(col, 0)
+            changed.append(row)
+
+    logger.info("差分適用: %d 名", len(changed))
+    bulk_update("members", changed, label="members_count_deltas")
+
+    _advance_watermark(client, entries[-1]["id"])
+    return len(changed)
+
+
+# ============================================================
+# 活動スコア（calculator.py の一括版）
+# ============================================================
+
+def update_activity_scores() -> int:
+    """
+    members のカウンターから全議員の活動スコアを1回のベクトル演算で算出し、
+    値が変わった議員の score_* 列だけを bulk_update する。変化した議員数を返す。
+    カウンターの更新（recalculate_scores / apply_score_deltas）の後に呼ぶこと。
+    """
+    client = get_client()
+    written = [f for f in SCORE_FIELDS if f not in UNSCORED_FIELDS]
+    members = execute_with_retry(
+        lambda: client.table("members").select(
+            "id, speech_count, question_count, bill_count, "
+            + ", ".join(SCORE_COLUMNS[f] for f in written)
+        ).limit(2000),
+        label="fetch_member_scores",
+    ).data or []
+    if not members:
+        return 0
+
+    def counter(name: str) -> np.ndarray:
+        return np.fromiter((m.get(name) or 0 for m in members), dtype=np.int64, count=len(members))
+
+    # 出席率・委員会出席率は未収集のため 0 を渡す（その2指標は 0 点となり合計にも寄与しない）
+    zero_rates = np.zeros(len(members))
+    matrix = calculate_scores(
+        zero_rates,
+        counter("speech_count"),
+        counter("question_count"),
+        counter("bill_count"),
+        zero_rates,
+    )
+
+    idx = [SCORE_FIELDS.index(f) for f in written]
+    current = np.array(
+        [[m.get(SCORE_COLUMNS[f]) if m.get(SCORE_COLUMNS[f]) is not None else -1 for f in written] for m in members],
+        dtype=np.int32,
+    )
+    changed = np.flatnonzero((matrix[:, idx] != current).any(axis=1))
+    rows = [
+        {"id": members[i]["id"], **{SCORE_COLUMNS[f]: int(matrix[i, j]) for f, j in zip(written, idx)}}
+        for i in changed
+    ]
+    logger.info("活動スコア変化あり: %d / %d 名", len(rows), len(members))
+    if rows:
+        bulk_update("members", rows, label="update_activity_scores")
+    return len(rows)
+
+
+# ============================================================
+# パーセンタイル（member_percentiles）
+# ============================================================
+
+def _group_percentiles(
+    groups: np.ndarray, values: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    グループ内での values の累積分布（値が自分以下の議員の割合, %）を返す。
+    (グループ, 値) を1つの int64 キーに詰めて1回だけ並べ替え、全グループを同時に処理する。
+
+    Returns
+    -------
+    (パーセンタイル, グループの人数, グループ内の最大値)。いずれも入力と同じ長さ。
+    """
+    span = int(values.max()) + 1
+    keys = groups * span + values
+    sorted_keys = np.sort(keys)
+    starts = np.searchsorted(sorted_keys, groups * span, side="left")
+    at_or_below = np.searchsorted(sorted_keys, keys, side="right") - starts
+    sizes = np.bincount(groups)[groups]
+    group_max = sorted_keys[starts + sizes - 1] - groups * span
+    return at_or_below / sizes * 100, sizes, group_max
+
+
+def update_member_percentiles() -> int:
+    """
+    全議員の各カウンターについて、院・政党・選挙区分内でのパーセンタイルを算出し
+    member_percentiles に1議員1行で upsert する。upsert した行数を返す。
+    Web は議員ページごとにこの1行を読むだけで済む（全議員の取得が不要）。
+    """
+    client = get_client()
+    members = execute_with_retry(
+        lambda: client.table("members").select(
+            "id, " + ", ".join(PERCENTILE_SCOPES) + ", " + ", ".join(COUNTER_COLUMNS)
+        ).limit(2000),
+        label="fetch_member_groups",
+    ).data or []
+    if not members:
+        return 0
+
+    n = len(members)
+    values = {
+        c: np.fromiter((m.get(c) or 0 for m in members), dtype=np.int64, count=n)
+        for c in COUNTER_COLUMNS
+    }
+    global_max = {c: int(v.max()) for c, v in values.items()}
+    scoped: list[dict[str, dict | None]] = [{} for _ in range(n)]
+
+    for scope in PERCENTILE_SCOPES:
+        # グループ値が NULL の議員はそのスコープの対象外
+        labels = [m.get(scope) for m in members]
+        present = np.array([g is not None for g in labels])
+        group_names = sorted({g for g in labels if g is not None})
+        code_of = {g: i for i, g in enumerate(group_names)}
+        groups = np.array([code_of[g] for g in labels if g is not None], dtype=np.int64)
+        idx = np.flatnonzero(present)
+        stats = {c: _group_percentiles(groups, values[c][idx]) for c in COUNTER_COLUMNS} if len(idx) else {}
+
+        for i in range(n):
+            scoped[i][scope] = None
+        for j, i in enumerate(idx):
+            scoped[i][scope] = {
+                "group": labels[i],
+                "n": int(stats[COUNTER_COLUMNS[0]][1][j]),
+                "metrics": {
+                    c: {"pct": round(float(pct[j]), 1), "max": int(gmax[j])}
+                    for c, (pct, _, gmax) in stats.items()
+                },
+            }
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [
+        {"member_id": m["id"], **scoped[i], "global_max": global_max, "updated_at": now}
+        for i, m in enumerate(members)
+    ]
+    written = batch_upsert("member_percentiles", rows, on_conflict="member_id", label="member_percentiles")
+    logger.info("パーセンタイル更新: %d 名", written)
+    return written
+
+
+def update_scores(full: bool = False) -> None:
+    """
+    日次エントリポイント。score_journal の差分を適用し、
+    全件走査が必要な場合（初回・--full・前回から SCORING_FULL_RECONCILE_DAYS 日経過）は
+    続けて recalculate_scores を実行して差分更新の結果を検証する。
+    """
+    watermark = fetch_setting(WATERMARK_KEY)
+    last_full = fetch_setting(LAST_FULL_KEY)
+    reconcile_due = (
+        full
+        or watermark is None
+        or last_full is None
+        or date.fromisoformat(last_full) <= date.today() - timedelta(days=SCORING_FULL_RECONCILE_DAYS)
+    )
+
+    if watermark is not None:
+        apply_score_deltas()
+
+    if reconcile_due:
+        logger.info("全件走査による検証を実行します（前回: %s）", last_full or "なし")
+        mismatched = recalculate_scores()
+        if watermark is not None and mismatched:
+            logger.warning("差分更新と全件走査の不一致: %d 名（全件走査の値で補正済み）", mismatched)
+        elif watermark is not None:
+            logger.info("✓ 差分更新と全件走査の結果が一致しました。")
+
+    update_activity_scores()
+    update_member_percentiles()
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="差分適用後に全件走査で再計算する")
+    args = parser.parse_args()
     try:
-        recalculate_scores()
+        update_scores(full=args.full)
     except Exception:
         logger.exception("Score recalculation failed")
         sys.exit(1)
@@ -100,8 +100,8 @@ def main() -> None:
 
     elif task == "votes-collect":
         from sources.votes import collect_sessions, get_member_ids
-        from config import SESSION_MAX
-        sessions = list(range(208, max(SESSION_MAX) + 1))
+        from session_registry import sessions_since
+        sessions = sessions_since(208)
         member_ids = get_member_ids()
         collect_sessions(sessions, member_ids)
 
@@ -137,9 +137,15 @@ def main() -> None:
             collect_speech_excerpts_only(date_from, date_until)
         return  # スコア再計算不要
 
-    from processors.scoring import recalculate_scores as _rescore
+    from processors.scoring import (
+        recalculate_scores as _rescore,
+        update_activity_scores,
+        update_member_percentiles,
+    )
     if task not in ("scoring-only", "migrate-member-ids") and not task.startswith("speeches-"):
         _rescore()
+    update_activity_scores()
+    update_member_percentiles()
 
 
 
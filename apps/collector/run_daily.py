@@ -28,14 +28,18 @@ def _step(name: str, fn) -> bool:
 def main() -> None:
     from sources.members import main as collect_members
     from sources.speeches import collect_speeches
-    from processors.scoring import recalculate_scores
+    from processors.scoring import update_scores
     from sources.cabinet_scraper import main as collect_cabinet
     from sources.questions import collect_shugiin_questions, collect_sangiin_questions
     from sources.petitions import collect_shugiin_petitions, collect_sangiin_petitions
+    from sources.refresh_queue import refresh_pending
     from sources.committees import collect_shugiin_committees, collect_sangiin_committees
     from sources.bills import collect_bills
     from sources.keywords import daily_update as keywords_daily
-    from sources.vote_alignment import compute_alignment
+    from sources.vote_alignment import update_alignment
+    from sources.member_similarity import compute_similarity
+    from sources.party_deviation import compute_deviations
+    from sources.vote_bill_links import link_vote_events
     from processors.cleanup import truncate_speeches
 
     skip_keywords = os.environ.get("SKIP_KEYWORDS", "").lower() in ("1", "true", "yes")
@@ -43,16 +47,20 @@ def main() -> None:
     results = {
         "members":        _step("議員データ登録",    collect_members),
         "speeches":       _step("発言データ収集",     collect_speeches),
-        "scoring":        _step("スコア再計算",        recalculate_scores),
+        "scoring":        _step("スコア再計算",        update_scores),
         "cabinet":        _step("内閣役職",           collect_cabinet),
         "bills":          _step("議員立法（日次）",    lambda: collect_bills(daily=True)),
         "questions_shu":  _step("質問主意書（衆）",   collect_shugiin_questions),
         "questions_san":  _step("質問主意書（参）",   collect_sangiin_questions),
         "petitions_shu":  _step("請願（衆）",         collect_shugiin_petitions),
         "petitions_san":  _step("請願（参）",         collect_sangiin_petitions),
+        "refresh":        _step("未確定レコード再確認", refresh_pending),
         "committees_shu": _step("委員会（衆）",       collect_shugiin_committees),
         "committees_san": _step("委員会（参）",       collect_sangiin_committees),
-        "vote_alignment": _step("政党採決一致率計算", compute_alignment),
+        "vote_alignment": _step("政党採決一致率計算", update_alignment),
+        "similarity":     _step("議員間採決類似度",   compute_similarity),
+        "deviation":      _step("党方針離反検出",     compute_deviations),
+        "vote_bills":     _step("採決と法案の紐付け", link_vote_events),
     }
 
     if not skip_keywords:
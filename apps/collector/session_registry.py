@@ -0,0 +1,136 @@
+"""
+はたらく議員 — 国会回次レジストリ
+
+現在の国会回次を1回の実行につき1回だけ求め、全ソース（法案・採決・議員・質問主意書・請願）で共有する。
+site_settings.session_registry に JSON で保存し、次の実行は前回の回次の次から探索を始める
+（毎回 208 や定数から HEAD を打ち直さない）。
+
+保存内容:
+  current          現在の回次（参院の法案一覧ページが存在する最新回次）
+  question_counts  衆院質問主意書の回次ごとの最終番号（閉会した回次のみ。確定値）
+  question_latest  開会中の回次の衆院質問主意書の既知の最終番号（次の探索の下限）
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any
+
+import requests
+
+from config import QUESTION_COUNT_SEED, SESSION_REGISTRY_SEED
+from db import fetch_columns, fetch_setting, save_setting
+from utils import host_budget
+
+logger = logging.getLogger("session_registry")
+
+REGISTRY_KEY = "session_registry"
+
+HEADERS = {"User-Agent": "GiinWatch/1.0 (public interest research)"}
+# 回次の存在確認に使うページ（国会召集日に公開される）
+PROBE_URL = "https://www.sangiin.go.jp/japanese/joho1/kousei/gian/{session}/gian.htm"
+
+_state: dict[str, Any] | None = None
+_probed = False
+_lock = threading.Lock()
+
+
+def _session_exists(session: int) -> bool:
+    url = PROBE_URL.format(session=session)
+    try:
+        with host_budget(url):
+            resp = requests.head(url, headers=HEADERS, timeout=10)
+        return resp.status_code == 200
+    except requests.RequestException as exc:
+        logger.warning("Session probe failed %s: %s", url, exc)
+        return False
+
+
+def _seed_question_counts(current: int) -> dict[str, int]:
+    """
+    閉会した回次の衆院質問主意書の最終番号を求める（レジストリ初回作成時のみ）。
+    QUESTION_COUNT_SEED（手動管理値）を基に、保存済みの questions の最大番号が大きい回次はそれで上書きする。
+    """
+    counts: dict[int, int] = defaultdict(int, {s: n for s, n in QUESTION_COUNT_SEED.items() if s < current})
+    cols = fetch_columns("questions", {"session": "int", "number": "int"}, label="seed_question_counts")
+    for session, number in zip(cols["session"], cols["number"]):
+        if 0 < session < current:
+            counts[session] = max(counts[session], number)
+    return {str(s): n for s, n in sorted(counts.items())}
+
+
+def _load() -> dict[str, Any]:
+    global _state
+    if _state is None:
+        raw = fetch_setting(REGISTRY_KEY)
+        if raw:
+            _state = json.loads(raw)
+        else:
+            _state = {"current": SESSION_REGISTRY_SEED}
+            _state["question_counts"] = _seed_question_counts(SESSION_REGISTRY_SEED)
+    return _state
+
+
+def _save() -> None:
+    _state["updated_at"] = datetime.now(timezone.utc).isoformat()
+    save_setting(REGISTRY_KEY, json.dumps(_state, ensure_ascii=False, sort_keys=True))
+
+
+def current_session() -> int:
+    """
+    現在の国会回次を返す。
+    初回の呼び出しで保存済みの回次の次から存在確認を進め、以降の呼び出しは同じ値を返す。
+    """
+    global _probed
+    with _lock:
+        state = _load()
+        if not _probed:
+            session = state["current"]
+            while _session_exists(session + 1):
+                session += 1
+            if session != state["current"]:
+                logger.info("新しい国会回次: 第%d回 → 第%d回", state["current"], session)
+            state["current"] = session
+            _save()
+            _probed = True
+        return state["current"]
+
+
+def sessions_since(start: int) -> list[int]:
+    """start から現在の回次までの回次リスト。"""
+    return list(range(start, current_session() + 1))
+
+
+def question_count(session: int) -> int | None:
+    """衆院質問主意書の確定済みの最終番号（閉会前・未確定なら None）。"""
+    with _lock:
+        return _load().get("question_counts", {}).get(str(session))
+
+
+def question_latest(session: int) -> int | None:
+    """衆院質問主意書の既知の最終番号（確定値、なければ開会中の回次の暫定値）。"""
+    with _lock:
+        state = _load()
+        key = str(session)
+        return state.get("question_counts", {}).get(key, state.get("question_latest", {}).get(key))
+
+
+def record_question_count(session: int, count: int) -> None:
+    """
+    衆院質問主意書の最終番号を記録する。
+    閉会した回次は確定値、現在の回次は暫定値（次の探索の下限）として保存する。
+    """
+    final = session < current_session()
+    with _lock:
+        state = _load()
+        counts = state.setdefault("question_counts" if final else "question_latest", {})
+        if counts.get(str(session)) == count:
+            return
+        counts[str(session)] = count
+        if final:
+            state.get("question_latest", {}).pop(str(session), None)
+        _save()
@@ -25,6 +25,25 @@ honbun_url をキーに最新会期の1レコードに統合して bills テー
 honbun_url による同一法案の統合:
   同一の honbun_url は同一法案。繰り越しのたびに会期番号が変わるが本文URLは不変。
   複数会期に存在する場合は最新会期のレコードのみ残す。
+
+既存レコードとの差分:
+  kaiji行を保存済みの bills 行（kaiji_status・title・URL）と比較し、keikaページは
+  新規の法案・kaijiステータスが変わった法案・提出者が未取得の議員立法に限って取得する。
+  kaiji行が変わっていない法案は upsert しない（refresh=True なら全件を再解決）。
+  keika を取得できなかった法案は kaiji_status を NULL で保存し、次回に取得し直す。
+  参院送りでスキップした衆法は bills に保存しないため、kaiji_status を
+  bills_skipped に1法案1行で記録して差分の対象にする。対象会期の kaiji に
+  現れなくなった行・スキップでなくなった行は削除する。
+
+ステータス伝播:
+  非終端の法案と同一件名の法案が後の会期で終端ステータスになっていれば、そのステータスに揃える
+  （最も早い後続会期の値を採用）。保存済みの全法案と今回の upsert 対象から件名の索引を作り、
+  upsert 前に適用する。保存済みのみの法案はステータスが変わる行だけ bulk_update する。
+
+取得:
+  kaijiページ（会期ごと）と keikaページは BILL_FETCH_WORKERS 本のスレッドで並行取得する。
+  同時接続数・間隔は config.HOST_BUDGETS（utils.host_budget）で制限する。
+  keikaページは URL 単位で1回だけ取得する（繰り越し法案は会期が変わっても同じ URL）。
 """
 
 from __future__ import annotations
@@ -32,16 +51,20 @@ from __future__ import annotations
 import logging
 import re
 import sys
-import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
 
-from db import batch_upsert, get_client, execute_with_retry
-from utils import make_member_id, build_name_to_id
+from db import (
+    batch_upsert, bulk_update, delete_in, execute_with_retry, fetch_all, fetch_columns, get_client, update_in,
+)
+from session_registry import current_session
+from utils import build_name_to_id, host_budget, make_member_id
 
 logger = logging.getLogger("bill_scraper")
 
@@ -49,6 +72,9 @@ HEADERS = {"User-Agent": "GiinWatch/1.0 (public interest research)"}
 KAIJI_URL = "https://www.shugiin.go.jp/internet/itdb_gian.nsf/html/gian/kaiji{session}.htm"
 START_SESSION = 208
 
+# kaiji・keikaページの並行取得数（実際の同時接続数・間隔は config.HOST_BUDGETS で制限）
+BILL_FETCH_WORKERS = 4
+
 ERA_OFFSETS = {"令和": 2018, "平成": 1988, "昭和": 1925}
 
 # kaijiページのステータス → 正規ステータス
@@ -87,7 +113,8 @@ def _parse_jp_date(text: str) -> str | None:
 
 def _fetch(url: str, encoding: str = "shift_jis") -> BeautifulSoup | None:
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=30)
+        with host_budget(url):
+            resp = requests.get(url, headers=HEADERS, timeout=30)
         if resp.status_code != 200:
             return None
         resp.encoding = resp.apparent_encoding or encoding
@@ -97,22 +124,6 @@ def _fetch(url: str, encoding: str = "shift_jis") -> BeautifulSoup | None:
         return None
 
 
-def _detect_current_session() -> int:
-    """参議院法案一覧ページの存在確認で現在の国会回次を検出する。"""
-    session = START_SESSION
-    while True:
-        url = f"https://www.sangiin.go.jp/japanese/joho1/kousei/gian/{session + 1}/gian.htm"
-        try:
-            r = requests.head(url, headers=HEADERS, timeout=10)
-            if r.status_code == 200:
-                session += 1
-            else:
-                break
-        except requests.RequestException:
-            break
-    return session
-
-
 # ============================================================
 # kaijiページのスクレイプ
 # ============================================================
@@ -193,8 +204,9 @@ def _fetch_keika_detail(keika_url: str, name_to_id: dict[str, str] | None = None
     両方を走査して「議案提出者一覧」（全提出者名）を優先取得する。
     一覧がない場合は「議案提出者」（筆頭＋外N名）を使用。
 
-    戻り値: {submitter_ids, submitter_extra_count, submitted_at, shu_result, is_committee_bill}
+    戻り値: {submitter_ids, submitter_extra_count, submitted_at, shu_result, is_committee_bill, fetched}
     is_committee_bill は提出者フィールドに「委員長」が含まれる場合 True。
+    fetched はページを取得できた場合 True（取得失敗時は他の値が既定値のまま）。
     """
     result: dict[str, Any] = {
         "submitter_ids":         [],
@@ -202,10 +214,12 @@ def _fetch_keika_detail(keika_url: str, name_to_id: dict[str, str] | None = None
         "submitted_at":          None,
         "shu_result":            None,
         "is_committee_bill":     False,
+        "fetched":               False,
     }
     soup = _fetch(keika_url)
     if soup is None:
         return result
+    result["fetched"] = True
 
     actual_house = "衆議院"
     primary_ids:   list[str] = []
@@ -320,27 +334,61 @@ def _parse_submitters(cell, house: str, name_to_id: dict[str, str] | None = None
 # ステータス解決
 # ============================================================
 
-def _resolve_status(row: dict[str, Any], name_to_id: dict[str, str] | None = None) -> tuple[str, dict[str, Any]]:
+def _uses_keika(row: dict[str, Any]) -> bool:
+    """_resolve_status が keikaページを参照する行か（本院議了・議員立法）。"""
+    return bool(row.get("keika_url")) and (
+        row["raw_status"] == "本院議了" or row["bill_type"] == "議員立法"
+    )
+
+
+def _fetch_keika_details(
+    urls: list[str], name_to_id: dict[str, str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """keikaページを並行取得し、URL → _fetch_keika_detail の結果 を返す。"""
+    with ThreadPoolExecutor(max_workers=BILL_FETCH_WORKERS) as pool:
+        details = pool.map(lambda u: _fetch_keika_detail(u, name_to_id), urls)
+        return dict(zip(urls, details))
+
+
+def _resolve_status(
+    row: dict[str, Any],
+    name_to_id: dict[str, str] | None = None,
+    keika_details: dict[str, dict[str, Any]] | None = None,
+    stored_status: str | None = None,
+) -> tuple[str, dict[str, Any]]:
     """
     row の raw_status を正規ステータスに変換し、keikaページから詳細を取得する。
     閣法は提出者取得をスキップ（内閣提出のため個々の議員名なし）。
+    keika_details に取得済みの URL があればそれを使う。
+    本院議了で keika を取得できなかった場合は stored_status（なければ 審議中）を返す
+    （一時的な失敗で終端の 廃案 を書き込まない）。
     戻り値: (status, detail_dict)
-      detail_dict: submitter_ids, submitter_extra_count, submitted_at
+      detail_dict: submitter_ids, submitter_extra_count, submitted_at, keika_failed
     """
     raw = row["raw_status"]
     detail: dict[str, Any] = {
         "submitter_ids":         [],
         "submitter_extra_count": 0,
         "submitted_at":          None,
+        "keika_failed":          False,
     }
 
     keika_url = row.get("keika_url")
     is_giin_rippo = row["bill_type"] == "議員立法"  # 衆法・参法（閣法は除く）
 
+    def keika(url: str) -> dict[str, Any]:
+        if keika_details is not None and url in keika_details:
+            return keika_details[url]
+        return _fetch_keika_detail(url, name_to_id)
+
     # 本院議了: keikaで衆院審議結果を確認
     if raw == "本院議了":
         if keika_url:
-            d = _fetch_keika_detail(keika_url, name_to_id)
+            d = keika(keika_url)
+            if not d["fetched"]:
+                logger.warning("本院議了 but keika fetch failed: %s", keika_url)
+                detail["keika_failed"] = True
+                return stored_status or "審議中", detail
             detail["submitter_ids"]         = d["submitter_ids"]
             detail["submitter_extra_count"] = d["submitter_extra_count"]
             detail["submitted_at"]          = d["submitted_at"]
@@ -356,7 +404,8 @@ def _resolve_status(row: dict[str, Any], name_to_id: dict[str, str] | None = Non
 
     # 議員立法（衆法・参法）: keikaから提出者・提出日を常に取得
     if is_giin_rippo and keika_url:
-        d = _fetch_keika_detail(keika_url, name_to_id)
+        d = keika(keika_url)
+        detail["keika_failed"]          = not d["fetched"]
         detail["submitter_ids"]         = d["submitter_ids"]
         detail["submitter_extra_count"] = d["submitter_extra_count"]
         detail["submitted_at"]          = d["submitted_at"]
@@ -366,18 +415,163 @@ def _resolve_status(row: dict[str, Any], name_to_id: dict[str, str] | None = Non
     return STATUS_MAP.get(raw, "審議中"), detail
 
 
+# ============================================================
+# 既存レコードとの差分
+# ============================================================
+
+# kaiji行から保存される列（これが変わらなければ upsert 不要）
+_KAIJI_FIELDS = ("title", "keika_url", "honbun_url")
+
+_STORED_SELECT = (
+    "id, title, status, kaiji_status, bill_type, submitter_ids, "
+    "submitter_extra_count, submitted_at, honbun_url, keika_url"
+)
+
+
+def _load_skipped_bills(sessions: list[int]) -> dict[str, str]:
+    """対象会期の参院送りでスキップした衆法の id → kaiji_status（bills_skipped、会期ごとに1クエリ）。"""
+    skipped: dict[str, str] = {}
+    for session in sessions:
+        for r in fetch_all("bills_skipped", select="id, kaiji_status", filters={"session_number": session}):
+            skipped[r["id"]] = r["kaiji_status"]
+    return skipped
+
+
+def _save_skipped_bills(
+    loaded: dict[str, str], skipped: dict[str, dict[str, Any]],
+) -> None:
+    """
+    bills_skipped を今回の結果に合わせる。skipped は id → kaiji 行。
+    新規・kaiji_status が変わった行だけ upsert し、loaded（対象会期の保存済み）のうち
+    今回スキップされなかった行を削除する。
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    changed = [
+        {"id": bid, "session_number": row["session_number"], "kaiji_status": row["raw_status"], "updated_at": now}
+        for bid, row in skipped.items()
+        if loaded.get(bid) != row["raw_status"]
+    ]
+    stale = sorted(set(loaded) - set(skipped))
+    batch_upsert("bills_skipped", changed, on_conflict="id", label="bills_skipped")
+    if stale:
+        delete_in("bills_skipped", "id", stale, label="delete_stale_bills_skipped")
+    logger.info("参院送りスキップ: %d件（更新 %d件 / 削除 %d件）", len(skipped), len(changed), len(stale))
+
+
+def _load_stored_bills(sessions: list[int]) -> dict[str, dict[str, Any]]:
+    """対象会期の保存済み bills 行を id → 行 で返す（会期ごとに1クエリ）。"""
+    stored: dict[str, dict[str, Any]] = {}
+    for session in sessions:
+        for r in fetch_all("bills", select=_STORED_SELECT, filters={"session_number": session}):
+            stored[r["id"]] = r
+    return stored
+
+
+def _needs_keika(row: dict[str, Any], stored: dict[str, Any] | None) -> bool:
+    """
+    keikaページを取得してステータス・提出者を解決し直す必要があるか。
+    新規・kaijiステータスの変化・提出者未取得の議員立法が対象。
+    """
+    if stored is None or stored.get("kaiji_status") != row["raw_status"]:
+        return True
+    return (
+        stored.get("bill_type") == "議員立法"
+        and not stored.get("submitter_ids")
+        and bool(row.get("keika_url"))
+    )
+
+
+def _kaiji_changed(row: dict[str, Any], stored: dict[str, Any]) -> bool:
+    return any(row[f] != stored.get(f) for f in _KAIJI_FIELDS)
+
+
+# ============================================================
+# ステータス伝播
+# ============================================================
+
+# これ以上変わらないステータス（未了は旧データの表記）
+TERMINAL_STATUSES = frozenset({"成立", "廃案", "未了", "撤回"})
+
+
+def _terminal_index(bills: list[tuple[str, int, str]]) -> dict[str, list[tuple[int, str]]]:
+    """(件名, 会期, ステータス) の列から 件名 → 終端ステータスの [(会期, ステータス), ...]（会期昇順）を作る。"""
+    index: dict[str, list[tuple[int, str]]] = defaultdict(list)
+    for title, session, status in bills:
+        if title and status in TERMINAL_STATUSES:
+            index[title].append((session, status))
+    for entries in index.values():
+        entries.sort()
+    return index
+
+
+def _later_terminal_status(
+    index: dict[str, list[tuple[int, str]]], title: str, session: int,
+) -> str | None:
+    """同一件名で session より後の会期のうち、最も早い会期の終端ステータス。"""
+    for later_session, status in index.get(title, ()):
+        if later_session > session:
+            return status
+    return None
+
+
+def _propagate_statuses(
+    records: list[dict[str, Any]], deleted_ids: list[str],
+) -> list[dict[str, Any]]:
+    """
+    非終端の法案に、後の会期の同一件名の法案の終端ステータスを伝播する。
+
+    保存済みの全法案（id・件名・会期・ステータス）に今回 upsert する records を重ねて
+    件名の索引を1回だけ作る。records はその場でステータスを書き換え、
+    保存済みのみの法案はステータスが変わるものだけを {"id", "status"} で返す。
+    """
+    stored = fetch_columns(
+        "bills",
+        {"id": "str", "title": "str", "status": "str", "session_number": "int"},
+        strict=True,
+        label="fetch_bills_for_propagation",
+    )
+    # id → (件名, 会期, ステータス)。今回の records が保存済みの値より優先
+    bills: dict[str, tuple[str, int, str]] = {
+        stored["id"].value(i): (
+            stored["title"].value(i), stored["session_number"][i], stored["status"].value(i),
+        )
+        for i in range(len(stored["session_number"]))
+    }
+    for record in records:
+        bills[record["id"]] = (record["title"], record["session_number"], record["status"])
+    for bill_id in deleted_ids:
+        bills.pop(bill_id, None)
+
+    index = _terminal_index(list(bills.values()))
+    by_id = {record["id"]: record for record in records}
+    updates: list[dict[str, Any]] = []
+    for bill_id, (title, session, status) in bills.items():
+        if status in TERMINAL_STATUSES:
+            continue
+        new_status = _later_terminal_status(index, title, session)
+        if new_status is None:
+            continue
+        logger.info("ステータス伝播: %s %s → %s", bill_id, status, new_status)
+        if bill_id in by_id:
+            by_id[bill_id]["status"] = new_status
+        else:
+            updates.append({"id": bill_id, "status": new_status})
+    return updates
+
+
 # ============================================================
 # メイン収集
 # ============================================================
 
-def collect_bills(daily: bool = False) -> None:
+def collect_bills(daily: bool = False, refresh: bool = False) -> None:
     """
     法案データを収集してDBに保存する。
 
-    daily=True: 現在会期のみスクレイプし、非終端の既存レコードも再チェックする。
+    daily=True: 現在会期のみスクレイプする。
     daily=False: START_SESSION から現在会期まで全件収集する。
+    refresh=True: 保存済みレコードとの差分を取らず、全法案の keika を取得し直す。
     """
-    current_session = _detect_current_session()
+    latest_session = current_session()
 
     client = get_client()
     members_data = (
@@ -390,17 +584,17 @@ def collect_bills(daily: bool = False) -> None:
     logger.info("議員名寄せマップ: %d件", len(name_to_id))
 
     if daily:
-        sessions = [current_session]
-        logger.info("日次モード: 第%d回国会", current_session)
+        sessions = [latest_session]
+        logger.info("日次モード: 第%d回国会", latest_session)
     else:
-        sessions = list(range(START_SESSION, current_session + 1))
-        logger.info("全収集モード: 第%d〜%d回国会", START_SESSION, current_session)
+        sessions = list(range(START_SESSION, latest_session + 1))
+        logger.info("全収集モード: 第%d〜%d回国会", START_SESSION, latest_session)
 
-    # --- 全会期をスクレイプ ---
+    # --- 全会期をスクレイプ（並行取得、結果は会期順） ---
     all_rows: list[dict[str, Any]] = []
-    for session in sessions:
-        all_rows.extend(_scrape_kaiji(session))
-        time.sleep(1)
+    with ThreadPoolExecutor(max_workers=BILL_FETCH_WORKERS) as pool:
+        for rows in pool.map(_scrape_kaiji, sessions):
+            all_rows.extend(rows)
 
     # --- honbun_url でグループ化し最新会期のみ残す ---
     by_honbun: dict[str, list[dict[str, Any]]] = defaultdict(list)
@@ -419,6 +613,19 @@ def collect_bills(daily: bool = False) -> None:
 
     logger.info("重複統合: %d行 → %d行", len(all_rows), len(deduped))
 
+    stored_bills = {} if refresh else _load_stored_bills(sessions)
+    loaded_skipped = _load_skipped_bills(sessions)
+    skipped: dict[str, dict[str, Any]] = {}  # 今回スキップした衆法 id → kaiji 行
+    # スキップ済みの衆法は kaiji_status だけを保存済みの値として差分を取る
+    known = {} if refresh else {bid: {"kaiji_status": st} for bid, st in loaded_skipped.items()}
+    known.update(stored_bills)
+    pending = {row["id"] for row in deduped if _needs_keika(row, known.get(row["id"]))}
+
+    # --- keikaページを URL 単位で並行取得 ---
+    keika_urls = sorted({row["keika_url"] for row in deduped if row["id"] in pending and _uses_keika(row)})
+    keika_details = _fetch_keika_details(keika_urls, name_to_id)
+    logger.info("keika取得: %d件", len(keika_urls))
+
     # --- ステータス解決・詳細取得 ---
     to_upsert: list[dict[str, Any]] = []
     to_delete_ids: list[str] = []  # 古い会期の重複レコードID
@@ -431,31 +638,69 @@ def collect_bills(daily: bool = False) -> None:
                 if row["id"] != latest["id"]:
                     to_delete_ids.append(row["id"])
 
+    resolved = reused = unchanged = keika_failed = 0
     for row in deduped:
         raw = row["raw_status"]
-        logger.debug("Resolving %s [%s]", row["id"], raw)
+        stored = stored_bills.get(row["id"])
+
+        if row["id"] not in pending:
+            if stored is None:
+                skipped[row["id"]] = row  # 参院送りでスキップ済み（kaiji_status 不変）
+                unchanged += 1
+            elif _kaiji_changed(row, stored):
+                # ステータス・提出者は保存済みの値をそのまま使う
+                to_upsert.append(_make_record(
+                    row, stored["status"],
+                    stored.get("submitter_ids") or [],
+                    stored.get("submitter_extra_count") or 0,
+                    stored.get("submitted_at"),
+                    bill_type=stored.get("bill_type"),
+                ))
+                reused += 1
+            else:
+                unchanged += 1
+            continue
 
-        status, detail = _resolve_status(row, name_to_id)
+        logger.debug("Resolving %s [%s]", row["id"], raw)
+        status, detail = _resolve_status(row, name_to_id, keika_details, stored and stored["status"])
+        resolved += 1
         if status == "_skip":
             logger.info("Skip (参院送り): %s", row["id"])
+            skipped[row["id"]] = row
             continue
 
-        record = _make_record(
-            row, status,
-            detail["submitter_ids"],
-            detail["submitter_extra_count"],
-            detail["submitted_at"],
-            bill_type=detail.get("bill_type"),
-        )
+        if detail["keika_failed"] and stored:
+            # 取得できなかった提出者・提出日は保存済みの値を残す
+            record = _make_record(
+                row, status,
+                stored.get("submitter_ids") or [],
+                stored.get("submitter_extra_count") or 0,
+                stored.get("submitted_at"),
+                bill_type=stored.get("bill_type"),
+            )
+        else:
+            record = _make_record(
+                row, status,
+                detail["submitter_ids"],
+                detail["submitter_extra_count"],
+                detail["submitted_at"],
+                bill_type=detail.get("bill_type"),
+            )
+        if detail["keika_failed"]:
+            # kaiji_status を記録しない（次回の差分で keika を取得し直す）
+            record["kaiji_status"] = None
+            keika_failed += 1
         to_upsert.append(record)
-        time.sleep(0.5)
+
+    logger.info(
+        "keika解決: %d件（取得失敗 %d件） / kaiji行のみ更新: %d件 / 変更なし: %d件",
+        resolved, keika_failed, reused, unchanged,
+    )
 
     # --- 古い重複レコードを削除 ---
     if to_delete_ids:
-        client = get_client()
         logger.info("古い重複レコード削除: %d件", len(to_delete_ids))
-        for bill_id in to_delete_ids:
-            client.table("bills").delete().eq("id", bill_id).execute()
+        delete_in("bills", "id", to_delete_ids, label="delete_superseded_bills")
 
     # --- IDで最終重複除去（同一IDが複数ある場合は最後のものを採用）---
     seen_ids: dict[str, dict[str, Any]] = {}
@@ -463,9 +708,14 @@ def collect_bills(daily: bool = False) -> None:
         seen_ids[record["id"]] = record
     to_upsert = list(seen_ids.values())
 
+    # --- 後の会期の終端ステータスを伝播（upsert 対象は書き換え、保存済みは変わる行だけ更新） ---
+    propagated = _propagate_statuses(to_upsert, to_delete_ids)
+
     # --- upsert ---
     batch_upsert("bills", to_upsert, on_conflict="id", label="bills")
-    logger.info("収集完了: %d件保存", len(to_upsert))
+    bulk_update("bills", propagated, label="bills_status_propagation")
+    _save_skipped_bills(loaded_skipped, skipped)
+    logger.info("収集完了: %d件保存 / ステータス伝播: %d件", len(to_upsert), len(propagated))
 
 
 def backfill_submitters() -> None:
@@ -498,28 +748,29 @@ def backfill_submitters() -> None:
     ]
     logger.info("提出者バックフィル対象: %d件", len(targets))
 
-    updated = 0
+    details = _fetch_keika_details(sorted({r["keika_url"] for r in targets}), name_to_id)
+
+    committee_ids: list[str] = []
+    submitter_rows: list[dict[str, Any]] = []
     for r in targets:
-        detail = _fetch_keika_detail(r["keika_url"], name_to_id)
+        detail = details[r["keika_url"]]
         if detail["is_committee_bill"]:
-            client.table("bills").update({
-                "bill_type": "委員会提出",
-            }).eq("id", r["id"]).execute()
-            updated += 1
+            committee_ids.append(r["id"])
             logger.info("%s: 委員会提出に更新", r["id"])
         elif len(detail["submitter_ids"]) > 1:
-            client.table("bills").update({
+            submitter_rows.append({
+                "id":                    r["id"],
                 "submitter_ids":         detail["submitter_ids"],
                 "submitter_extra_count": detail["submitter_extra_count"],
-            }).eq("id", r["id"]).execute()
-            updated += 1
+            })
             logger.info(
                 "%s: %d名取得",
                 r["id"], len(detail["submitter_ids"]) + detail["submitter_extra_count"],
             )
-        time.sleep(0.3)
 
-    logger.info("提出者バックフィル完了: %d件更新", updated)
+    update_in("bills", {"bill_type": "委員会提出"}, "id", committee_ids, label="bills_committee_type")
+    bulk_update("bills", submitter_rows, label="bills_submitters")
+    logger.info("提出者バックフィル完了: %d件更新", len(committee_ids) + len(submitter_rows))
 
 
 def _make_record(
@@ -537,6 +788,7 @@ def _make_record(
         "house":                  row["house"],
         "bill_type":              bill_type or row["bill_type"],
         "status":                 status,
+        "kaiji_status":           row["raw_status"],
         "submitter_ids":          submitter_ids,
         "submitter_extra_count":  submitter_extra_count,
         "submitted_at":           submitted_at,
@@ -550,9 +802,11 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
     parser = argparse.ArgumentParser()
     parser.add_argument("--daily", action="store_true", help="現在会期のみ収集")
+    parser.add_argument("--refresh", action="store_true",
+                        help="保存済みレコードとの差分を取らず全法案の keika を取得し直す")
     args = parser.parse_args()
     try:
-        collect_bills(daily=args.daily)
+        collect_bills(daily=args.daily, refresh=args.refresh)
     except Exception:
         logger.exception("収集失敗")
         sys.exit(1)
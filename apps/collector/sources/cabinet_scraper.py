@@ -8,7 +8,7 @@ import httpx
 from bs4 import BeautifulSoup
 
 # 共通モジュールからインポート
-from db import get_client, execute_with_retry
+from db import bulk_update, get_client, execute_with_retry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -150,22 +150,26 @@ def main():
         label="clear_cabinet_post",
     )
 
-    # マッチングして更新
+    # マッチングして一括更新（同じ議員に複数の役職がある場合は後のものを採用）
     matched = 0
     unmatched = []
+    post_of: dict[str, str] = {}
     for p in posts:
         norm = normalize_name(NAME_ALIASES.get(p["name"], p["name"]))
         member_id = member_map.get(norm)
         if member_id:
-            execute_with_retry(
-                lambda mid=member_id, post=p["post"]: client.table("members").update({"cabinet_post": post}).eq("id", mid),
-                label=f"update_cabinet:{member_id}",
-            )
+            post_of[member_id] = p["post"]
             matched += 1
         else:
             unmatched.append(f"{p['post']}: {p['name']}")
             logger.warning(f"マッチング失敗: {p['post']} - {p['name']}")
 
+    bulk_update(
+        "members",
+        [{"id": mid, "cabinet_post": post} for mid, post in post_of.items()],
+        label="update_cabinet",
+    )
+
     logger.info(f"完了: マッチ{matched}名 / 未マッチ{len(unmatched)}名")
     if unmatched:
         logger.warning(f"未マッチ一覧:\n" + "\n".join(unmatched))
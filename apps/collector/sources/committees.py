@@ -1,6 +1,12 @@
 """
 はたらく議員 — 委員会所属収集
 衆議院・参議院の委員会所属データを収集し committee_members テーブルに保存する。
+
+差分同期:
+  スクレイプした名簿を院ごとに保存済みの行と (委員会, 氏名) で突き合わせ、
+  就任（INSERT）・退任（DELETE）・役職と member_id の変更（UPDATE）だけを書き込む。
+  在任期間は committee_member_history にトリガーが記録する（migrations/030）。
+  取得できなかった委員会ページがある実行では、名簿に現れなかった委員会の行は退任扱いにしない。
 """
 
 from __future__ import annotations
@@ -13,7 +19,7 @@ import time
 import httpx
 from bs4 import BeautifulSoup
 
-from db import get_client, execute_with_retry, batch_upsert
+from db import get_client, execute_with_retry, batch_upsert, bulk_update, delete_in, fetch_columns
 from utils import build_name_to_id
 
 logger = logging.getLogger("committees")
@@ -21,6 +27,62 @@ logger = logging.getLogger("committees")
 HEADERS = {"User-Agent": "GiinWatch/1.0 (public interest research)"}
 
 
+# ============================================================
+# 差分同期
+# ============================================================
+
+def _membership_key(committee: str | None, name: str | None) -> tuple[str, str]:
+    return committee or "", re.sub(r"\s+", "", name or "")
+
+
+def _sync_house(house: str, rows: list[dict], complete: bool) -> None:
+    """
+    スクレイプした院の名簿 rows を committee_members に差分で反映する。
+    complete=False（取得できなかった委員会ページがある）の場合、
+    rows に現れない委員会の保存済みの行は削除しない。
+    """
+    scraped: dict[tuple[str, str], dict] = {}
+    for row in rows:
+        key = _membership_key(row["committee"], row["name"])
+        if key in scraped:
+            logger.warning("%s: 同じ委員の重複を除去 %s / %s", house, *key)
+            continue
+        scraped[key] = row
+
+    cols = fetch_columns(
+        "committee_members",
+        {"id": "str", "member_id": "str", "name": "str", "committee": "str", "role": "str"},
+        filters={"house": house}, label=f"fetch_committee_members:{house}",
+    )
+    scraped_committees = {committee for committee, _ in scraped}
+    stored: dict[tuple[str, str], dict] = {}
+    leaves: list[str] = []
+    for i in range(len(cols["id"])):
+        row = {c: cols[c].value(i) for c in ("id", "member_id", "name", "role")}
+        key = _membership_key(cols["committee"].value(i), cols["name"].value(i))
+        if key in stored:
+            leaves.append(row["id"])          # 旧収集で残った重複行
+        elif key in scraped or complete or key[0] in scraped_committees:
+            stored[key] = row
+
+    joins = [row for key, row in scraped.items() if key not in stored]
+    changes = [
+        {"id": old["id"], **{c: scraped[key][c] for c in ("member_id", "name", "role")}}
+        for key, old in stored.items()
+        if key in scraped and any(old[c] != scraped[key][c] for c in ("member_id", "name", "role"))
+    ]
+    leaves += [old["id"] for key, old in stored.items() if key not in scraped]
+
+    # 退任 → 変更 → 就任の順（一意制約 member_id,committee,role の衝突を避ける）
+    delete_in("committee_members", "id", leaves, label=f"committee_leaves:{house}")
+    bulk_update("committee_members", changes, label=f"committee_changes:{house}")
+    batch_upsert("committee_members", joins, on_conflict="member_id,committee,role", label=f"committee_joins:{house}")
+    logger.info(
+        "%s委員会 差分: 就任 %d件・退任 %d件・変更 %d件（名簿 %d件）",
+        house, len(joins), len(leaves), len(changes), len(scraped),
+    )
+
+
 # ============================================================
 # 衆議院 委員会
 # ============================================================
@@ -83,10 +145,13 @@ def collect_shugiin_committees() -> None:
     logger.info("%d件の委員会を発見", len(committees))
 
     all_rows: list[dict] = []
+    complete = True
     for c in committees:
         logger.info("収集中: %s", c["name"])
         members = _scrape_shugiin_members(c["name"], c["url"])
         logger.info("  → %d名", len(members))
+        if not members:
+            complete = False
         for m in members:
             key = re.sub(r"\s+", "", m["name"])
             all_rows.append({
@@ -103,12 +168,7 @@ def collect_shugiin_committees() -> None:
             f"衆院委員会スクレイピング件数が異常 ({len(all_rows)}件、期待値 50件以上) — "
             "衆院サイトの構造変更の可能性があります。"
         )
-    # 全件削除してから再登録（退会済み委員の古いレコードが残らないように）
-    execute_with_retry(
-        lambda: client.table("committee_members").delete().eq("house", "衆議院"),
-        label="delete_shugiin_committees",
-    )
-    batch_upsert("committee_members", all_rows, on_conflict="member_id,committee,role", label="shugiin_committee")
+    _sync_house("衆議院", all_rows, complete)
     logger.info("衆院委員会 完了: %d件", len(all_rows))
 
 
@@ -203,12 +263,14 @@ def collect_sangiin_committees() -> None:
     logger.info("%d件の委員会を発見", len(urls))
 
     all_rows: list[dict] = []
+    complete = True
     for url in urls:
         committee_name, members = _scrape_sangiin_committee(url)
         if committee_name:
             committee_name = committee_name.replace("委員名簿：", "").replace("委員名簿", "").strip()
         if not committee_name or not members:
             logger.warning("スキップ: %s", url)
+            complete = False
             time.sleep(0.5)
             continue
         logger.info("%s: %d名", committee_name, len(members))
@@ -228,12 +290,7 @@ def collect_sangiin_committees() -> None:
             f"参院委員会スクレイピング件数が異常 ({len(all_rows)}件、期待値 50件以上) — "
             "参院サイトの構造変更の可能性があります。"
         )
-    # 全件削除してから再登録（退会済み委員の古いレコードが残らないように）
-    execute_with_retry(
-        lambda: client.table("committee_members").delete().eq("house", "参議院"),
-        label="delete_sangiin_committees",
-    )
-    batch_upsert("committee_members", all_rows, on_conflict="member_id,committee,role", label="sangiin_committee")
+    _sync_house("参議院", all_rows, complete)
     logger.info("参院委員会 完了: %d件", len(all_rows))
 
 
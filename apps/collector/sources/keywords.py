@@ -39,7 +39,7 @@ from config import (
     KEYWORDS_STALE_DAYS,
     MIN_SPEECH_LENGTH,
 )
-from db import get_client, batch_upsert, execute_with_retry, delete_rows
+from db import get_client, batch_upsert, execute_with_retry, delete_rows, fetch_columns, update_in
 from utils import should_exclude_word, is_stale_keyword, build_member_name_set
 
 logger = logging.getLogger("keyword_builder")
@@ -239,7 +239,7 @@ def save_member_keywords_from_texts(
     """
     client = get_client()
     today = date.today().isoformat()
-    updated = 0
+    updated_ids: list[str] = []
 
     for member_id, texts in member_texts.items():
         name = member_info.get(member_id, {}).get("name", "")
@@ -270,17 +270,10 @@ def save_member_keywords_from_texts(
             on_conflict="member_id,word",
             label=f"mk:{member_id}",
         )
-        execute_with_retry(
-            lambda mid=member_id: (
-                client.table("members")
-                .update({"keywords_updated_at": today})
-                .eq("id", mid)
-            ),
-            label=f"update_kw_ts:{member_id}",
-        )
-        updated += 1
+        updated_ids.append(member_id)
 
-    return updated
+    update_in("members", {"keywords_updated_at": today}, "id", updated_ids, label="update_kw_ts")
+    return len(updated_ids)
 
 
 # ============================================================
@@ -291,24 +284,14 @@ def rebuild_party_keywords() -> None:
     client = get_client()
     logger.info("Rebuilding party_keywords ...")
 
-    # 全 member_keywords を取得
-    all_mk: list[dict] = []
-    offset = 0
-    page_size = 2000
-    while True:
-        result = execute_with_retry(
-            lambda o=offset: (
-                client.table("member_keywords")
-                .select("member_id, word, count, last_seen_at")
-                .range(o, o + page_size - 1)
-            ),
-            label="fetch_all_member_keywords",
-        )
-        batch = result.data or []
-        all_mk.extend(batch)
-        if len(batch) < page_size:
-            break
-        offset += page_size
+    # 全 member_keywords を列指向で取得（単一の一意列がないため OFFSET ページング）
+    mk = fetch_columns(
+        "member_keywords",
+        {"member_id": "str", "word": "str", "count": "int", "last_seen_at": "date"},
+        key=None,
+        order_by=("member_id", "word"),
+        label="fetch_all_member_keywords",
+    )
 
     # member_id → party のマッピング
     members = execute_with_retry(
@@ -316,22 +299,32 @@ def rebuild_party_keywords() -> None:
         label="fetch_members_party",
     ).data or []
     member_party: dict[str, str] = {m["id"]: m["party"] for m in members}
-
-    # 政党ごとに集計
-    party_data: dict[str, dict[str, dict]] = {}  # party -> {word -> {count, last_seen_at}}
-    for mk in all_mk:
-        party = member_party.get(mk["member_id"])
-        if not party:
+    party_of = [member_party.get(mid) for mid in mk["member_id"].values]
+
+    # 政党ごとに集計: party -> {word コード -> [count, last_seen_at 序数]}
+    party_codes: dict[str, dict[int, list[int]]] = {}
+    for mcode, wcode, count, last_seen in zip(
+        mk["member_id"].codes, mk["word"].codes, mk["count"], mk["last_seen_at"],
+    ):
+        party = party_of[mcode] if mcode >= 0 else None
+        if not party or wcode < 0:
             continue
-        if party not in party_data:
-            party_data[party] = {}
-        word = mk["word"]
-        if word not in party_data[party]:
-            party_data[party][word] = {"count": 0, "last_seen_at": ""}
-        party_data[party][word]["count"] += mk["count"]
-        ls = mk.get("last_seen_at") or ""
-        if ls > (party_data[party][word]["last_seen_at"] or ""):
-            party_data[party][word]["last_seen_at"] = ls
+        acc = party_codes.setdefault(party, {}).setdefault(wcode, [0, 0])
+        acc[0] += count
+        if last_seen > acc[1]:
+            acc[1] = last_seen
+
+    words_of = mk["word"].values
+    party_data: dict[str, dict[str, dict]] = {
+        party: {
+            words_of[wcode]: {
+                "count": count,
+                "last_seen_at": date.fromordinal(last_seen).isoformat() if last_seen else None,
+            }
+            for wcode, (count, last_seen) in codes.items()
+        }
+        for party, codes in party_codes.items()
+    }
 
     # 各政党の上位100語を upsert
     for party, words in party_data.items():
@@ -411,7 +404,7 @@ def daily_update() -> None:
     members = [m for m in members if m["id"] in recent_speaker_ids]
     logger.info("キーワード更新対象: %d 名", len(members))
 
-    updated = 0
+    updated_ids: list[str] = []
     for m in members:
         member_id = m["id"]
         member_name = m["name"]
@@ -452,21 +445,14 @@ def daily_update() -> None:
                 on_conflict="member_id,word",
                 label=f"mk:{member_id}",
             )
-            # keywords_updated_at を更新
-            execute_with_retry(
-                lambda mid=member_id: (
-                    client.table("members")
-                    .update({"keywords_updated_at": today})
-                    .eq("id", mid)
-                ),
-                label=f"update_kw_ts:{member_id}",
-            )
-            updated += 1
+            updated_ids.append(member_id)
 
         # API レート制限を遵守
         time.sleep(NDL_RATE_LIMIT_SEC)
 
-    logger.info("Daily keyword update complete. Updated %d members.", updated)
+    # keywords_updated_at は更新した議員分をまとめて更新
+    update_in("members", {"keywords_updated_at": today}, "id", updated_ids, label="update_kw_ts")
+    logger.info("Daily keyword update complete. Updated %d members.", len(updated_ids))
     rebuild_party_keywords()
 
 
@@ -548,16 +534,11 @@ def full_rebuild(years: int = 4) -> None:
                 label=f"full_mk:{member_id}",
             )
 
-        # keywords_updated_at 更新
-        execute_with_retry(
-            lambda mid=member_id: (
-                client.table("members")
-                .update({"keywords_updated_at": today.isoformat()})
-                .eq("id", mid)
-            ),
-            label=f"update_kw_ts:{member_id}",
-        )
-
+    # keywords_updated_at は全対象議員分をまとめて更新
+    update_in(
+        "members", {"keywords_updated_at": today.isoformat()}, "id", [m["id"] for m in members],
+        label="update_kw_ts",
+    )
     logger.info("Full keyword rebuild complete for %d members.", len(members))
     rebuild_party_keywords()
 
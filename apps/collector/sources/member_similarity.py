@@ -0,0 +1,136 @@
+"""
+はたらく議員 — 参院議員間の採決類似度計算
+
+参議院採決データ（votes テーブル）から議員同士の投票一致率を算出し、
+議員ごとに一致率の高い議員・低い議員の上位 TOP_K 名を
+member_vote_similarity テーブルに保存する。
+
+アルゴリズム:
+  1. 全採決記録と議員→政党マッピングを取得（vote_alignment と共通）
+  2. 議員×採決（vote_events）の int8 行列 M（+1=賛成 / −1=反対 / 0=欠席・非在籍）を作る
+  3. vote_alignment.pair_counts で全議員ペアの比較件数・一致件数を2回の行列積で求める
+  4. 比較件数が MIN_OVERLAP 以上の相手から上位・下位 TOP_K 名を選んで upsert
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from db import batch_upsert
+from sources.vote_alignment import fetch_all_votes, fetch_member_parties, majority_matrix, pair_counts
+
+logger = logging.getLogger("member_similarity")
+
+# 議員ごとに保存する類似・非類似議員の数
+TOP_K = 5
+
+# 共通の採決がこれ未満の相手は候補にしない（在籍期間の重なりが短い議員を除く）
+MIN_OVERLAP = 20
+
+
+def build_member_matrix(
+    votes: dict[str, Any], member_ids: list[str],
+) -> np.ndarray:
+    """
+    議員×採決の賛否行列を作る。行は member_ids の順、列は採決 ID の昇順。
+    """
+    row_of = {mid: i for i, mid in enumerate(member_ids)}
+    member_col = votes["member_id"]
+    # コード −1（NULL）は末尾の番兵 −1 を引く
+    row_of_code = np.array([row_of.get(mid, -1) for mid in member_col.values] + [-1], dtype=np.int32)
+    rows = row_of_code[np.frombuffer(member_col.codes, dtype=np.int32)]
+
+    events = np.frombuffer(votes["event_id"], dtype=np.int64)
+    vote_codes = np.frombuffer(votes["vote"].codes, dtype=np.int32)
+    yes_code = votes["vote"].code_of("賛成")
+    no_code = votes["vote"].code_of("反対")
+    is_yes = (vote_codes == yes_code) & (yes_code >= 0)
+    is_no = (vote_codes == no_code) & (no_code >= 0)
+
+    keep = (rows >= 0) & (events > 0) & (is_yes | is_no)
+    columns, col_of = np.unique(events[keep], return_inverse=True)
+    # 1セル1票なので多数決行列がそのまま賛否行列になる
+    return majority_matrix(rows[keep], col_of, is_yes[keep].astype(np.float64), len(member_ids), len(columns))
+
+
+def top_similar(
+    both: np.ndarray, same: np.ndarray, k: int = TOP_K,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ペアの比較件数・一致件数から、各議員の一致率上位 k 名と下位 k 名の行番号を返す。
+    候補がない枠は −1。戻り値は (一致率行列, 上位, 下位)。
+    """
+    rate = np.where(both >= MIN_OVERLAP, same / np.maximum(both, 1), np.nan)
+    np.fill_diagonal(rate, np.nan)
+    valid = ~np.isnan(rate)
+    most = np.argsort(np.where(valid, -rate, np.inf), axis=1, kind="stable")[:, :k]
+    least = np.argsort(np.where(valid, rate, np.inf), axis=1, kind="stable")[:, :k]
+    most = np.where(np.take_along_axis(valid, most, axis=1), most, -1)
+    least = np.where(np.take_along_axis(valid, least, axis=1), least, -1)
+    return rate, most, least
+
+
+def compute_similarity() -> int:
+    """類似度を計算して DB に保存する。保存件数を返す。"""
+    votes = fetch_all_votes()
+    member_party = fetch_member_parties()
+    member_ids = sorted(member_party)
+
+    matrix = build_member_matrix(votes, member_ids)
+    logger.info(f"Vote matrix: {matrix.shape[0]} members × {matrix.shape[1]} votes")
+
+    both, same = pair_counts(matrix)
+    rate, most, least = top_similar(both, same)
+
+    def neighbours(i: int, picks: np.ndarray) -> list[dict]:
+        return [
+            {
+                "member_id":      member_ids[j],
+                "party":          member_party[member_ids[j]],
+                "agreement_rate": round(float(rate[i, j]), 4),
+                "sample_size":    int(both[i, j]),
+            }
+            for j in picks if j >= 0
+        ]
+
+    now = datetime.now(timezone.utc).isoformat()
+    present = (matrix != 0).any(axis=1)
+    rows = [
+        {
+            "member_id":     mid,
+            "most_similar":  neighbours(i, most[i]),
+            "least_similar": neighbours(i, least[i]),
+            "updated_at":    now,
+        }
+        for i, mid in enumerate(member_ids) if present[i]
+    ]
+
+    if rows:
+        batch_upsert("member_vote_similarity", rows, on_conflict="member_id", label="member_similarity")
+        logger.info(f"Upserted {len(rows)} member similarity records")
+    else:
+        logger.warning("No similarity records computed — votes table may be empty")
+
+    return len(rows)
+
+
+def main() -> None:
+    count = compute_similarity()
+    logger.info(f"Done. {count} records saved.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    try:
+        main()
+    except Exception:
+        logger.exception("member_similarity failed")
+        sys.exit(1)
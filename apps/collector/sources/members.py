@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 # 共通モジュールからインポート
 from config import PARTY_MAP, PARTY_MAP_KEYS_SORTED
 from db import get_client, execute_with_retry, batch_upsert
+from session_registry import current_session
 from utils import make_member_id, normalize_party, parse_terms
 
 logging.basicConfig(level=logging.INFO)
@@ -60,22 +61,6 @@ def scrape_profile(profile_url: str) -> dict:
         return {"party": "無所属", "faction": "無所属", "district": "不明", "terms": None}
 
 
-def get_current_sangiin_session() -> int:
-    """参議院サイトから最新の国会回次を動的に取得する。"""
-    session = 221  # 既知の最新回次
-    while True:
-        url = f"{SANGIIN_BASE}/{session + 1}/giin.htm"
-        try:
-            resp = httpx.head(url, headers=HEADERS, timeout=10)
-            if resp.status_code == 200:
-                session += 1
-            else:
-                break
-        except Exception:
-            break
-    return session
-
-
 def _split_name_parts(text: str) -> list[str]:
     """全角スペース・半角スペース・改行で分割してパーツを返す"""
     return [p for p in re.split(r'[\u3000\n\s]+', text.strip()) if p]
@@ -83,9 +68,9 @@ def _split_name_parts(text: str) -> list[str]:
 
 def scrape_sangiin() -> list[dict]:
     logger.info("参議院議員一覧を取得中...")
-    current_session = get_current_sangiin_session()
-    logger.info("参議院 現在の国会回次: 第%d回", current_session)
-    url = f"{SANGIIN_BASE}/{current_session}/giin.htm"
+    session = current_session()
+    logger.info("参議院 現在の国会回次: 第%d回", session)
+    url = f"{SANGIIN_BASE}/{session}/giin.htm"
     resp = httpx.get(url, headers=HEADERS, timeout=30)
     resp.encoding = 'utf-8'
     soup = BeautifulSoup(resp.text, 'html.parser')
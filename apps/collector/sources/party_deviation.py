@@ -0,0 +1,129 @@
+"""
+はたらく議員 — 参院議員の党方針離反（造反）検出
+
+参議院採決データ（votes テーブル）から、全政党×全採決の党方針を
+party_whip.infer_party_stances（同一会派の80%以上が同じ投票）で一括推定し、
+党方針と異なる投票をした記録を議員ごとに集計して member_party_deviations に保存する。
+
+採決は vote_events の ID で区別する（member_similarity と同じ）。
+欠席は離反扱いしない（party_whip.find_deviations と同じ基準）。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from db import batch_upsert
+from sources.vote_alignment import event_attribute, fetch_all_votes, fetch_member_parties, fetch_vote_events
+
+# party_whip.py はリポジトリ直下にある
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from party_whip import CHOICE_SIGN, find_deviations_batch, infer_party_stances  # noqa: E402
+
+logger = logging.getLogger("party_deviation")
+
+STANCE_LABEL = {1: "賛成", -1: "反対"}
+
+
+def compute_deviations() -> int:
+    """離反を検出して DB に保存する。保存件数（議員数）を返す。"""
+    votes = fetch_all_votes()
+    events = fetch_vote_events()
+    member_party = fetch_member_parties()
+    parties = sorted(set(member_party.values()))
+    party_code = {p: i for i, p in enumerate(parties)}
+
+    member_col = votes["member_id"]
+    member_codes = np.frombuffer(member_col.codes, dtype=np.int32)
+    # コード −1（NULL）は末尾の番兵 −1 を引く
+    party_of_code = np.array(
+        [party_code.get(member_party.get(mid), -1) for mid in member_col.values] + [-1], dtype=np.int32,
+    )
+    party = party_of_code[member_codes]
+
+    vote_col = votes["vote"]
+    sign_of_code = np.array([CHOICE_SIGN.get(v, 0) for v in vote_col.values] + [0], dtype=np.int8)
+    vote_codes = np.frombuffer(vote_col.codes, dtype=np.int32)
+    sign = sign_of_code[vote_codes]
+    is_absent = vote_codes == vote_col.code_of("欠席")
+
+    event = np.frombuffer(votes["event_id"], dtype=np.int64)
+    keep = (party >= 0) & (event > 0) & (vote_codes >= 0)
+    idx = np.flatnonzero(keep)
+    columns, col_of = np.unique(event[idx], return_inverse=True)
+
+    stances = infer_party_stances(party[idx], col_of, sign[idx], len(parties), len(columns))
+    flags = find_deviations_batch(stances, party[idx], col_of, sign[idx], is_absent[idx])
+    vote_stance = stances[party[idx], col_of]
+    judged = (vote_stance != 0) & ~is_absent[idx]
+    logger.info(
+        f"Stances inferred: {int((stances != 0).sum())} party×vote cells; "
+        f"deviations: {int(flags.sum())} / {int(judged.sum())} judged votes"
+    )
+
+    # 議員ごとに集計（判定対象数・離反票の一覧）
+    judged_count = np.bincount(member_codes[idx][judged], minlength=len(member_col.values))
+    deviations: dict[int, list[dict]] = defaultdict(list)
+    # 採決 ID → vote_events の行番号（離反票の案件名・回次・採決日を引く）
+    event_row = {eid: i for i, eid in enumerate(events["id"])}
+    title_col = events["bill_title"]
+    sessions = event_attribute(events, "session", columns)
+    dates = event_attribute(events, "vote_date", columns)
+    for k in np.flatnonzero(flags):
+        j = idx[k]
+        c = col_of[k]
+        row = event_row.get(int(columns[c]))
+        ordinal = int(dates[c])
+        deviations[int(member_codes[j])].append({
+            "bill_title":     title_col.value(row) if row is not None else None,
+            "session_number": int(sessions[c]) or None,
+            "vote_date":      date.fromordinal(ordinal).isoformat() if ordinal else None,
+            "party_stance":   STANCE_LABEL[int(vote_stance[k])],
+            "actual_vote":    vote_col.values[vote_codes[j]],
+        })
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for code, mid in enumerate(member_col.values):
+        if mid not in member_party or not judged_count[code]:
+            continue
+        items = sorted(deviations.get(code, []), key=lambda d: d["vote_date"] or "", reverse=True)
+        rows.append({
+            "member_id":       mid,
+            "party":           member_party[mid],
+            "deviation_count": len(items),
+            "judged_votes":    int(judged_count[code]),
+            "deviations":      items,
+            "updated_at":      now,
+        })
+
+    if rows:
+        batch_upsert("member_party_deviations", rows, on_conflict="member_id", label="party_deviation")
+        logger.info(f"Upserted {len(rows)} member deviation records")
+    else:
+        logger.warning("No deviation records computed — votes table may be empty")
+
+    return len(rows)
+
+
+def main() -> None:
+    count = compute_deviations()
+    logger.info(f"Done. {count} records saved.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    try:
+        main()
+    except Exception:
+        logger.exception("party_deviation failed")
+        sys.exit(1)
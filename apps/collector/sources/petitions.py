@@ -4,21 +4,32 @@
 
   衆議院 → petitions テーブル
   参議院 → sangiin_petitions テーブル
+
+差分収集:
+  回次ごとの一覧ページの本文ハッシュを petition_pages に記録し、前回と同じ回次は
+  詳細ページ（衆院: 詳細 / 参院: futaku）を取得しない。変わった回次も、未登録の請願と
+  一覧上の行（list_hash）が変わった請願だけを取得する。詳細ページはホスト予算内で
+  並行取得し、回次ごとに1回 upsert する。
+  詳細ページだけで変わる結果は refresh_queue.py が再確認する。
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
 
-from db import get_client, execute_with_retry, batch_upsert
-from utils import make_member_id, build_name_to_id
+from config import PETITION_START_SESSION
+from db import get_client, execute_with_retry, batch_upsert, fetch_all, fetch_columns, update_in
+from session_registry import sessions_since
+from utils import host_budget, make_member_id, build_name_to_id
 
 logger = logging.getLogger("petitions")
 
@@ -29,9 +40,8 @@ ERA_BASE: dict[str, int] = {"令和": 2018, "平成": 1988, "昭和": 1925}
 SHUGIIN_SEIGAN_BASE = "https://www.shugiin.go.jp/internet/itdb_seigan.nsf/html/seigan/"
 SANGIIN_SEIGAN_BASE = "https://www.sangiin.go.jp/japanese/joho1/kousei/seigan"
 
-# 既知のセッション範囲
-SHUGIIN_PETITION_SESSIONS = list(range(196, 222))
-SANGIIN_PETITION_SESSIONS = list(range(196, 222))
+# 詳細ページの並行取得数（実際の同時接続数・間隔は config.HOST_BUDGETS で制限）
+PETITION_DETAIL_WORKERS = 4
 
 
 # ============================================================
@@ -48,6 +58,66 @@ def _parse_japanese_date(text: str) -> Optional[str]:
     return f"{ad_year}-{int(month):02d}-{int(day):02d}"
 
 
+def _fetch_html(url: str, encoding: Optional[str] = None) -> Optional[str]:
+    """
+    ホスト予算内で URL を取得して本文を返す。200 以外・通信失敗は None。
+    encoding を省略した場合は本文から推定する。
+    """
+    try:
+        with host_budget(url):
+            resp = requests.get(url, headers=HEADERS, timeout=20)
+    except Exception as e:
+        logger.warning("取得失敗 %s: %s", url, e)
+        return None
+    if resp.status_code != 200:
+        return None
+    resp.encoding = encoding or resp.apparent_encoding or "utf-8"
+    return resp.text
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _row_hash(tr) -> str:
+    """一覧ページの1行（セルの文字列とリンク先）のハッシュ。"""
+    cells = [td.get_text(strip=True) for td in tr.find_all("td")]
+    links = [a.get("href", "") for a in tr.find_all("a")]
+    return _content_hash("\t".join(cells + links))
+
+
+def _page_hash(url: str) -> Optional[str]:
+    """petition_pages に記録済みの一覧ページの本文ハッシュ。"""
+    rows = fetch_all("petition_pages", select="content_hash", filters={"url": url})
+    return rows[0]["content_hash"] if rows else None
+
+
+def _mark_page(url: str, house: str, session: int, digest: str, record_count: int) -> None:
+    batch_upsert("petition_pages", [{
+        "url":          url,
+        "house":        house,
+        "session":      session,
+        "content_hash": digest,
+        "record_count": record_count,
+        "fetched_at":   datetime.now(timezone.utc).isoformat(),
+    }], on_conflict="url", label=f"petition_pages:{session}")
+
+
+def _pending_items(table: str, id_prefix: str, session: int, items: list[dict], refresh: bool) -> list[dict]:
+    """未登録、または一覧上の行が保存済みの list_hash と異なる請願（refresh=True なら全件）。"""
+    if refresh:
+        return items
+    cols = fetch_columns(
+        table, {"id": "str", "list_hash": "str"},
+        filters={"session": session}, label=f"fetch_list_hash:{table}:{session}",
+    )
+    stored = {cols["id"].value(i): cols["list_hash"].value(i) for i in range(len(cols["id"]))}
+    return [
+        item for item in items
+        if stored.get(f"{id_prefix}-{session}-{item['number']}") != item["list_hash"]
+    ]
+
+
 # ============================================================
 # 衆議院 請願
 # ============================================================
@@ -59,39 +129,17 @@ def _normalize_shugiin_name(raw: str) -> str:
     return re.sub(r"[\s\u3000]+", "", raw)
 
 
-def _get_shugiin_sessions() -> list[int]:
-    sessions = SHUGIIN_PETITION_SESSIONS.copy()
-    next_sess = max(sessions) + 1
-    consecutive_missing = 0
-    while consecutive_missing < 2:
-        url = f"{SHUGIIN_SEIGAN_BASE}{next_sess}_l.htm"
-        try:
-            resp = requests.head(url, headers=HEADERS, timeout=10)
-            if resp.status_code == 200:
-                sessions.append(next_sess)
-                consecutive_missing = 0
-                logger.info("新セッション発見(衆院): 第%d回", next_sess)
-            else:
-                consecutive_missing += 1
-        except requests.RequestException:
-            consecutive_missing += 1
-        next_sess += 1
-    return sessions
-
-
-def _scrape_shugiin_list(session: int) -> list[dict]:
-    """{number, committee_name} のリストを返す。"""
-    url = f"{SHUGIIN_SEIGAN_BASE}{session}_l.htm"
-    try:
-        resp = requests.get(url, headers=HEADERS, timeout=20)
-        if resp.status_code != 200:
-            return []
-        resp.encoding = "shift_jis"
-        soup = BeautifulSoup(resp.text, "html.parser")
-    except Exception as e:
-        logger.warning("衆院請願一覧取得失敗 session=%d: %s", session, e)
-        return []
+def _shugiin_list_url(session: int) -> str:
+    return f"{SHUGIIN_SEIGAN_BASE}{session}_l.htm"
+
 
+def _shugiin_detail_url(session: int, number: int) -> str:
+    return f"{SHUGIIN_SEIGAN_BASE}{session}{number:04d}.htm"
+
+
+def _parse_shugiin_list(html: str, session: int) -> list[dict]:
+    """{number, committee_name, list_hash} のリストを返す。"""
+    soup = BeautifulSoup(html, "html.parser")
     items = []
     for table in soup.find_all("table"):
         caption = table.find("caption")
@@ -106,24 +154,19 @@ def _scrape_shugiin_list(session: int) -> list[dict]:
             num_match = re.search(r"(\d+)", link.get_text(strip=True))
             if not num_match:
                 continue
-            items.append({"number": int(num_match.group(1)), "committee_name": committee})
+            items.append({
+                "number":         int(num_match.group(1)),
+                "committee_name": committee,
+                "list_hash":      _row_hash(tr),
+            })
 
     logger.info("衆院 第%d回: 請願 %d件", session, len(items))
     return items
 
 
-def _scrape_shugiin_detail(session: int, number: int) -> Optional[dict]:
+def _parse_shugiin_detail(html: str, url: str) -> Optional[dict]:
     """詳細ページからタイトル・結果・紹介議員一覧を取得する。"""
-    url = f"{SHUGIIN_SEIGAN_BASE}{session}{number:04d}.htm"
-    try:
-        resp = requests.get(url, headers=HEADERS, timeout=20)
-        if resp.status_code != 200:
-            return None
-        resp.encoding = "shift_jis"
-        soup = BeautifulSoup(resp.text, "html.parser")
-    except Exception as e:
-        logger.warning("衆院請願詳細取得失敗 session=%d number=%d: %s", session, number, e)
-        return None
+    soup = BeautifulSoup(html, "html.parser")
 
     # テーブルの key→value 抽出
     fields: dict[str, any] = {}
@@ -169,58 +212,79 @@ def _scrape_shugiin_detail(session: int, number: int) -> Optional[dict]:
     }
 
 
+def _scrape_shugiin_detail(session: int, number: int) -> Optional[dict]:
+    url = _shugiin_detail_url(session, number)
+    html = _fetch_html(url, "shift_jis")
+    return _parse_shugiin_detail(html, url) if html is not None else None
+
 
-def collect_shugiin_petitions(full: bool = False) -> None:
+def collect_shugiin_petitions(full: bool = False, refresh: bool = False) -> None:
     """
     full=False（日次）: 直近2セッションのみ対象。
-    full=True（バックフィル）: 全セッションを再収集。
+    full=True（バックフィル）: 全セッションを対象（一覧が変わっていない回次はスキップ）。
+    refresh=True: petition_pages・list_hash を無視して全件の詳細ページを再取得する。
     """
     client = get_client()
     members_data = execute_with_retry(
         lambda: client.table("members").select("id, name, alias_name, ndl_names").eq("house", "衆議院").limit(2000),
         label="fetch_shugiin_members",
     ).data or []
-    member_ids_set = {m["id"] for m in members_data}
     name_to_id = build_name_to_id(members_data)
 
-    sessions = _get_shugiin_sessions()
+    sessions = sessions_since(PETITION_START_SESSION)
     if not full:
         sessions = sessions[-2:]
         logger.info("日次モード: 衆院セッション %s のみ対象", sessions)
 
     total_saved = 0
     for session in sessions:
-        items = _scrape_shugiin_list(session)
-        if not items:
-            time.sleep(1)
+        list_url = _shugiin_list_url(session)
+        html = _fetch_html(list_url, "shift_jis")
+        if html is None:
+            logger.warning("衆院請願一覧取得失敗 session=%d", session)
+            continue
+        digest = _content_hash(html)
+        if not refresh and _page_hash(list_url) == digest:
+            logger.info("衆院 第%d回: 一覧に変更なし、スキップ", session)
             continue
 
-        records = []
-        for item in items:
-            detail = _scrape_shugiin_detail(session, item["number"])
-            if not detail:
-                time.sleep(0.5)
-                continue
+        items = _parse_shugiin_list(html, session)
+        pending = _pending_items("petitions", "shugi", session, items, refresh)
+        logger.info("衆院 第%d回: 詳細取得 %d / %d件", session, len(pending), len(items))
 
-            introducer_ids = list(dict.fromkeys(
-                name_to_id[re.sub(r"[\s\u3000]+", "", n)]
-                for n in detail["introducer_names"]
-                if re.sub(r"[\s\u3000]+", "", n) in name_to_id
-            ))
-
-            records.append({
-                "id":               f"shugi-{session}-{item['number']}",
-                "session":          session,
-                "number":           item["number"],
-                "title":            detail["title"],
-                "committee_name":   detail["committee_name"] or item["committee_name"],
-                "result":           detail["result"],
-                "result_date":      detail["result_date"],
-                "introducer_ids":   introducer_ids or None,
-                "introducer_names": detail["introducer_names"] or None,
-                "source_url":       detail["source_url"],
-            })
-            time.sleep(0.5)
+        failed = 0
+        records = []
+        with ThreadPoolExecutor(max_workers=PETITION_DETAIL_WORKERS) as pool:
+            pages = pool.map(
+                lambda item: _fetch_html(_shugiin_detail_url(session, item["number"]), "shift_jis"), pending,
+            )
+            for item, page in zip(pending, pages):
+                if page is None:
+                    failed += 1
+                    continue
+                detail = _parse_shugiin_detail(page, _shugiin_detail_url(session, item["number"]))
+                if not detail:
+                    continue
+
+                introducer_ids = list(dict.fromkeys(
+                    name_to_id[re.sub(r"[\s\u3000]+", "", n)]
+                    for n in detail["introducer_names"]
+                    if re.sub(r"[\s\u3000]+", "", n) in name_to_id
+                ))
+
+                records.append({
+                    "id":               f"shugi-{session}-{item['number']}",
+                    "session":          session,
+                    "number":           item["number"],
+                    "title":            detail["title"],
+                    "committee_name":   detail["committee_name"] or item["committee_name"],
+                    "result":           detail["result"],
+                    "result_date":      detail["result_date"],
+                    "introducer_ids":   introducer_ids or None,
+                    "introducer_names": detail["introducer_names"] or None,
+                    "source_url":       detail["source_url"],
+                    "list_hash":        item["list_hash"],
+                })
 
         if records:
             # 同一セッション内で同じIDが重複する場合は後勝ちで1件にまとめる
@@ -231,46 +295,40 @@ def collect_shugiin_petitions(full: bool = False) -> None:
             total_saved += len(deduped)
         logger.info("衆院 第%d回: %d件保存", session, len(records))
 
+        # 全件を取得できた回次だけ一覧のハッシュを記録する（失敗分は次回再取得）
+        if not failed:
+            _mark_page(list_url, "衆議院", session, digest, len(items))
+        else:
+            logger.warning("衆院 第%d回: 詳細取得失敗 %d件、一覧は未記録", session, failed)
+
     logger.info("衆院請願 収集完了: 合計%d件", total_saved)
 
 
+def refresh_shugiin_results(ids: list[str]) -> dict[str, dict]:
+    """
+    再確認キュー（refresh_queue.py）用。shugi-{回次}-{番号} の詳細ページを取り直し、
+    取得できた請願の id → {"id", "result", "result_date"} を返す。
+    """
+    out: dict[str, dict] = {}
+    for pid in ids:
+        _, session, number = pid.rsplit("-", 2)
+        detail = _scrape_shugiin_detail(int(session), int(number))
+        if detail:
+            out[pid] = {"id": pid, "result": detail["result"], "result_date": detail["result_date"]}
+    return out
+
+
 # ============================================================
 # 参議院 請願
 # ============================================================
 
-def _get_sangiin_sessions() -> list[int]:
-    sessions = SANGIIN_PETITION_SESSIONS.copy()
-    next_sess = max(sessions) + 1
-    consecutive_missing = 0
-    while consecutive_missing < 2:
-        url = f"{SANGIIN_SEIGAN_BASE}/{next_sess}/seigan.htm"
-        try:
-            resp = requests.head(url, timeout=10)
-            if resp.status_code == 200:
-                sessions.append(next_sess)
-                consecutive_missing = 0
-                logger.info("新セッション発見(参院): 第%d回", next_sess)
-            else:
-                consecutive_missing += 1
-        except requests.RequestException:
-            consecutive_missing += 1
-        next_sess += 1
-    return sessions
+def _sangiin_list_url(session: int) -> str:
+    return f"{SANGIIN_SEIGAN_BASE}/{session}/seigan.htm"
 
 
-def _scrape_sangiin_list(session: int) -> list[dict]:
-    """{number, title, futaku_url} のリストを返す。"""
-    url = f"{SANGIIN_SEIGAN_BASE}/{session}/seigan.htm"
-    try:
-        resp = requests.get(url, timeout=20)
-        if resp.status_code != 200:
-            return []
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        soup = BeautifulSoup(resp.text, "html.parser")
-    except Exception as e:
-        logger.warning("参院請願一覧取得失敗 session=%d: %s", session, e)
-        return []
-
+def _parse_sangiin_list(html: str, session: int) -> list[dict]:
+    """{number, title, futaku_url, yousi_url, list_hash} のリストを返す。"""
+    soup = BeautifulSoup(html, "html.parser")
     items = []
     seen_numbers = set()
     for tr in soup.find_all("tr"):
@@ -300,23 +358,29 @@ def _scrape_sangiin_list(session: int) -> list[dict]:
         if number in seen_numbers:
             continue
         seen_numbers.add(number)
-        items.append({"number": number, "title": title, "futaku_url": futaku_url, "yousi_url": yousi_url})
+        items.append({
+            "number":     number,
+            "title":      title,
+            "futaku_url": futaku_url,
+            "yousi_url":  yousi_url,
+            "list_hash":  _row_hash(tr),
+        })
 
     logger.info("参院 第%d回: 請願 %d件", session, len(items))
     return items
 
 
-def _scrape_sangiin_futaku(futaku_url: str) -> Optional[dict]:
+def _scrape_sangiin_list(session: int) -> list[dict]:
+    html = _fetch_html(_sangiin_list_url(session))
+    if html is None:
+        logger.warning("参院請願一覧取得失敗 session=%d", session)
+        return []
+    return _parse_sangiin_list(html, session)
+
+
+def _parse_sangiin_futaku(html: str) -> dict:
     """futakuページから委員会名・結果・紹介議員リストを取得する。"""
-    try:
-        resp = requests.get(futaku_url, timeout=20)
-        if resp.status_code != 200:
-            return None
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        soup = BeautifulSoup(resp.text, "html.parser")
-    except Exception as e:
-        logger.warning("参院futaku取得失敗 %s: %s", futaku_url, e)
-        return None
+    soup = BeautifulSoup(html, "html.parser")
 
     # 委員会名: 「委員会」「審査会」を含む短いテキスト要素を探す
     committee_name = ""
@@ -375,65 +439,82 @@ def _scrape_sangiin_futaku(futaku_url: str) -> Optional[dict]:
     }
 
 
-def collect_sangiin_petitions(full: bool = False) -> None:
+def _scrape_sangiin_futaku(futaku_url: str) -> Optional[dict]:
+    html = _fetch_html(futaku_url)
+    return _parse_sangiin_futaku(html) if html is not None else None
+
+
+def collect_sangiin_petitions(full: bool = False, refresh: bool = False) -> None:
     """
     full=False（日次）: 直近2セッションのみ対象。
-    full=True（バックフィル）: 全セッションを再収集。
+    full=True（バックフィル）: 全セッションを対象（一覧が変わっていない回次はスキップ）。
+    refresh=True: petition_pages・list_hash を無視して全件の futaku ページを再取得する。
     """
     client = get_client()
     members_data = execute_with_retry(
         lambda: client.table("members").select("id, name, alias_name, ndl_names").eq("house", "参議院").limit(2000),
         label="fetch_sangiin_members",
     ).data or []
-    member_ids_set = {m["id"] for m in members_data}
     name_to_id = build_name_to_id(members_data)
 
-    sessions = _get_sangiin_sessions()
+    sessions = sessions_since(PETITION_START_SESSION)
     if not full:
         sessions = sessions[-2:]
         logger.info("日次モード: 参院セッション %s のみ対象", sessions)
 
     total_saved = 0
     for session in sessions:
-        items = _scrape_sangiin_list(session)
-        if not items:
-            time.sleep(1)
+        list_url = _sangiin_list_url(session)
+        html = _fetch_html(list_url)
+        if html is None:
+            logger.warning("参院請願一覧取得失敗 session=%d", session)
+            continue
+        digest = _content_hash(html)
+        if not refresh and _page_hash(list_url) == digest:
+            logger.info("参院 第%d回: 一覧に変更なし、スキップ", session)
             continue
 
-        records = []
-        for item in items:
-            futaku = _scrape_sangiin_futaku(item["futaku_url"])
-            if not futaku:
-                time.sleep(0.5)
-                continue
+        items = _parse_sangiin_list(html, session)
+        pending = _pending_items("sangiin_petitions", "sangi", session, items, refresh)
+        logger.info("参院 第%d回: futaku取得 %d / %d件", session, len(pending), len(items))
 
-            # 同一議員が複数回紹介した場合の重複を除去（順序保持）
-            seen_names: set[str] = set()
-            unique_names: list[str] = []
-            for n in futaku["introducer_names"]:
-                if n not in seen_names:
-                    seen_names.add(n)
-                    unique_names.append(n)
-
-            introducer_ids = list(dict.fromkeys(
-                name_to_id[re.sub(r"[\s\u3000]+", "", n)]
-                for n in unique_names
-                if re.sub(r"[\s\u3000]+", "", n) in name_to_id
-            ))
-
-            records.append({
-                "id":               f"sangi-{session}-{item['number']}",
-                "session":          session,
-                "number":           item["number"],
-                "title":            item["title"],
-                "committee_name":   futaku["committee_name"],
-                "result":           futaku["result"],
-                "result_date":      futaku["result_date"],
-                "introducer_ids":   introducer_ids or None,
-                "introducer_names": unique_names or None,
-                "source_url":       item["yousi_url"],
-            })
-            time.sleep(0.5)
+        failed = 0
+        records = []
+        with ThreadPoolExecutor(max_workers=PETITION_DETAIL_WORKERS) as pool:
+            pages = pool.map(lambda item: _fetch_html(item["futaku_url"]), pending)
+            for item, page in zip(pending, pages):
+                if page is None:
+                    failed += 1
+                    continue
+                futaku = _parse_sangiin_futaku(page)
+
+                # 同一議員が複数回紹介した場合の重複を除去（順序保持）
+                seen_names: set[str] = set()
+                unique_names: list[str] = []
+                for n in futaku["introducer_names"]:
+                    if n not in seen_names:
+                        seen_names.add(n)
+                        unique_names.append(n)
+
+                introducer_ids = list(dict.fromkeys(
+                    name_to_id[re.sub(r"[\s\u3000]+", "", n)]
+                    for n in unique_names
+                    if re.sub(r"[\s\u3000]+", "", n) in name_to_id
+                ))
+
+                records.append({
+                    "id":               f"sangi-{session}-{item['number']}",
+                    "session":          session,
+                    "number":           item["number"],
+                    "title":            item["title"],
+                    "committee_name":   futaku["committee_name"],
+                    "result":           futaku["result"],
+                    "result_date":      futaku["result_date"],
+                    "introducer_ids":   introducer_ids or None,
+                    "introducer_names": unique_names or None,
+                    "source_url":       item["yousi_url"],
+                    "list_hash":        item["list_hash"],
+                })
 
         if records:
             # 同一セッション内で同じIDが重複する場合は後勝ちで1件にまとめる
@@ -441,10 +522,12 @@ def collect_sangiin_petitions(full: bool = False) -> None:
             if len(deduped) < len(records):
                 logger.warning("参院請願: 重複ID %d件を除去 (session=%d)", len(records) - len(deduped), session)
             batch_upsert("sangiin_petitions", list(deduped.values()), on_conflict="id", label=f"petitions:sangi:{session}")
-            total_saved += len(records)
+            total_saved += len(deduped)
 
-            # yousiリンクなしで登録された旧レコードのsource_urlをNULLに修正
-            valid_ids = set(deduped.keys())
+        # yousiリンクなしで登録された旧レコードのsource_urlをNULLに修正
+        # （今回取得しなかった請願も一覧に載っていれば有効）
+        if items:
+            valid_ids = {f"sangi-{session}-{item['number']}" for item in items}
             existing = execute_with_retry(
                 lambda: client.table("sangiin_petitions")
                     .select("id")
@@ -454,27 +537,53 @@ def collect_sangiin_petitions(full: bool = False) -> None:
             ).data or []
             stale_ids = [r["id"] for r in existing if r["id"] not in valid_ids]
             if stale_ids:
-                for sid in stale_ids:
-                    execute_with_retry(
-                        lambda sid=sid: client.table("sangiin_petitions")
-                            .update({"source_url": None})
-                            .eq("id", sid),
-                        label=f"null_source_url:{sid}",
-                    )
+                update_in(
+                    "sangiin_petitions", {"source_url": None}, "id", stale_ids,
+                    label=f"null_source_url:{session}",
+                )
                 logger.info("参院 第%d回: source_url無効 %d件をNULLに修正", session, len(stale_ids))
 
         logger.info("参院 第%d回: %d件保存", session, len(records))
 
+        # 全件を取得できた回次だけ一覧のハッシュを記録する（失敗分は次回再取得）
+        if not failed:
+            _mark_page(list_url, "参議院", session, digest, len(items))
+        else:
+            logger.warning("参院 第%d回: futaku取得失敗 %d件、一覧は未記録", session, failed)
+
     logger.info("参院請願 収集完了: 合計%d件", total_saved)
 
 
+def refresh_sangiin_results(ids: list[str]) -> dict[str, dict]:
+    """
+    再確認キュー（refresh_queue.py）用。sangi-{回次}-{番号} の futaku ページを取り直し、
+    取得できた請願の id → {"id", "result", "result_date"} を返す。
+    futaku ページの URL は一覧ページにしかないため、回次ごとに一覧を1回取得する。
+    """
+    by_session: dict[int, list[tuple[str, int]]] = {}
+    for pid in ids:
+        _, session, number = pid.rsplit("-", 2)
+        by_session.setdefault(int(session), []).append((pid, int(number)))
+
+    out: dict[str, dict] = {}
+    for session, targets in by_session.items():
+        futaku_urls = {item["number"]: item["futaku_url"] for item in _scrape_sangiin_list(session)}
+        for pid, number in targets:
+            futaku = _scrape_sangiin_futaku(futaku_urls[number]) if number in futaku_urls else None
+            if futaku:
+                out[pid] = {"id": pid, "result": futaku["result"], "result_date": futaku["result_date"]}
+    return out
+
+
 def main() -> None:
     import argparse
     parser = argparse.ArgumentParser()
-    parser.add_argument("--full", action="store_true", help="全セッションを再収集（バックフィル用）")
+    parser.add_argument("--full", action="store_true", help="全セッションを対象にする（バックフィル用）")
+    parser.add_argument("--refresh", action="store_true",
+                        help="petition_pages・list_hash の記録を無視して全件の詳細ページを再取得する")
     args = parser.parse_args()
-    collect_shugiin_petitions(full=args.full)
-    collect_sangiin_petitions(full=args.full)
+    collect_shugiin_petitions(full=args.full, refresh=args.refresh)
+    collect_sangiin_petitions(full=args.full, refresh=args.refresh)
 
 
 if __name__ == "__main__":
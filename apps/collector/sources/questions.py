@@ -11,16 +11,17 @@ from __future__ import annotations
 import logging
 import re
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 import httpx
 import requests
 from bs4 import BeautifulSoup
 
-from config import SESSION_MAX, SESSION_MAX_NEXT_START
-from db import get_client, execute_with_retry, batch_upsert
-from utils import make_member_id, build_name_to_id
+from config import QUESTION_START_SESSION
+from db import get_client, execute_with_retry, batch_upsert, fetch_all
+from session_registry import question_count, question_latest, record_question_count, sessions_since
+from utils import host_budget, make_member_id, build_name_to_id
 
 logger = logging.getLogger("questions")
 
@@ -43,7 +44,8 @@ def _normalize_shu(name: str) -> str:
 def _scrape_shitsumon(session: int, number: int) -> Optional[dict]:
     url = SHUGIIN_BASE_URL + f"{session}{number:03d}.htm"
     try:
-        resp = httpx.get(url, headers=HEADERS, timeout=20)
+        with host_budget(url):
+            resp = httpx.get(url, headers=HEADERS, timeout=20)
         if resp.status_code == 404:
             return None
         resp.encoding = "shift_jis"
@@ -81,10 +83,55 @@ def _scrape_shitsumon(session: int, number: int) -> Optional[dict]:
         return None
 
 
+def _shitsumon_exists(session: int, number: int) -> bool:
+    """
+    質問主意書のページがあるか。404 以外の失敗は例外にする
+    （一時的なエラーで誤った最終番号をレジストリに記録しないため）。
+    """
+    url = SHUGIIN_BASE_URL + f"{session}{number:03d}.htm"
+    with host_budget(url):
+        resp = httpx.get(url, headers=HEADERS, timeout=20)
+    if resp.status_code == 404:
+        return False
+    resp.raise_for_status()
+    return True
+
+
+def find_last_shitsumon(session: int, known: int = 0) -> int:
+    """
+    回次の質問主意書の最終番号を求める。known は存在が分かっている番号（なければ 0）。
+    known から 1, 2, 4, … 先を確認して存在しない番号を見つけ（指数探索）、
+    その間を二分探索する。確認回数は O(log n)。
+    """
+    lo, step = known, 1
+    while _shitsumon_exists(session, lo + step):
+        lo += step
+        step *= 2
+    hi = lo + step  # 存在しない
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _shitsumon_exists(session, mid):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _load_stored_shitsumon(session: int) -> tuple[set[int], int]:
+    """保存済みの衆院質問主意書の (答弁書受領済みの番号, 最大番号)。"""
+    rows = fetch_all("questions", select="number, answered_at", filters={"session": session})
+    answered = {r["number"] for r in rows if r.get("answered_at")}
+    return answered, max((r["number"] for r in rows), default=0)
+
+
 def collect_shugiin_questions(full: bool = False) -> None:
     """
-    full=False（日次）: 進行中セッション（max_num=9999）と新規発見セッションのみ対象。
-    full=True（バックフィル）: 全セッションを再収集。
+    full=False（日次）: 最終番号が未確定の回次（現在の回次と、閉会後まだ最後まで取得していない回次）のみ対象。
+                        答弁書受領済みの保存済み番号は取得せず、未答弁・欠番と保存済みの最大番号より先だけを取得する。
+    full=True（バックフィル）: 全セッションの全番号を再収集。
+    最終番号は find_last_shitsumon（指数探索＋二分探索）で求めて session_registry に記録し、
+    1〜最終番号だけを取得する（閉会した回次は確定値を使い、探索しない）。
+    upsert は回次ごとに1回のバッチで行う。
     """
     client = get_client()
     members_data = execute_with_retry(
@@ -97,94 +144,66 @@ def collect_shugiin_questions(full: bool = False) -> None:
     def find_member_id(name: str) -> Optional[str]:
         return name_to_id.get(re.sub(r"\s+", "", name))
 
-    extra_sessions: dict[int, int] = {}
-    session_num = SESSION_MAX_NEXT_START
-    consecutive_empty = 0
-    while consecutive_empty < 2:
-        probe = _scrape_shitsumon(session_num, 1)
-        if probe is None:
-            consecutive_empty += 1
-        else:
-            extra_sessions[session_num] = 9999
-            consecutive_empty = 0
-        session_num += 1
-    if extra_sessions:
-        logger.info("新セッション発見: %s", list(extra_sessions.keys()))
-
-    if full:
-        all_sessions = {**SESSION_MAX, **extra_sessions}
-    else:
-        # 日次: 進行中セッション（max_num=9999）と新規セッションのみ
-        ongoing = {s: m for s, m in SESSION_MAX.items() if m == 9999}
-        all_sessions = {**ongoing, **extra_sessions}
-        logger.info("日次モード: セッション %s のみ対象", sorted(all_sessions.keys()))
+    sessions = sessions_since(QUESTION_START_SESSION)
+    if not full:
+        sessions = [s for s in sessions if question_count(s) is None]
+        logger.info("日次モード: セッション %s のみ対象", sessions)
 
     total_saved = 0
 
-    for session, max_num in all_sessions.items():
+    for session in sessions:
         logger.info("第%d回国会 質問主意書を収集中...", session)
-        for number in range(1, max_num + 1):
+        answered, stored_max = (set(), 0) if full else _load_stored_shitsumon(session)
+        last_number = question_count(session)
+        if last_number is None:
+            last_number = find_last_shitsumon(session, max(stored_max, question_latest(session) or 0))
+            record_question_count(session, last_number)
+        logger.info("第%d回: 最終番号 %d", session, last_number)
+
+        records: list[dict[str, Any]] = []
+        for number in range(1, last_number + 1):
+            if number in answered:
+                continue
             data = _scrape_shitsumon(session, number)
             if data is None:
-                if number > 10:
-                    logger.info("第%d回: %d件で終了", session, number - 1)
-                    break
                 continue
 
             submitter = data["submitter"]
             if submitter not in member_cache:
                 member_cache[submitter] = find_member_id(submitter)
-            member_id = member_cache[submitter]
-
-            execute_with_retry(
-                lambda d=data, mid=member_id: client.table("questions").upsert({
-                    "id":           d["id"],
-                    "member_id":    mid,
-                    "session":      d["session"],
-                    "number":       d["number"],
-                    "title":        d["title"],
-                    "submitter":    d["submitter"],
-                    "faction":      d["faction"],
-                    "submitted_at": d["submitted_at"],
-                    "answered_at":  d["answered_at"],
-                    "source_url":   d["source_url"],
-                    "house":        d["house"],
-                }),
-                label=f"upsert_q:{data['id']}",
-            )
-            total_saved += 1
+            records.append({**data, "member_id": member_cache[submitter]})
             logger.info("  [%d-%03d] %s / %s", session, number, data["submitter"], data["title"][:30])
-            time.sleep(0.8)
+
+        if records:
+            batch_upsert("questions", records, on_conflict="id", label=f"questions:{session}")
+        logger.info("第%d回: %d件保存（答弁済みスキップ %d件）", session, len(records), len(answered))
+        total_saved += len(records)
 
     logger.info("衆院質問主意書 収集完了: %d件", total_saved)
 
 
+def refresh_shugiin_answers(ids: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    再確認キュー（refresh_queue.py）用。shitsumon-{回次}-{番号} のページを取り直し、
+    取得できた質問の id → {"id", "answered_at"} を返す。
+    """
+    out: dict[str, dict[str, Any]] = {}
+    for qid in ids:
+        _, session, number = qid.rsplit("-", 2)
+        data = _scrape_shitsumon(int(session), int(number))
+        if data is not None:
+            out[qid] = {"id": qid, "answered_at": data["answered_at"]}
+    return out
+
+
 # ============================================================
 # 参議院 質問主意書
 # ============================================================
 
 SANGIIN_BASE_URL = "https://www.sangiin.go.jp/japanese/joho1/kousei/syuisyo"
-SANGIIN_SESSIONS_BASE = list(range(196, 222))
-
-
-def _get_sangiin_sessions() -> list[int]:
-    sessions = SANGIIN_SESSIONS_BASE.copy()
-    next_sess = max(sessions) + 1
-    consecutive_missing = 0
-    while consecutive_missing < 2:
-        url = f"{SANGIIN_BASE_URL}/{next_sess}/syuisyo.htm"
-        try:
-            resp = requests.head(url, timeout=10)
-            if resp.status_code == 200:
-                sessions.append(next_sess)
-                consecutive_missing = 0
-                logger.info("新セッション発見: 第%d回", next_sess)
-            else:
-                consecutive_missing += 1
-        except requests.RequestException:
-            consecutive_missing += 1
-        next_sess += 1
-    return sessions
+
+# meisai 詳細ページの並行取得数（実際の同時接続数・間隔は config.HOST_BUDGETS で制限）
+SANGIIN_DETAIL_WORKERS = 4
 
 
 def _get_sangiin_submitted_at(detail_url: str) -> Optional[str]:
@@ -193,7 +212,8 @@ def _get_sangiin_submitted_at(detail_url: str) -> Optional[str]:
     例: 令和8年3月9日 → 2026-03-09
     """
     try:
-        resp = requests.get(detail_url, headers=HEADERS, timeout=15)
+        with host_budget(detail_url):
+            resp = requests.get(detail_url, headers=HEADERS, timeout=15)
         resp.encoding = resp.apparent_encoding or "utf-8"
         soup = BeautifulSoup(resp.text, "html.parser")
         text = soup.get_text(separator="\n", strip=True)
@@ -213,12 +233,13 @@ def _scrape_sangiin_session(session: int, name_to_id: dict[str, str] | None = No
       1列行: タイトル（meisai詳細ページへのリンク付き）
       4列行: 番号 / 提出者名（〇〇君） / 質問本文リンク / 答弁本文リンク
     1列行と4列行がペアになっているためセットで処理する。
-    提出日は各 detail ページ（meisai/m221XXX.htm）から取得する。
+    提出日は一覧にないため submitted_at は None で返す（_fill_submitted_at で補う）。
     """
     url = f"{SANGIIN_BASE_URL}/{session}/syuisyo.htm"
     logger.info("Fetching session %d: %s", session, url)
     try:
-        resp = requests.get(url, timeout=30)
+        with host_budget(url):
+            resp = requests.get(url, timeout=30)
         resp.raise_for_status()
     except requests.RequestException as exc:
         logger.warning("Failed to fetch session %d: %s", session, exc)
@@ -256,15 +277,13 @@ def _scrape_sangiin_session(session: int, name_to_id: dict[str, str] | None = No
                     member_id = name_to_id.get(submitter) if submitter else None
                 else:
                     member_id = make_member_id("参議院", submitter) if submitter else None
-                submitted_at = _get_sangiin_submitted_at(pending_url) if pending_url else None
-                time.sleep(0.5)
                 rows.append({
                     "id":           f"sangiin-{session}-{question_number:03d}",
                     "member_id":    member_id,
                     "session":      session,
                     "number":       question_number,
                     "title":        pending_title,
-                    "submitted_at": submitted_at,
+                    "submitted_at": None,
                     "source_url":   pending_url,
                 })
                 pending_title = None
@@ -274,9 +293,33 @@ def _scrape_sangiin_session(session: int, name_to_id: dict[str, str] | None = No
     return rows
 
 
+def _fill_submitted_at(session: int, rows: list[dict[str, Any]]) -> int:
+    """
+    rows の submitted_at を埋める。保存済みの提出日がある質問はそれを使い、
+    ない質問だけ detail ページを SANGIIN_DETAIL_WORKERS 本で並行取得する。取得件数を返す。
+    """
+    stored = {
+        r["id"]: r["submitted_at"]
+        for r in fetch_all("sangiin_questions", select="id, submitted_at", filters={"session": session})
+        if r.get("submitted_at")
+    }
+    missing = []
+    for row in rows:
+        row["submitted_at"] = stored.get(row["id"])
+        if row["submitted_at"] is None and row["source_url"]:
+            missing.append(row)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=SANGIIN_DETAIL_WORKERS) as pool:
+            dates = pool.map(_get_sangiin_submitted_at, [row["source_url"] for row in missing])
+            for row, submitted_at in zip(missing, dates):
+                row["submitted_at"] = submitted_at
+    return len(missing)
+
+
 def collect_sangiin_questions(sessions: list[int] | None = None, full: bool = False) -> None:
     if sessions is None:
-        all_known = _get_sangiin_sessions()
+        all_known = sessions_since(QUESTION_START_SESSION)
         if full:
             sessions = all_known
         else:
@@ -296,9 +339,10 @@ def collect_sangiin_questions(sessions: list[int] | None = None, full: bool = Fa
         rows = _scrape_sangiin_session(session, name_to_id)
         valid_rows = [r for r in rows if r.get("member_id") in member_ids]
         if valid_rows:
+            fetched = _fill_submitted_at(session, valid_rows)
+            logger.info("Session %d: fetched submitted_at for %d / %d questions", session, fetched, len(valid_rows))
             batch_upsert("sangiin_questions", valid_rows, on_conflict="id", label=f"sq:{session}")
             total_saved += len(valid_rows)
-        time.sleep(1)
 
     logger.info("参院質問主意書 収集完了: %d件", total_saved)
 
@@ -0,0 +1,131 @@
+"""
+はたらく議員 — 未確定レコードの再確認
+
+答弁書が未受領の衆院質問主意書、結果が未定の請願（衆参）を refresh_queue から取り出して
+ページを取り直し、確定したものだけを書き戻す。回次全体の再スクレイプは不要になる。
+
+キューはトリガーが保守する（migrations/028）。未確定のレコードが登録されると追加され、
+確定（answered_at / result が NULL でなくなる）または削除されると外れる。
+
+アルゴリズム:
+  1. next_check_at が来たものを next_check_at・enqueued_at の古い順に取り出す
+  2. 取得ページ数が REFRESH_PAGE_BUDGET に収まる分だけ、ソースごとにページを取り直す
+  3. 確定したレコードは bulk_update（トリガーがキューから外す）
+  4. 未確定のまま・取得失敗のものは attempts を増やし、
+     REFRESH_BACKOFF_BASE_DAYS × 2^(attempts−1) 日後（上限 REFRESH_BACKOFF_MAX_DAYS）に回す
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from config import REFRESH_BACKOFF_BASE_DAYS, REFRESH_BACKOFF_MAX_DAYS, REFRESH_PAGE_BUDGET
+from db import batch_upsert, bulk_update, execute_with_retry, get_client
+from sources.petitions import refresh_sangiin_results, refresh_shugiin_results
+from sources.questions import refresh_shugiin_answers
+
+logger = logging.getLogger("refresh_queue")
+
+# ソース（テーブル名）→ (再取得関数, 確定を表す列)
+REFRESHERS: dict[str, tuple[Callable[[list[str]], dict[str, dict[str, Any]]], str]] = {
+    "questions":         (refresh_shugiin_answers, "answered_at"),
+    "petitions":         (refresh_shugiin_results, "result"),
+    "sangiin_petitions": (refresh_sangiin_results, "result"),
+}
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """attempts 回目の再確認でも未確定だったレコードの次の再確認までの間隔。"""
+    days = REFRESH_BACKOFF_BASE_DAYS * 2 ** max(attempts - 1, 0)
+    return timedelta(days=min(days, REFRESH_BACKOFF_MAX_DAYS))
+
+
+def _within_budget(due: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+    """
+    取得ページ数が budget に収まる先頭からの項目を返す。
+    1件1ページ。参院請願は回次ごとに一覧ページが1枚余分にかかる。
+    """
+    picked = []
+    pages = 0
+    sangiin_sessions: set[str] = set()
+    for item in due:
+        cost = 1
+        if item["source"] == "sangiin_petitions":
+            session = item["record_id"].rsplit("-", 2)[1]
+            cost += session not in sangiin_sessions
+        if pages + cost > budget:
+            break
+        if item["source"] == "sangiin_petitions":
+            sangiin_sessions.add(session)
+        pages += cost
+        picked.append(item)
+    return picked
+
+
+def refresh_pending(budget: int = REFRESH_PAGE_BUDGET) -> int:
+    """期限の来た未確定レコードを予算内で再確認する。確定して更新した件数を返す。"""
+    client = get_client()
+    now = datetime.now(timezone.utc)
+    due = execute_with_retry(
+        lambda: client.table("refresh_queue")
+            .select("source, record_id, attempts")
+            .lte("next_check_at", now.isoformat())
+            .order("next_check_at")
+            .order("enqueued_at")
+            .limit(budget),
+        label="fetch_refresh_queue",
+    ).data or []
+    picked = _within_budget([d for d in due if d["source"] in REFRESHERS], budget)
+
+    by_source: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for item in picked:
+        by_source[item["source"]].append(item)
+
+    resolved = 0
+    postponed: list[dict[str, Any]] = []
+    for source, items in by_source.items():
+        refresh, column = REFRESHERS[source]
+        fetched = refresh([item["record_id"] for item in items])
+
+        # 確定したものだけ書き戻す（キューからはトリガーが外す）
+        done = [row for row in fetched.values() if row[column] is not None]
+        resolved += bulk_update(source, done, label=f"refresh:{source}")
+
+        for item in items:
+            row = fetched.get(item["record_id"])
+            if row is not None and row[column] is not None:
+                continue
+            attempts = item["attempts"] + 1
+            postponed.append({
+                "source":          source,
+                "record_id":       item["record_id"],
+                "attempts":        attempts,
+                "last_checked_at": now.isoformat(),
+                "next_check_at":   (now + backoff_delay(attempts)).isoformat(),
+            })
+        logger.info(f"{source}: rechecked {len(items)}, resolved {len(done)}")
+
+    batch_upsert("refresh_queue", postponed, on_conflict="source,record_id", label="refresh_queue_backoff")
+    logger.info(f"Refresh queue: {len(picked)} / {len(due)} due items checked, {resolved} resolved")
+    return resolved
+
+
+def main() -> None:
+    count = refresh_pending()
+    logger.info(f"Done. {count} records resolved.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    try:
+        main()
+    except Exception:
+        logger.exception("refresh_queue failed")
+        sys.exit(1)
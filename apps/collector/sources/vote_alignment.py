@@ -5,49 +5,92 @@
 party_vote_alignments テーブルに保存する。
 
 アルゴリズム:
-  1. 全採決記録と議員→政党マッピングを取得
-  2. 法案ごとに各政党の多数決（賛成 or 反対）を決定
-  3. 全政党ペアについて「同じ多数決を取った割合」を計算
+  1. 全採決記録（議員・賛否・採決 ID）と議員→政党マッピングを取得
+  2. 採決（vote_events）ごとに各政党の多数決（賛成 or 反対）を決定し、
+     政党×採決の int8 行列 M（+1=賛成 / −1=反対 / 0=採決なし）にする
+  3. 出席マスク A = (M != 0) として、全政党ペアの
+       比較件数 = A·Aᵀ、（一致 − 不一致）= M·Mᵀ
+     の2回の行列積で一致率を計算
   4. party_vote_alignments に upsert
+     回次別・年別の内訳は party_vote_alignment_breakdowns に upsert
+
+日次（update_alignment）は全件を再計算しない。採決ごとの政党別多数決
+（vote_alignment_majorities）とペアごとの (比較件数, 一致件数)（vote_alignment_pairs）を
+保持しておき、前回以降に取り込まれた採決（vote_events.fetched_at）だけについて、
+旧多数決の寄与を差し引き、新多数決の寄与を足して一致率を更新する。
+ALIGNMENT_FULL_REBUILD_DAYS ごとに compute_alignment（全件再計算）を実行し、
+保持しているカウンターを検証・置換する（回次別・年別の内訳も全件再計算時に更新）。
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
 import sys
-from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
 
-from db import get_client, execute_with_retry, batch_upsert
+from config import ALIGNMENT_FULL_REBUILD_DAYS, IN_FILTER_CHUNK
+from db import (
+    get_client,
+    execute_with_retry,
+    batch_upsert,
+    delete_in,
+    fetch_columns,
+    fetch_setting,
+    save_setting,
+)
 
 logger = logging.getLogger("vote_alignment")
 
+# これ未満の比較件数のペアは保存しない
+MIN_SAMPLE_SIZE = 5
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# site_settings のキー
+WATERMARK_KEY = "alignment_events_watermark"  # 適用済み vote_events.fetched_at の最大値
+LAST_FULL_KEY = "alignment_last_full_at"      # 最後に全件再計算した日（ISO 形式）
+
+# 差分適用で1回に扱う変更採決数の上限（超えたら全件再計算）
+MAX_DELTA_EVENTS = 2000
+
+
+def fetch_all_votes() -> dict[str, Any]:
+    """votes テーブルを全件取得する（列指向: member_id / vote / event_id）。"""
+    votes = fetch_columns(
+        "votes",
+        {"member_id": "str", "vote": "str", "event_id": "int"},
+        label="fetch_votes",
+    )
+    logger.info(f"Fetched {len(votes['member_id'])} vote records")
+    return votes
+
+
+def fetch_vote_events() -> dict[str, Any]:
+    """vote_events テーブルを全件取得する（列指向: id / 回次 / 採決日 / 案件名）。"""
+    events = fetch_columns(
+        "vote_events",
+        {"id": "int", "session": "int", "vote_date": "date", "bill_title": "str"},
+        label="fetch_vote_events",
+    )
+    logger.info(f"Fetched {len(events['id'])} vote events")
+    return events
 
-def fetch_all_votes() -> list[dict]:
-    """votes テーブルを全件取得（cursor pagination）。"""
-    client = get_client()
-    all_votes: list[dict] = []
-    last_id = ""
-
-    while True:
-        result = execute_with_retry(
-            lambda lid=last_id: client.table("votes")
-                .select("id, member_id, bill_title, vote")
-                .gt("id", lid)
-                .order("id")
-                .limit(1000),
-            label="fetch_votes",
-        )
-        batch = result.data or []
-        if not batch:
-            break
-        all_votes.extend(batch)
-        last_id = batch[-1]["id"]
-        if len(batch) < 1000:
-            break
 
-    logger.info(f"Fetched {len(all_votes)} vote records")
-    return all_votes
+def event_attribute(events: dict[str, Any], column: str, event_ids: np.ndarray) -> np.ndarray:
+    """
+    採決 ID の配列に対応する vote_events の列の値を返す（"int" / "date" 列のみ）。
+    vote_events にない ID は 0。
+    """
+    ids = np.frombuffer(events["id"], dtype=np.int64)
+    dtype = np.int32 if column == "vote_date" else np.int64
+    size = int(max(ids.max(initial=0), event_ids.max(initial=0))) + 1
+    lookup = np.zeros(size, dtype=dtype)
+    lookup[ids] = np.frombuffer(events[column], dtype=dtype)
+    return lookup[event_ids]
 
 
 def fetch_member_parties() -> dict[str, str]:
@@ -65,61 +108,110 @@ def fetch_member_parties() -> dict[str, str]:
     return mapping
 
 
-def compute_alignment() -> int:
-    """一致率を計算して DB に保存する。保存件数を返す。"""
-    votes = fetch_all_votes()
-    member_party = fetch_member_parties()
+def majority_matrix(
+    party: np.ndarray, bill: np.ndarray, is_yes: np.ndarray, n_parties: int, n_bills: int,
+) -> np.ndarray:
+    """
+    採決記録（政党コード・法案コード・賛成か）から政党×法案の多数決行列を作る。
+    賛成 >= 反対 なら +1、反対多数なら −1、その政党の採決がなければ 0（int8）。
+    """
+    cell = party.astype(np.int64) * n_bills + bill
+    size = n_parties * n_bills
+    yes = np.bincount(cell, weights=is_yes, minlength=size).reshape(n_parties, n_bills)
+    total = np.bincount(cell, minlength=size).reshape(n_parties, n_bills)
+    no = total - yes
+    return np.where(total > 0, np.where(yes >= no, 1, -1), 0).astype(np.int8)
 
-    # bill_title → party → {"賛成": n, "反対": n}
-    bill_party_counts: dict[str, dict[str, dict[str, int]]] = defaultdict(
-        lambda: defaultdict(lambda: defaultdict(int))
-    )
-    for v in votes:
-        party = member_party.get(v["member_id"])
-        if not party or v["vote"] not in ("賛成", "反対"):
-            continue
-        bill_party_counts[v["bill_title"]][party][v["vote"]] += 1
-
-    # bill_title → party → "賛成" or "反対"（多数決）
-    bill_party_majority: dict[str, dict[str, str]] = {}
-    for bill, parties in bill_party_counts.items():
-        majorities: dict[str, str] = {}
-        for party, counts in parties.items():
-            yes = counts.get("賛成", 0)
-            no  = counts.get("反対", 0)
-            if yes + no >= 1:
-                majorities[party] = "賛成" if yes >= no else "反対"
-        if len(majorities) >= 2:
-            bill_party_majority[bill] = majorities
-
-    logger.info(f"Bills with multi-party votes: {len(bill_party_majority)}")
-
-    # 全政党リスト（アルファベット順で一意なペアを作る）
-    all_parties = sorted({p for m in bill_party_majority.values() for p in m})
-    logger.info(f"Parties found: {all_parties}")
 
-    now = datetime.now(timezone.utc).isoformat()
-    rows: list[dict] = []
+def pair_counts(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    多数決行列から全政党ペアの (比較件数, 一致件数) を返す（いずれも 政党×政党）。
+    比較件数 = A·Aᵀ、一致 − 不一致 = M·Mᵀ なので 一致 = (比較件数 + M·Mᵀ) / 2。
+    """
+    # float32 の行列積は BLAS で計算でき、件数が 2**24 未満の間は整数として厳密
+    m = matrix.astype(np.float32)
+    present = (m != 0).astype(np.float32)
+    both = np.rint(present @ present.T).astype(np.int64)
+    same = (both + np.rint(m @ m.T).astype(np.int64)) // 2
+    return both, same
+
 
-    for i, pa in enumerate(all_parties):
-        for pb in all_parties[i + 1:]:
-            both = same = 0
-            for majorities in bill_party_majority.values():
-                if pa in majorities and pb in majorities:
-                    both += 1
-                    if majorities[pa] == majorities[pb]:
-                        same += 1
-            # サンプルが少なすぎる場合はスキップ
-            if both < 5:
+def _alignment_rows(parties: list[str], both: np.ndarray, same: np.ndarray, **extra) -> list[dict]:
+    """
+    ペア行列から party_a < party_b の行を作る（比較件数が MIN_SAMPLE_SIZE 未満は除外）。
+    parties は昇順に並んでいること。
+    """
+    rows = []
+    for i in range(len(parties)):
+        for j in range(i + 1, len(parties)):
+            if both[i, j] < MIN_SAMPLE_SIZE:
                 continue
             rows.append({
-                "party_a":        pa,
-                "party_b":        pb,
-                "alignment_rate": round(same / both, 4),
-                "sample_size":    both,
-                "updated_at":     now,
+                "party_a":        parties[i],
+                "party_b":        parties[j],
+                "alignment_rate": round(int(same[i, j]) / int(both[i, j]), 4),
+                "sample_size":    int(both[i, j]),
+                **extra,
             })
+    return rows
+
+
+def _grouped_alignment_rows(
+    party: np.ndarray, bill: np.ndarray, is_yes: np.ndarray, group: np.ndarray,
+    parties: list[str], n_bills: int, period_type: str, now: str,
+) -> list[dict]:
+    """
+    group（回次・年）ごとの一致率。採決列を (group, 採決) の組にして1つの行列を作り、
+    group ごとの連続した列範囲で行列積を取る（合計の計算量は全体の1回分と同じ）。
+    """
+    keep = group > 0
+    if not keep.any():
+        return []
+    key = group[keep].astype(np.int64) * n_bills + bill[keep]
+    columns, col_of = np.unique(key, return_inverse=True)
+    matrix = majority_matrix(party[keep], col_of, is_yes[keep], len(parties), len(columns))
 
+    col_group = columns // n_bills
+    bounds = np.flatnonzero(np.diff(col_group)) + 1
+    rows: list[dict] = []
+    for lo, hi in zip([0, *bounds], [*bounds, len(columns)]):
+        both, same = pair_counts(matrix[:, lo:hi])
+        rows += _alignment_rows(
+            parties, both, same,
+            period_type=period_type, period=int(col_group[lo]), updated_at=now,
+        )
+    return rows
+
+
+def _encode_votes(
+    votes: dict[str, Any], parties: list[str], member_party: dict[str, str],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    採決記録を (政党コード, 採決 ID, 賛成なら1.0) の配列にする。
+    参院議員以外・採決 ID のない行・賛成/反対以外の記録は除く。
+    """
+    party_code = {p: i for i, p in enumerate(parties)}
+    member_col = votes["member_id"]
+    party_of_member = np.array(
+        [party_code.get(member_party.get(mid), -1) for mid in member_col.values] + [-1],
+        dtype=np.int32,
+    )
+
+    vote_codes = np.frombuffer(votes["vote"].codes, dtype=np.int32)
+    yes_code = votes["vote"].code_of("賛成")
+    no_code = votes["vote"].code_of("反対")
+    event_all = np.frombuffer(votes["event_id"], dtype=np.int64)
+    # コード −1（NULL）は末尾の番兵 −1 を引く
+    party_all = party_of_member[np.frombuffer(member_col.codes, dtype=np.int32)]
+
+    is_yes_all = vote_codes == yes_code if yes_code >= 0 else np.zeros(len(vote_codes), dtype=bool)
+    is_no_all = vote_codes == no_code if no_code >= 0 else np.zeros(len(vote_codes), dtype=bool)
+    keep = (party_all >= 0) & (event_all > 0) & (is_yes_all | is_no_all)
+    return party_all[keep], event_all[keep], is_yes_all[keep].astype(np.float64)
+
+
+def _upsert_alignments(parties: list[str], both: np.ndarray, same: np.ndarray, now: str) -> int:
+    rows = _alignment_rows(parties, both, same, updated_at=now)
     if rows:
         batch_upsert(
             "party_vote_alignments",
@@ -130,12 +222,257 @@ def compute_alignment() -> int:
         logger.info(f"Upserted {len(rows)} party alignment records")
     else:
         logger.warning("No alignment records computed — votes table may be empty")
-
     return len(rows)
 
 
+# ============================================================
+# 差分更新用の状態（vote_alignment_majorities / vote_alignment_pairs）
+# ============================================================
+
+def _events_head(client) -> str | None:
+    """vote_events.fetched_at の最大値。"""
+    rows = execute_with_retry(
+        lambda: client.table("vote_events").select("fetched_at").order("fetched_at", desc=True).limit(1),
+        label="vote_events_head",
+    ).data or []
+    return rows[0]["fetched_at"] if rows else None
+
+
+def _load_pairs(client) -> dict[tuple[str, str], list[int]]:
+    rows = execute_with_retry(
+        lambda: client.table("vote_alignment_pairs").select("party_a, party_b, both_count, same_count").limit(2000),
+        label="fetch_alignment_pairs",
+    ).data or []
+    return {(r["party_a"], r["party_b"]): [r["both_count"], r["same_count"]] for r in rows}
+
+
+def _pair_rows(pairs: dict[tuple[str, str], list[int]], keys=None) -> list[dict]:
+    return [
+        {"party_a": a, "party_b": b, "both_count": pairs[(a, b)][0], "same_count": pairs[(a, b)][1]}
+        for a, b in (keys if keys is not None else pairs)
+    ]
+
+
+def _pairs_from_matrix(parties: list[str], both: np.ndarray, same: np.ndarray) -> dict[tuple[str, str], list[int]]:
+    return {
+        (parties[i], parties[j]): [int(both[i, j]), int(same[i, j])]
+        for i in range(len(parties)) for j in range(i + 1, len(parties)) if both[i, j]
+    }
+
+
+def _majority_rows(parties: list[str], event_ids: np.ndarray, matrix: np.ndarray) -> list[dict]:
+    pi, bi = np.nonzero(matrix)
+    return [
+        {"event_id": int(event_ids[b]), "party": parties[p], "majority": int(matrix[p, b])}
+        for p, b in zip(pi, bi)
+    ]
+
+
+def _save_full_state(parties: list[str], event_ids: np.ndarray, matrix: np.ndarray, both: np.ndarray, same: np.ndarray) -> None:
+    """全件再計算の結果で保持状態を置き換え、以前のカウンターとの不一致を報告する。"""
+    client = get_client()
+    old_pairs = _load_pairs(client)
+    new_pairs = _pairs_from_matrix(parties, both, same)
+    if old_pairs:
+        mismatched = [k for k in old_pairs.keys() | new_pairs.keys() if old_pairs.get(k) != new_pairs.get(k)]
+        if mismatched:
+            logger.warning(f"差分更新と全件再計算の不一致: {len(mismatched)} ペア（全件再計算の値で置換）")
+        else:
+            logger.info("✓ 差分更新と全件再計算のカウンターが一致しました。")
+
+    execute_with_retry(
+        lambda: client.table("vote_alignment_majorities").delete().gt("event_id", 0),
+        label="clear_alignment_majorities",
+    )
+    batch_upsert(
+        "vote_alignment_majorities", _majority_rows(parties, event_ids, matrix),
+        on_conflict="event_id,party", label="alignment_majorities",
+    )
+    execute_with_retry(
+        lambda: client.table("vote_alignment_pairs").delete().neq("party_a", ""),
+        label="clear_alignment_pairs",
+    )
+    batch_upsert("vote_alignment_pairs", _pair_rows(new_pairs), on_conflict="party_a,party_b", label="alignment_pairs")
+
+
+def compute_alignment() -> int:
+    """一致率を全件から計算して DB に保存し、差分更新用の状態を置き換える。保存件数（全期間）を返す。"""
+    client = get_client()
+    # 取得前の vote_events 位置。以降に取り込まれた採決は次回の差分更新で適用する。
+    head = _events_head(client)
+
+    votes = fetch_all_votes()
+    events = fetch_vote_events()
+    member_party = fetch_member_parties()
+    parties = sorted(set(member_party.values()))
+    party, event, is_yes = _encode_votes(votes, parties, member_party)
+    event_ids, bill = np.unique(event, return_inverse=True)
+    n_bills = len(event_ids)
+
+    matrix = majority_matrix(party, bill, is_yes, len(parties), n_bills)
+    logger.info(f"Votes with multi-party results: {int(((matrix != 0).sum(axis=0) >= 2).sum())}")
+    logger.info(f"Parties found: {[p for p, n in zip(parties, (matrix != 0).any(axis=1)) if n]}")
+
+    now = datetime.now(timezone.utc).isoformat()
+    both, same = pair_counts(matrix)
+    saved = _upsert_alignments(parties, both, same, now)
+
+    # ── 回次別・年別の内訳 ───────────────────────────────────
+    sessions = event_attribute(events, "session", event)
+    ordinals = event_attribute(events, "vote_date", event)
+    years = np.where(
+        ordinals > 0,
+        (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970,
+        0,
+    )
+    breakdown = (
+        _grouped_alignment_rows(party, bill, is_yes, sessions, parties, n_bills, "session", now)
+        + _grouped_alignment_rows(party, bill, is_yes, years, parties, n_bills, "year", now)
+    )
+    if breakdown:
+        batch_upsert(
+            "party_vote_alignment_breakdowns",
+            breakdown,
+            on_conflict="party_a,party_b,period_type,period",
+            label="vote_alignment_breakdowns",
+        )
+        logger.info(f"Upserted {len(breakdown)} session/year alignment records")
+
+    # ── 差分更新用の状態 ─────────────────────────────────────
+    _save_full_state(parties, event_ids, matrix, both, same)
+    if head:
+        save_setting(WATERMARK_KEY, head)
+    save_setting(LAST_FULL_KEY, date.today().isoformat())
+    return saved
+
+
+def apply_alignment_deltas(watermark: str) -> int | None:
+    """
+    watermark 以降に取り込まれた採決だけ多数決を再計算し、
+    ペアカウンターに差分を反映して一致率を更新する。
+    変更採決が MAX_DELTA_EVENTS を超える場合は何もせず None を返す（全件再計算に任せる）。
+    """
+    client = get_client()
+    changed_events = execute_with_retry(
+        lambda: client.table("vote_events")
+            .select("id, fetched_at")
+            .gt("fetched_at", watermark)
+            .order("fetched_at")
+            .limit(MAX_DELTA_EVENTS + 1),
+        label="fetch_changed_vote_events",
+    ).data or []
+    if len(changed_events) > MAX_DELTA_EVENTS:
+        logger.info(f"変更採決が {MAX_DELTA_EVENTS} 件を超えたため全件再計算します")
+        return None
+    if not changed_events:
+        logger.info("新しい採決なし。一致率は変更しません。")
+        return 0
+
+    head = changed_events[-1]["fetched_at"]
+    event_ids = np.array(sorted({e["id"] for e in changed_events}), dtype=np.int64)
+    logger.info(f"差分適用: {len(event_ids)} 採決")
+
+    # 保持している多数決（旧）
+    old: dict[int, dict[str, int]] = {int(e): {} for e in event_ids}
+    for i in range(0, len(event_ids), IN_FILTER_CHUNK):
+        chunk = [int(e) for e in event_ids[i:i + IN_FILTER_CHUNK]]
+        for r in execute_with_retry(
+            lambda c=chunk: client.table("vote_alignment_majorities")
+                .select("event_id, party, majority")
+                .in_("event_id", c)
+                .limit(len(c) * 100),
+            label=f"fetch_alignment_majorities:{i}",
+        ).data or []:
+            old[r["event_id"]][r["party"]] = r["majority"]
+
+    pairs = _load_pairs(client)
+    member_party = fetch_member_parties()
+    parties = sorted(
+        set(member_party.values())
+        | {p for m in old.values() for p in m}
+        | {p for pair in pairs for p in pair}
+    )
+    party_index = {p: i for i, p in enumerate(parties)}
+
+    # 採決ごとに votes を再取得して多数決（新）を作る
+    new_matrix = np.zeros((len(parties), len(event_ids)), dtype=np.int8)
+    for t, event_id in enumerate(event_ids):
+        votes = fetch_columns(
+            "votes", {"member_id": "str", "vote": "str", "event_id": "int"},
+            filters={"event_id": int(event_id)}, partitions=1, label=f"fetch_votes:{event_id}",
+        )
+        party, _, is_yes = _encode_votes(votes, parties, member_party)
+        new_matrix[:, t] = majority_matrix(party, np.zeros(len(party), dtype=np.int64), is_yes, len(parties), 1)[:, 0]
+
+    old_matrix = np.zeros_like(new_matrix)
+    for t, event_id in enumerate(event_ids):
+        for p, m in old[int(event_id)].items():
+            old_matrix[party_index[p], t] = m
+
+    # 旧多数決の寄与を差し引き、新多数決の寄与を足す
+    both_new, same_new = pair_counts(new_matrix)
+    both_old, same_old = pair_counts(old_matrix)
+    d_both, d_same = both_new - both_old, same_new - same_old
+    changed = []
+    for i, j in zip(*np.nonzero(np.triu(np.abs(d_both) + np.abs(d_same), k=1))):
+        key = (parties[i], parties[j])
+        counts = pairs.setdefault(key, [0, 0])
+        counts[0] += int(d_both[i, j])
+        counts[1] += int(d_same[i, j])
+        changed.append(key)
+    logger.info(f"ペアカウンター更新: {len(changed)} ペア")
+
+    delete_in(
+        "vote_alignment_majorities", "event_id", [int(e) for e in event_ids],
+        label="clear_alignment_majorities",
+    )
+    batch_upsert(
+        "vote_alignment_majorities", _majority_rows(parties, event_ids, new_matrix),
+        on_conflict="event_id,party", label="alignment_majorities",
+    )
+    if changed:
+        batch_upsert("vote_alignment_pairs", _pair_rows(pairs, changed), on_conflict="party_a,party_b", label="alignment_pairs")
+
+    # カウンターから一致率を作り直す
+    both = np.zeros((len(parties), len(parties)), dtype=np.int64)
+    same = np.zeros_like(both)
+    for (a, b), (n_both, n_same) in pairs.items():
+        both[party_index[a], party_index[b]] = n_both
+        same[party_index[a], party_index[b]] = n_same
+    saved = _upsert_alignments(parties, both, same, datetime.now(timezone.utc).isoformat())
+
+    save_setting(WATERMARK_KEY, head)
+    return saved
+
+
+def update_alignment(full: bool = False) -> int:
+    """
+    日次エントリポイント。新しく取り込まれた採決の差分だけを適用し、
+    全件再計算が必要な場合（初回・--full・前回から ALIGNMENT_FULL_REBUILD_DAYS 日経過・
+    変更採決が多すぎる）は compute_alignment を実行する。保存件数を返す。
+    """
+    watermark = fetch_setting(WATERMARK_KEY)
+    last_full = fetch_setting(LAST_FULL_KEY)
+    rebuild_due = (
+        full
+        or watermark is None
+        or last_full is None
+        or date.fromisoformat(last_full) <= date.today() - timedelta(days=ALIGNMENT_FULL_REBUILD_DAYS)
+    )
+    if not rebuild_due:
+        saved = apply_alignment_deltas(watermark)
+        if saved is not None:
+            return saved
+
+    logger.info(f"全件再計算を実行します（前回: {last_full or 'なし'}）")
+    return compute_alignment()
+
+
 def main() -> None:
-    count = compute_alignment()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="差分適用せず全件から再計算する")
+    args = parser.parse_args()
+    count = update_alignment(full=args.full)
     logger.info(f"Done. {count} records saved.")
 
 
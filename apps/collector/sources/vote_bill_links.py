@@ -0,0 +1,176 @@
+"""
+はたらく議員 — 参院採決と法案の紐付け
+
+vote_events（参院の採決）の案件名と bills の法案名を照合し、
+vote_events.bill_id に対応する法案 ID を保存する。Web 側は bill_id で
+法案ごとの議員の賛否を引ける（クライアント側のあいまい一致が不要になる）。
+
+アルゴリズム:
+  1. 採決・法案の名前を正規化（全角半角の統一・「日程第N」・括弧書き・空白の除去）
+  2. 法案名の文字 NGRAM グラムの転置インデックスを1回だけ作る
+  3. 採決ごとに、出現法案数が少ないグラムから候補法案を集め、
+     グラム集合の Dice 係数が MIN_LINK_SCORE 以上の最良の法案を選ぶ
+     （同点は 参院採決日の一致 > 回次の一致 > 回次の近さ の順）
+  4. bill_id が変わった採決だけを bulk_update で書き戻す
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+
+from db import bulk_update, fetch_columns
+
+logger = logging.getLogger("vote_bill_links")
+
+# 法案名の照合に使う文字グラムの長さ
+NGRAM = 2
+
+# これ未満の Dice 係数では紐付けない
+MIN_LINK_SCORE = 0.8
+
+# 全法案のこの割合を超えて出現するグラム（「法律」「律案」など）は候補集めに使わない
+COMMON_GRAM_RATIO = 0.05
+
+_AGENDA_PREFIX = re.compile(r"^日程第[0-9一二三四五六七八九十百]+(?:(?:及び|、|,)第[0-9一二三四五六七八九十百]+)*")
+_BRACKETED = re.compile(r"\([^()]*\)|\[[^\[\]]*\]|【[^【】]*】|〔[^〔〕]*〕")
+
+
+def normalize_title(title: str) -> str:
+    """
+    照合用に法案名を正規化する。
+    NFKC で全角英数・括弧を半角に揃え、先頭の「日程第N」と括弧書き（提出者・送付元など）、空白を除く。
+    """
+    text = unicodedata.normalize("NFKC", title or "")
+    text = re.sub(r"\s+", "", text)
+    text = _AGENDA_PREFIX.sub("", text)
+    # 入れ子の括弧は内側から順に外す
+    while True:
+        stripped = _BRACKETED.sub("", text)
+        if stripped == text:
+            break
+        text = stripped
+    return text
+
+
+def title_grams(title: str) -> frozenset[str]:
+    """正規化済みの名前の文字 NGRAM グラム集合（NGRAM 文字未満なら名前そのもの）。"""
+    if len(title) < NGRAM:
+        return frozenset([title]) if title else frozenset()
+    return frozenset(title[i:i + NGRAM] for i in range(len(title) - NGRAM + 1))
+
+
+def build_title_index(grams: list[frozenset[str]]) -> dict[str, list[int]]:
+    """グラム → そのグラムを含む法案の番号リスト（転置インデックス）。"""
+    index: dict[str, list[int]] = defaultdict(list)
+    for i, gs in enumerate(grams):
+        for g in gs:
+            index[g].append(i)
+    return index
+
+
+def match_title(
+    grams: frozenset[str],
+    bill_grams: list[frozenset[str]],
+    index: dict[str, list[int]],
+    max_posting: int,
+) -> list[tuple[int, float]]:
+    """
+    採決名のグラム集合に対して Dice 係数が MIN_LINK_SCORE 以上の法案を (番号, 係数) で返す。
+    出現法案数が max_posting 以下のグラムだけで候補を集める
+    （該当グラムがなければ出現法案数が最少のグラムを使う）。
+    """
+    postings = [index[g] for g in grams if g in index]
+    if not postings:
+        return []
+    rare = [p for p in postings if len(p) <= max_posting] or [min(postings, key=len)]
+    candidates: set[int] = set()
+    for posting in rare:
+        candidates.update(posting)
+    out = []
+    for i in candidates:
+        score = 2 * len(grams & bill_grams[i]) / (len(grams) + len(bill_grams[i]))
+        if score >= MIN_LINK_SCORE:
+            out.append((i, score))
+    return out
+
+
+def link_vote_events() -> int:
+    """全採決を法案に紐付け、bill_id が変わった採決を更新する。更新件数を返す。"""
+    bills = fetch_columns(
+        "bills",
+        {"id": "str", "title": "str", "session_number": "int", "vote_date_san": "date"},
+        strict=True,
+        label="fetch_bills_for_links",
+    )
+    events = fetch_columns(
+        "vote_events",
+        {"id": "int", "session": "int", "vote_date": "date", "bill_title": "str", "bill_id": "str"},
+        strict=True,
+        label="fetch_vote_events_for_links",
+    )
+
+    # 名前は辞書エンコード済みなので、正規化・グラム化は異なる名前ごとに1回
+    bill_title_grams = [title_grams(normalize_title(t)) for t in bills["title"].values]
+    bill_grams = [
+        bill_title_grams[c] if c >= 0 else frozenset()
+        for c in bills["title"].codes
+    ]
+    index = build_title_index(bill_grams)
+    max_posting = max(1, int(len(bill_grams) * COMMON_GRAM_RATIO))
+    logger.info(f"Title index: {len(bill_grams)} bills, {len(index)} grams")
+
+    # 異なる採決名ごとに候補を求める
+    event_titles = events["bill_title"]
+    matches = [
+        match_title(title_grams(normalize_title(t)), bill_grams, index, max_posting)
+        for t in event_titles.values
+    ]
+
+    rows = []
+    linked = 0
+    for i, event_id in enumerate(events["id"]):
+        code = event_titles.codes[i]
+        best = None
+        if code >= 0 and matches[code]:
+            session, vote_date = events["session"][i], events["vote_date"][i]
+            best = max(
+                matches[code],
+                key=lambda m: (
+                    round(m[1], 6),
+                    vote_date > 0 and bills["vote_date_san"][m[0]] == vote_date,
+                    bills["session_number"][m[0]] == session,
+                    -abs(bills["session_number"][m[0]] - session),
+                ),
+            )
+        bill_id = bills["id"].value(best[0]) if best else None
+        linked += bill_id is not None
+        if bill_id != events["bill_id"].value(i):
+            rows.append({
+                "id":               event_id,
+                "bill_id":          bill_id,
+                "bill_match_score": round(best[1], 4) if best else None,
+            })
+
+    logger.info(f"Linked {linked} / {len(events['id'])} vote events to bills ({len(rows)} changed)")
+    return bulk_update("vote_events", rows, label="vote_bill_links")
+
+
+def main() -> None:
+    count = link_vote_events()
+    logger.info(f"Done. {count} vote events updated.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    try:
+        main()
+    except Exception:
+        logger.exception("vote_bill_links failed")
+        sys.exit(1)
@@ -2,21 +2,32 @@
 はたらく議員 — 参議院本会議投票結果スクレイパー
 参議院サイトから各国会回次の投票結果を取得し、議員ごとの賛否を記録する。
 衆議院は個人別投票記録が公開されていないため対象外。
+
+取り込み済みの投票ページは vote_pages（URL と本文ハッシュ）に記録し、
+索引ページのハッシュが変わらない回次はスキップ、変わった回次も未取り込みの
+ページだけを取得する。ページ取得は参議院ホストの予算内で並行実行する。
+
+投票ページ1件が1つの採決（vote_events の行、整数 ID）になり、votes の各行は
+event_id でそれを参照する。集計処理は案件名の文字列ではなく event_id で採決を区別する。
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import re
-import time
 import logging
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
 import httpx
 from bs4 import BeautifulSoup
 
-from db import get_client, execute_with_retry, batch_upsert
-from utils import make_member_id
-from config import SESSION_MAX
+from db import get_client, execute_with_retry, batch_upsert, fetch_all, fetch_columns
+from session_registry import current_session
+from utils import host_budget, make_member_id
 
 logger = logging.getLogger("vote_scraper")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
@@ -27,6 +38,12 @@ SANGIIN_BASE = "https://www.sangiin.go.jp"
 # バックフィル: 208回〜最新セッション（404は graceful skip）
 BACKFILL_START_SESSION = 208
 
+# 投票ページの並行取得数（実際の同時接続数・間隔は config.HOST_BUDGETS で制限）
+VOTE_PAGE_WORKERS = 4
+
+# member_vote_stats の列 → votes.vote の値（total は全行）
+VOTE_STAT_COLUMNS = {"yea": "賛成", "nay": "反対", "absent": "欠席"}
+
 
 def normalize_name(name: str) -> str:
     name = name.replace("\u3000", " ").replace("\u3000", " ").strip()
@@ -34,21 +51,47 @@ def normalize_name(name: str) -> str:
     return name
 
 
-def fetch_vote_index(session: int) -> list[dict]:
-    url = f"{SANGIIN_BASE}/japanese/touhyoulist/{session}/vote_ind.htm"
-    logger.info(f"Fetching vote index: {url}")
+def _fetch_html(url: str) -> str | None:
+    """
+    ホスト予算内で URL を取得して本文を返す。200 以外（404・5xx・メンテナンス画面）・通信失敗は None。
+    エラー画面の本文をハッシュしてマニフェストに記録しないよう、取得失敗として扱う。
+    """
     try:
-        resp = httpx.get(url, headers=HEADERS, timeout=30)
-        if resp.status_code == 404:
-            logger.warning(f"Session {session}: vote index not found")
-            return []
-        resp.encoding = "utf-8"
-        soup = BeautifulSoup(resp.text, "html.parser")
+        with host_budget(url):
+            resp = httpx.get(url, headers=HEADERS, timeout=30)
     except Exception as e:
-        logger.warning(f"Failed to fetch vote index session {session}: {e}")
+        logger.warning(f"Failed to fetch {url}: {e}")
+        return None
+    if resp.status_code != 200:
+        if resp.status_code != 404:
+            logger.warning(f"Failed to fetch {url}: HTTP {resp.status_code}")
+        return None
+    resp.encoding = "utf-8"
+    return resp.text
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode()).hexdigest()
+
+
+def vote_index_url(session: int) -> str:
+    return f"{SANGIIN_BASE}/japanese/touhyoulist/{session}/vote_ind.htm"
+
+
+def fetch_vote_index(session: int) -> list[dict]:
+    url = vote_index_url(session)
+    logger.info(f"Fetching vote index: {url}")
+    html = _fetch_html(url)
+    if html is None:
+        logger.warning(f"Session {session}: vote index not found")
         return []
+    return _parse_vote_index(html, session)
+
 
+def _parse_vote_index(html: str, session: int) -> list[dict]:
+    soup = BeautifulSoup(html, "html.parser")
     votes = []
+    seen: set[str] = set()
     for a in soup.select("a[href]"):
         href = a.get("href", "")
         if re.search(rf"{session}-\d{{4}}-v\d{{3}}\.htm", href):
@@ -59,6 +102,9 @@ def fetch_vote_index(session: int) -> list[dict]:
                 full_url = f"{SANGIIN_BASE}{href}"
             else:
                 full_url = f"{SANGIIN_BASE}/japanese/touhyoulist/{session}/{href}"
+            if full_url in seen:
+                continue
+            seen.add(full_url)
             votes.append({
                 "url": full_url,
                 "title": text,
@@ -70,14 +116,15 @@ def fetch_vote_index(session: int) -> list[dict]:
 
 
 def parse_vote_page(url: str, session: int, member_ids: set[str]) -> list[dict]:
-    logger.info(f"  Parsing: {url}")
-    try:
-        resp = httpx.get(url, headers=HEADERS, timeout=30)
-        resp.encoding = "utf-8"
-        soup = BeautifulSoup(resp.text, "html.parser")
-    except Exception as e:
-        logger.warning(f"  Failed to fetch {url}: {e}")
+    html = _fetch_html(url)
+    if html is None:
         return []
+    return _parse_vote_html(html, url, session, member_ids)
+
+
+def _parse_vote_html(html: str, url: str, session: int, member_ids: set[str]) -> list[dict]:
+    logger.info(f"  Parsing: {url}")
+    soup = BeautifulSoup(html, "html.parser")
 
     # 案件名を取得
     bill_title = ""
@@ -135,7 +182,6 @@ def parse_vote_page(url: str, session: int, member_ids: set[str]) -> list[dict]:
                 continue
 
             # IDはハッシュで一意にする
-            import hashlib
             raw_id = f"{session}-{bill_title}-{member_id}"
             vote_id = f"sv-{hashlib.md5(raw_id.encode()).hexdigest()[:16]}"
 
@@ -164,43 +210,168 @@ def get_member_ids() -> set[str]:
     return ids
 
 
-def collect_sessions(sessions: list[int], member_ids: set[str]) -> int:
+def _load_manifest(session: int) -> dict[str, str]:
+    """vote_pages から回次の取り込み済み URL → 本文ハッシュを取得する（索引ページを含む）。"""
+    rows = fetch_all("vote_pages", select="url, content_hash", filters={"session": session})
+    return {r["url"]: r["content_hash"] for r in rows}
+
+
+def _manifest_row(url: str, session: int, digest: str, record_count: int) -> dict:
+    return {
+        "url": url,
+        "session": session,
+        "content_hash": digest,
+        "record_count": record_count,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _harvest_page(
+    vp: dict, member_ids: set[str], known_hash: str | None,
+) -> tuple[list[dict], dict | None] | None:
+    """
+    投票ページを取得・解析し、(レコード, vote_pages 行) を返す。取得失敗は None。
+    本文ハッシュが記録済みの値と同じなら解析せず ([], None) を返す。
+    """
+    html = _fetch_html(vp["url"])
+    if html is None:
+        return None
+    digest = content_hash(html)
+    if digest == known_hash:
+        return [], None
+    records = _parse_vote_html(html, vp["url"], vp["session"], member_ids)
+    return records, _manifest_row(vp["url"], vp["session"], digest, len(records))
+
+
+def _register_event(url: str, record: dict) -> int:
+    """
+    投票ページの採決を vote_events に登録（再取り込み時は url・fetched_at を更新）し、
+    採決 ID を返す。採決は votes.id と同じく (回次, 案件名) で一意。
+    """
+    client = get_client()
+    row = {
+        "house": "参議院",
+        "session": record["session_number"],
+        "bill_title": record["bill_title"],
+        "vote_date": record["vote_date"],
+        "url": url,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+    result = execute_with_retry(
+        lambda: client.table("vote_events").upsert(row, on_conflict="session,bill_title"),
+        label=f"vote_event:{url}",
+    )
+    return result.data[0]["id"]
+
+
+def collect_sessions(sessions: list[int], member_ids: set[str], *, refresh: bool = False) -> int:
+    """
+    回次ごとに索引ページを取得し、未取り込み（refresh=True なら全て）の投票ページを
+    並行取得して votes に upsert する。取り込んだページは vote_events（採決）と
+    vote_pages（マニフェスト）に記録する。
+    索引ページのハッシュが前回と同じ回次は投票ページを取得しない。
+    """
     total_saved = 0
     for session in sessions:
-        vote_pages = fetch_vote_index(session)
-        if not vote_pages:
+        index_url = vote_index_url(session)
+        index_html = _fetch_html(index_url)
+        if index_html is None:
+            logger.warning(f"Session {session}: vote index not found")
             continue
 
-        for vp in vote_pages:
-            records = parse_vote_page(vp["url"], session, member_ids)
-            if records:
-                batch_upsert("votes", records, on_conflict="id", label=f"votes_s{session}")
-                total_saved += len(records)
-            time.sleep(1.0)
-
-        time.sleep(2.0)
+        manifest = _load_manifest(session)
+        index_hash = content_hash(index_html)
+        if not refresh and manifest.get(index_url) == index_hash:
+            logger.info(f"Session {session}: index unchanged, skipping")
+            continue
 
+        vote_pages = _parse_vote_index(index_html, session)
+        pending = [vp for vp in vote_pages if refresh or vp["url"] not in manifest]
+        logger.info(f"Session {session}: {len(pending)} / {len(vote_pages)} pages to fetch")
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=VOTE_PAGE_WORKERS) as pool:
+            results = pool.map(lambda vp: _harvest_page(vp, member_ids, manifest.get(vp["url"])), pending)
+            for vp, result in zip(pending, results):
+                if result is None:
+                    failed += 1
+                    continue
+                records, page_row = result
+                if records:
+                    event_id = _register_event(vp["url"], records[0])
+                    for r in records:
+                        r["event_id"] = event_id
+                    batch_upsert("votes", records, on_conflict="id", label=f"votes_s{session}")
+                    total_saved += len(records)
+                if page_row:
+                    batch_upsert("vote_pages", [page_row], on_conflict="url", label=f"vote_pages_s{session}")
+
+        # 全ページを取り込めた回次だけ索引ハッシュを記録する（失敗分は次回再取得）
+        if not failed:
+            batch_upsert(
+                "vote_pages", [_manifest_row(index_url, session, index_hash, len(vote_pages))],
+                on_conflict="url", label=f"vote_index_s{session}",
+            )
+        else:
+            logger.warning(f"Session {session}: {failed} pages failed, index not marked")
+
+    update_member_vote_stats(member_ids)
     return total_saved
 
 
+def update_member_vote_stats(member_ids: set[str] | None = None) -> int:
+    """
+    votes を1回走査して議員ごとの採決集計（合計・賛成・反対・欠席）を算出し、
+    member_vote_stats に upsert する。議員ページは count クエリ4本の代わりにこの1行を読む。
+    member_ids に含まれる議員は採決0件でも 0 の行を書く。upsert した行数を返す。
+    """
+    votes = fetch_columns("votes", {"member_id": "str", "vote": "str"}, label="fetch_votes_for_stats")
+    member_col, vote_col = votes["member_id"], votes["vote"]
+
+    # (member コード, vote コード) の組で1回だけ数える
+    pair_counts = Counter(zip(member_col.codes, vote_col.codes))
+    vote_code = {col: vote_col.code_of(v) for col, v in VOTE_STAT_COLUMNS.items()}
+
+    def empty() -> dict[str, int]:
+        return {"total": 0, **{col: 0 for col in VOTE_STAT_COLUMNS}}
+
+    stats: dict[str, dict[str, int]] = {mid: empty() for mid in (member_ids or ())}
+    for (mcode, vcode), n in pair_counts.items():
+        if mcode < 0:
+            continue
+        row = stats.setdefault(member_col.values[mcode], empty())
+        row["total"] += n
+        for col, code in vote_code.items():
+            if code >= 0 and vcode == code:
+                row[col] += n
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [{"member_id": mid, **counts, "updated_at": now} for mid, counts in stats.items()]
+    written = batch_upsert("member_vote_stats", rows, on_conflict="member_id", label="member_vote_stats")
+    logger.info(f"Member vote stats updated: {written} members ({len(member_col)} votes)")
+    return written
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--mode", choices=["daily", "backfill"], default="backfill",
                         help="daily=現会期のみ / backfill=全会期（デフォルト）")
+    parser.add_argument("--refresh", action="store_true",
+                        help="vote_pages の記録を無視して全ページを再取得する（本文が変わったページのみ再登録）")
     args = parser.parse_args()
 
-    current_session = max(SESSION_MAX)
+    latest_session = current_session()
 
     if args.mode == "daily":
-        sessions = [current_session]
-        logger.info(f"Daily mode: collecting session {current_session} only")
+        sessions = [latest_session]
+        logger.info(f"Daily mode: collecting session {latest_session} only")
     else:
-        sessions = list(range(BACKFILL_START_SESSION, current_session + 1))
-        logger.info(f"Backfill mode: collecting sessions {BACKFILL_START_SESSION}–{current_session}")
+        sessions = list(range(BACKFILL_START_SESSION, latest_session + 1))
+        logger.info(f"Backfill mode: collecting sessions {BACKFILL_START_SESSION}–{latest_session}")
 
     member_ids = get_member_ids()
 
-    total_saved = collect_sessions(sessions, member_ids)
+    total_saved = collect_sessions(sessions, member_ids, refresh=args.refresh)
     logger.info(f"Vote collection complete. Saved {total_saved} records.")
 
 
@@ -0,0 +1,154 @@
+# db.fetch_columns の全件走査テスト
+# サーバー（PostgREST）の max_rows が要求した行数より小さく、短いページが返っても
+# 走査が途中で終わらないことを確認する。Supabase には接続しない。
+
+import os
+
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "test")
+
+import db  # noqa: E402
+
+
+class FakeResult:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """select / eq / order / gt / lte / limit / range だけを持つ PostgREST クエリの代わり。
+    gt / lte の値は PostgREST と同じく文字列で渡ってもよい（列の型に変換して比較する）。"""
+
+    def __init__(self, rows, max_rows, count=None):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.count_mode = count
+        self.sort_key = None
+        self.lo = 0
+        self.hi = None
+
+    def select(self, _columns, count=None):
+        self.count_mode = count
+        return self
+
+    def eq(self, column, value):
+        self.rows = [r for r in self.rows if r[column] == value]
+        return self
+
+    def gt(self, column, value):
+        self.rows = [r for r in self.rows if r[column] > type(r[column])(value)]
+        return self
+
+    def lte(self, column, value):
+        self.rows = [r for r in self.rows if r[column] <= type(r[column])(value)]
+        return self
+
+    def order(self, column):
+        self.rows = sorted(self.rows, key=lambda r: r[column])
+        return self
+
+    def limit(self, n):
+        self.hi = self.lo + n
+        return self
+
+    def range(self, start, end):
+        self.lo, self.hi = start, end + 1
+        return self
+
+    def execute(self):
+        count = len(self.rows) if self.count_mode == "exact" else None
+        data = self.rows[self.lo:self.hi][: self.max_rows]
+        return FakeResult(data, count)
+
+
+class FakeRpc:
+    def __init__(self, data):
+        self.data = data
+
+    def execute(self):
+        return FakeResult(self.data)
+
+
+class FakeClient:
+    """analyzed=False は統計情報がない（未 ANALYZE の）テーブル。"""
+
+    def __init__(self, rows, max_rows, analyzed=True):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.analyzed = analyzed
+
+    def table(self, _name):
+        return FakeQuery(list(self.rows), self.max_rows)
+
+    def rpc(self, name, params):
+        # scan_key_bounds: pg_stats.histogram_bounds と同じく 101 個の境界を文字列で返す
+        assert name == "scan_key_bounds"
+        if not self.analyzed:
+            return FakeRpc({"rows": -1, "bounds": None})
+        keys = sorted(r[params["p_key"]] for r in self.rows)
+        hist = [str(keys[i * (len(keys) - 1) // 100]) for i in range(101)]
+        return FakeRpc({"rows": len(keys), "bounds": hist})
+
+
+def _rows(n):
+    return [{"id": i + 1, "member_id": f"m{i % 7}", "house": "衆議院" if i % 2 else "参議院"} for i in range(n)]
+
+
+def _scan(monkeypatch, rows, max_rows, **kwargs):
+    monkeypatch.setattr(db, "_client", FakeClient(rows, max_rows))
+    return db.fetch_columns("t", {"id": "int", "member_id": "str"}, **kwargs)
+
+
+def test_short_pages_do_not_end_keyset_scan(monkeypatch):
+    # page（既定 SUPABASE_MAX_ROWS）より小さい max_rows で切り詰められても全件読む
+    cols = _scan(monkeypatch, _rows(2500), max_rows=300, partitions=1)
+    assert sorted(cols["id"]) == list(range(1, 2501))
+
+
+def test_short_pages_do_not_end_partitioned_scan(monkeypatch):
+    cols = _scan(monkeypatch, _rows(2500), max_rows=300, page=400, partitions=4)
+    assert sorted(cols["id"]) == list(range(1, 2501))
+
+
+def test_unanalyzed_table_is_scanned_without_partitions(monkeypatch):
+    monkeypatch.setattr(db, "_client", FakeClient(_rows(2500), 300, analyzed=False))
+    cols = db.fetch_columns("t", {"id": "int", "member_id": "str"}, partitions=4)
+    assert sorted(cols["id"]) == list(range(1, 2501))
+
+
+def test_page_is_capped_at_server_max_rows(monkeypatch):
+    cols = _scan(monkeypatch, _rows(2500), max_rows=db.SUPABASE_MAX_ROWS, page=5000)
+    assert sorted(cols["id"]) == list(range(1, 2501))
+
+
+def test_filters_apply_to_every_page(monkeypatch):
+    rows = _rows(2500)
+    cols = _scan(monkeypatch, rows, max_rows=300, filters={"house": "衆議院"})
+    assert sorted(cols["id"]) == sorted(r["id"] for r in rows if r["house"] == "衆議院")
+
+
+def test_short_pages_do_not_skip_offset_ranges(monkeypatch):
+    # key=None（OFFSET ページング）でも、max_rows で切り詰められた残りを読み飛ばさない
+    monkeypatch.setattr(db, "_client", FakeClient(_rows(2500), 300))
+    cols = db.fetch_columns("t", {"id": "int", "member_id": "str"}, key=None, order_by=("id",), page=700)
+    assert sorted(cols["id"]) == list(range(1, 2501))
+
+
+def test_strict_raises_when_scan_is_short(monkeypatch):
+    # 件数（走査前）より取得行数が少なければ例外。件数は count=exact の応答を水増しして再現する
+    class ShortQuery(FakeQuery):
+        def execute(self):
+            result = super().execute()
+            if result.count is not None:
+                result.count += 1
+            return result
+
+    client = FakeClient(_rows(2500), 300)
+    client.table = lambda _name: ShortQuery(list(client.rows), client.max_rows)
+    monkeypatch.setattr(db, "_client", client)
+    with pytest.raises(RuntimeError):
+        db.fetch_columns("t", {"id": "int"}, strict=True)
+    assert len(db.fetch_columns("t", {"id": "int"})["id"]) == 2500
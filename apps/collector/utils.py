@@ -6,9 +6,14 @@
 from __future__ import annotations
 
 import re
+import threading
+import time
 from datetime import date, timedelta
+from urllib.parse import urlparse
 
 from config import (
+    DEFAULT_HOST_BUDGET,
+    HOST_BUDGETS,
     PARTY_MAP,
     PARTY_MAP_KEYS_SORTED,
     PROCEDURAL_ROLES,
@@ -199,3 +204,48 @@ def normalize_whitespace(text: str) -> str:
 def clean_html(html: str) -> str:
     """簡易HTMLタグ除去。"""
     return re.sub(r"<[^>]+>", "", html).strip()
+
+
+# ============================================================
+# ホスト別リクエスト予算（並行スクレイピング用）
+# ============================================================
+
+class HostBudget:
+    """
+    同一ホストへの同時リクエスト数とリクエスト開始間隔を制限する。
+    スレッド間で共有し、リクエストごとに with で囲んで使う。
+    """
+
+    def __init__(self, concurrency: int, interval: float) -> None:
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._interval = interval
+        self._next_start = 0.0
+
+    def __enter__(self) -> "HostBudget":
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._slots.release()
+
+
+_host_budgets: dict[str, HostBudget] = {}
+_host_budgets_lock = threading.Lock()
+
+
+def host_budget(url: str) -> HostBudget:
+    """URL（またはホスト名）に対応する HostBudget を返す。設定は config.HOST_BUDGETS。"""
+    host = urlparse(url).netloc or url
+    with _host_budgets_lock:
+        budget = _host_budgets.get(host)
+        if budget is None:
+            budget = _host_budgets[host] = HostBudget(*HOST_BUDGETS.get(host, DEFAULT_HOST_BUDGET))
+        return budget
+
@@ -0,0 +1,62 @@
+"use client";
+
+import type { CounterKey, MemberPercentiles, PercentileScope } from "../../lib/types";
+
+interface Props {
+  percentiles: MemberPercentiles;
+}
+
+const SCOPES: { key: "house" | "party" | "election_type"; label: string }[] = [
+  { key: "house",         label: "院内"       },
+  { key: "party",         label: "党内"       },
+  { key: "election_type", label: "選挙区分内" },
+];
+
+const METRICS: { key: CounterKey; label: string }[] = [
+  { key: "session_count",  label: "発言"       },
+  { key: "question_count", label: "質問主意書" },
+  { key: "bill_count",     label: "議員立法"   },
+  { key: "petition_count", label: "請願"       },
+];
+
+const cellStyle = { padding: "4px 6px", textAlign: "center" as const, borderTop: "1px solid #e0e0e0" };
+
+export default function ActivityPercentiles({ percentiles }: Props) {
+  const rows = SCOPES
+    .map(({ key, label }) => ({ label, scope: percentiles[key] }))
+    .filter((r): r is { label: string; scope: PercentileScope } => r.scope !== null);
+  if (rows.length === 0) return null;
+
+  return (
+    <div style={{ marginTop: 12 }}>
+      <div style={{ fontSize: 11, color: "#888888", marginBottom: 4 }}>
+        同じグループの中で件数が自分以下の議員の割合
+      </div>
+      <table style={{ width: "100%", borderCollapse: "collapse", fontSize: 11, color: "#333333" }}>
+        <thead>
+          <tr>
+            <th style={{ ...cellStyle, borderTop: "none", textAlign: "left", fontWeight: 400, color: "#888888" }} />
+            {METRICS.map(({ key, label }) => (
+              <th key={key} style={{ ...cellStyle, borderTop: "none", fontWeight: 400, color: "#888888" }}>{label}</th>
+            ))}
+          </tr>
+        </thead>
+        <tbody>
+          {rows.map(({ label, scope }) => (
+            <tr key={label}>
+              <td style={{ ...cellStyle, textAlign: "left" }}>
+                {label}
+                <span style={{ color: "#888888", marginLeft: 4 }}>{scope.group}・{scope.n}名</span>
+              </td>
+              {METRICS.map(({ key }) => (
+                <td key={key} style={cellStyle}>
+                  {scope.metrics[key] ? `${scope.metrics[key].pct}%` : "—"}
+                </td>
+              ))}
+            </tr>
+          ))}
+        </tbody>
+      </table>
+    </div>
+  );
+}
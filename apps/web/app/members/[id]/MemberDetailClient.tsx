@@ -4,6 +4,7 @@ import { Suspense, useEffect, useState } from "react";
 import { useParams, useRouter, useSearchParams } from "next/navigation";
 import WordCloud from "../../components/WordCloud";
 import ActivityRadar from "../../components/ActivityRadar";
+import ActivityPercentiles from "../../components/ActivityPercentiles";
 import { isFavorite, addFavorite, removeFavorite } from "../../../lib/favorites";
 import Paginator, { PAGE_SIZE } from "../../../components/Paginator";
 import { usePagination } from "../../../hooks/usePagination";
@@ -15,9 +16,11 @@ import type {
   Question, SangiinQuestion,
   Vote, Bill, Petition, SangiinPetition,
   CommitteeMember, MemberKeyword,
+  ActivityMax, MemberPercentiles,
 } from "../../../lib/types";
 import {
   getMemberById, getMembersByIds, getGlobalActivityMax,
+  getMemberPercentiles, activityMaxFromPercentiles,
   getSpeechesForMember, getSpeechExcerptsForMember,
   getQuestionsForMember, getSangiinQuestionsForMember,
   getVotesForMember, getVoteStatsForMember,
@@ -46,9 +49,10 @@ const ROLE_COLORS: Record<string, string> = {
   "副会長": "#333333",
 };
 
-function MemberDetailContent({ initialMember, initialGlobalMax, initialCommitteeCount, initialVoteCount }: {
+function MemberDetailContent({ initialMember, initialGlobalMax, initialPercentiles, initialCommitteeCount, initialVoteCount }: {
   initialMember?: Member | null;
-  initialGlobalMax?: { session: number; question: number; bill: number; petition: number };
+  initialGlobalMax?: ActivityMax;
+  initialPercentiles?: MemberPercentiles | null;
   initialCommitteeCount?: number | null;
   initialVoteCount?: number | null;
 }) {
@@ -70,6 +74,7 @@ function MemberDetailContent({ initialMember, initialGlobalMax, initialCommittee
   const [keywords,      setKeywords]      = useState<MemberKeyword[]>([]);
   const [speechExcerpts, setSpeechExcerpts] = useState<SpeechExcerpt[]>([]);
   const [globalMax,     setGlobalMax]     = useState(initialGlobalMax ?? { session: 1, question: 1, bill: 1, petition: 1 });
+  const [percentiles,   setPercentiles]   = useState<MemberPercentiles | null>(initialPercentiles ?? null);
   const [loading,       setLoading]       = useState(!initialMember);
   const [clientLoaded,  setClientLoaded]  = useState(false);
   const searchParams = useSearchParams();
@@ -200,10 +205,11 @@ function MemberDetailContent({ initialMember, initialGlobalMax, initialCommittee
 
       setSpeechExcerpts(val(excerptResult, []));
 
-      // グローバルMAX取得（SSRで渡されていない場合のみ）
+      // パーセンタイル・グローバルMAX取得（SSRで渡されていない場合のみ）
       if (!initialGlobalMax) {
-        const gm = await getGlobalActivityMax();
-        setGlobalMax(gm);
+        const p = await getMemberPercentiles(memberId);
+        setPercentiles(p);
+        setGlobalMax(p ? activityMaxFromPercentiles(p) : await getGlobalActivityMax());
       }
 
       setLoading(false);
@@ -386,6 +392,7 @@ function MemberDetailContent({ initialMember, initialGlobalMax, initialCommittee
             ))}
           </div>
         </div>
+        {percentiles && <ActivityPercentiles percentiles={percentiles} />}
       </div>
 
       {/* カード注釈 */}
@@ -890,15 +897,16 @@ function MemberDetailContent({ initialMember, initialGlobalMax, initialCommittee
   );
 }
 
-export default function MemberDetailClient({ initialMember, initialGlobalMax, initialCommitteeCount, initialVoteCount }: {
+export default function MemberDetailClient({ initialMember, initialGlobalMax, initialPercentiles, initialCommitteeCount, initialVoteCount }: {
   initialMember?: Member | null;
-  initialGlobalMax?: { session: number; question: number; bill: number; petition: number };
+  initialGlobalMax?: ActivityMax;
+  initialPercentiles?: MemberPercentiles | null;
   initialCommitteeCount?: number | null;
   initialVoteCount?: number | null;
 }) {
   return (
     <Suspense fallback={<div className="loading-block" style={{ minHeight: "100vh" }}><div className="loading-spinner" /></div>}>
-      <MemberDetailContent initialMember={initialMember} initialGlobalMax={initialGlobalMax} initialCommitteeCount={initialCommitteeCount} initialVoteCount={initialVoteCount} />
+      <MemberDetailContent initialMember={initialMember} initialGlobalMax={initialGlobalMax} initialPercentiles={initialPercentiles} initialCommitteeCount={initialCommitteeCount} initialVoteCount={initialVoteCount} />
     </Suspense>
   );
 }
@@ -1,5 +1,6 @@
 import type { Metadata } from "next";
 import { supabaseServer as supabase } from "../../../lib/supabase-server";
+import { getGlobalActivityMax, getMemberPercentiles, activityMaxFromPercentiles } from "../../../lib/queries";
 import type { Member } from "../../../lib/types";
 import MemberDetailClient from "./MemberDetailClient";
 
@@ -16,22 +17,6 @@ async function getMember(memberId: string): Promise<Member | null> {
   return data as Member | null;
 }
 
-async function getGlobalMax() {
-  const { data } = await supabase
-    .from("members")
-    .select("session_count, question_count, bill_count, petition_count")
-    .limit(2000);
-  if (!data || data.length === 0) return { session: 1, question: 1, bill: 1, petition: 1 };
-  let gm = { session: 1, question: 1, bill: 1, petition: 1 };
-  for (const m of data) {
-    if ((m.session_count  ?? 0) > gm.session)  gm.session  = m.session_count;
-    if ((m.question_count ?? 0) > gm.question) gm.question = m.question_count;
-    if ((m.bill_count     ?? 0) > gm.bill)     gm.bill     = m.bill_count;
-    if ((m.petition_count ?? 0) > gm.petition) gm.petition = m.petition_count;
-  }
-  return gm;
-}
-
 export async function generateMetadata({ params }: Props): Promise<Metadata> {
   const { id } = await params;
   const memberId = decodeURIComponent(id);
@@ -62,15 +47,17 @@ export async function generateMetadata({ params }: Props): Promise<Metadata> {
 async function getInitialCounts(memberId: string) {
   const [cmRes, vRes] = await Promise.all([
     supabase.from("committee_members").select("id", { count: "exact", head: true }).eq("member_id", memberId),
-    supabase.from("votes").select("id", { count: "exact", head: true }).eq("member_id", memberId),
+    supabase.from("member_vote_stats").select("total").eq("member_id", memberId).maybeSingle(),
   ]);
-  return { committeeCount: cmRes.count ?? null, voteCount: vRes.count ?? null };
+  return { committeeCount: cmRes.count ?? null, voteCount: vRes.data?.total ?? null };
 }
 
 export default async function MemberDetailPage({ params }: Props) {
   const { id } = await params;
   const memberId = decodeURIComponent(id);
-  const [member, globalMax, initialCounts] = await Promise.all([getMember(memberId), getGlobalMax(), getInitialCounts(memberId)]);
+  const [member, percentiles, initialCounts] = await Promise.all([getMember(memberId), getMemberPercentiles(memberId, supabase), getInitialCounts(memberId)]);
+  // 未計算（collector 初回実行前）の場合のみ members 全件から最大値を算出する
+  const globalMax = percentiles ? activityMaxFromPercentiles(percentiles) : await getGlobalActivityMax(supabase);
 
   const jsonLd = member ? {
     "@context": "https://schema.org",
@@ -90,7 +77,7 @@ export default async function MemberDetailPage({ params }: Props) {
           dangerouslySetInnerHTML={{ __html: JSON.stringify(jsonLd) }}
         />
       )}
-      <MemberDetailClient initialMember={member} initialGlobalMax={globalMax} initialCommitteeCount={initialCounts.committeeCount} initialVoteCount={initialCounts.voteCount} />
+      <MemberDetailClient initialMember={member} initialGlobalMax={globalMax} initialPercentiles={percentiles} initialCommitteeCount={initialCounts.committeeCount} initialVoteCount={initialCounts.voteCount} />
     </>
   );
 }
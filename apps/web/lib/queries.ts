@@ -21,6 +21,8 @@ import type {
   Petition,
   SangiinPetition,
   MemberKeyword,
+  MemberPercentiles,
+  ActivityMax,
   PartyKeyword,
   CommitteeMember,
   QuestionListItem,
@@ -137,10 +139,43 @@ export async function getCabinetMembers(client: Db = defaultClient): Promise<Mem
   return (data ?? []) as Member[];
 }
 
-/** レーダーチャート用グローバル最大値を取得 */
+/** 議員のパーセンタイル（院・政党・選挙区分内）を取得。未計算なら null */
+export async function getMemberPercentiles(
+  memberId: string,
+  client: Db = defaultClient,
+): Promise<MemberPercentiles | null> {
+  const { data, error } = await client
+    .from("member_percentiles")
+    .select("*")
+    .eq("member_id", memberId)
+    .maybeSingle();
+
+  if (error) {
+    console.warn("getMemberPercentiles:", error.message);
+    return null;
+  }
+  return data as MemberPercentiles | null;
+}
+
+/** member_percentiles の global_max をレーダーチャート用の最大値に変換 */
+export function activityMaxFromPercentiles(p: MemberPercentiles): ActivityMax {
+  const g = p.global_max;
+  return {
+    session:  Math.max(1, g.session_count  ?? 0),
+    question: Math.max(1, g.question_count ?? 0),
+    bill:     Math.max(1, g.bill_count     ?? 0),
+    petition: Math.max(1, g.petition_count ?? 0),
+  };
+}
+
+/**
+ * レーダーチャート用グローバル最大値を members 全件から算出。
+ * 通常は member_percentiles の global_max（activityMaxFromPercentiles）を使い、
+ * これは未計算（collector 初回実行前）の場合のフォールバック。
+ */
 export async function getGlobalActivityMax(
   client: Db = defaultClient,
-): Promise<{ session: number; question: number; bill: number; petition: number }> {
+): Promise<ActivityMax> {
   const { data } = await client
     .from("members")
     .select("session_count,question_count,bill_count,petition_count")
@@ -258,22 +293,39 @@ export async function getVotesForMember(memberId: string, client: Db = defaultCl
   return data ?? [];
 }
 
-/** 採決の集計値（賛成・反対・欠席・合計）を DB の count:exact で取得 */
+/** 法案に紐付いた参院採決の議員別賛否（vote_events.bill_id は vote_bill_links.py が事前に照合） */
+export async function getVotesForBill(billId: string, client: Db = defaultClient): Promise<Vote[]> {
+  const { data, error } = await client
+    .from("votes")
+    .select("id,member_id,bill_title,vote_date,vote,session_number,event_id,vote_events!inner(bill_id)")
+    .eq("vote_events.bill_id", billId)
+    .order("vote_date", { ascending: false })
+    .limit(2000);
+
+  if (error) {
+    console.warn("getVotesForBill:", error.message);
+    return [];
+  }
+  return (data ?? []) as unknown as Vote[];
+}
+
+/** 採決の集計値（賛成・反対・欠席・合計）を member_vote_stats の事前集計から取得 */
 export async function getVoteStatsForMember(
   memberId: string,
   client: Db = defaultClient,
 ): Promise<{ total: number; yea: number; nay: number; absent: number }> {
-  const [totalRes, yeaRes, nayRes, absentRes] = await Promise.allSettled([
-    client.from("votes").select("id", { count: "exact", head: true }).eq("member_id", memberId),
-    client.from("votes").select("id", { count: "exact", head: true }).eq("member_id", memberId).eq("vote", "賛成"),
-    client.from("votes").select("id", { count: "exact", head: true }).eq("member_id", memberId).eq("vote", "反対"),
-    client.from("votes").select("id", { count: "exact", head: true }).eq("member_id", memberId).eq("vote", "欠席"),
-  ]);
+  const { data, error } = await client
+    .from("member_vote_stats")
+    .select("total,yea,nay,absent")
+    .eq("member_id", memberId)
+    .maybeSingle();
+
+  if (error) console.warn("getVoteStatsForMember:", error.message);
   return {
-    total:  totalRes.status  === "fulfilled" ? (totalRes.value.count  ?? 0) : 0,
-    yea:    yeaRes.status    === "fulfilled" ? (yeaRes.value.count    ?? 0) : 0,
-    nay:    nayRes.status    === "fulfilled" ? (nayRes.value.count    ?? 0) : 0,
-    absent: absentRes.status === "fulfilled" ? (absentRes.value.count ?? 0) : 0,
+    total:  data?.total  ?? 0,
+    yea:    data?.yea    ?? 0,
+    nay:    data?.nay    ?? 0,
+    absent: data?.absent ?? 0,
   };
 }
 
@@ -102,6 +102,7 @@ export interface Vote {
   vote_date: string;
   vote: VoteValue;
   session_number: number;
+  event_id: number | null;
 }
 
 // ============================================================
@@ -212,6 +213,34 @@ export interface ElectionVote {
   seat_rate: number | null;
 }
 
+// ============================================================
+// member_percentiles テーブル（collector の processors/scoring.py が事前計算）
+// ============================================================
+export type CounterKey = "speech_count" | "session_count" | "question_count" | "bill_count" | "petition_count";
+
+export interface PercentileScope {
+  group: string;                                            // 院・政党・選挙区分の値
+  n: number;                                                // グループの人数
+  metrics: Record<CounterKey, { pct: number; max: number }>; // pct: 値が自分以下の割合(%)
+}
+
+export interface MemberPercentiles {
+  member_id: string;
+  house: PercentileScope | null;
+  party: PercentileScope | null;
+  election_type: PercentileScope | null;
+  global_max: Record<CounterKey, number>;                   // 全議員での最大値
+  updated_at: string;
+}
+
+// レーダーチャートの正規化に使う全議員での最大値（0 の場合は 1）
+export interface ActivityMax {
+  session: number;
+  question: number;
+  bill: number;
+  petition: number;
+}
+
 // ============================================================
 // リスト表示用（members JOIN 付き / house フラグ付き）
 // 各リストページ・Client コンポーネントはここからインポートし、独自定義を持たない
@@ -11,10 +11,12 @@
   委員会参加    10点
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional
 import math
 
+import numpy as np
+
 
 @dataclass
 class MemberStats:
@@ -105,6 +107,96 @@ def calculate_score(stats: MemberStats) -> ScoreBreakdown:
     )
 
 
+# ─── 一括スコア算出（NumPy） ─────────────────────────────────
+# 全議員分の列配列をまとめて受け取り、スカラー版と同じ値を返す
+
+# ScoreBreakdown 行列の列順
+SCORE_FIELDS = tuple(f.name for f in fields(ScoreBreakdown))
+
+
+def _speech_thresholds() -> np.ndarray:
+    """score_speeches が k 点（1〜30）に達する最小の発言回数。"""
+    thresholds = []
+    count = 0
+    for k in range(1, 31):
+        while score_speeches(count) < k:
+            count += 1
+        thresholds.append(count)
+    return np.array(thresholds, dtype=np.int64)
+
+
+# 対数の丸め誤差でスカラー版とずれないよう、境界値の表引きで求める
+_SPEECH_THRESHOLDS = _speech_thresholds()
+
+
+def score_attendance_batch(rates: np.ndarray) -> np.ndarray:
+    """score_attendance の一括版。"""
+    rates = np.asarray(rates, dtype=np.float64)
+    return np.select(
+        [rates >= 0.95, rates >= 0.85, rates >= 0.75],
+        [
+            30,
+            np.trunc(20 + (rates - 0.85) / 0.10 * 10),
+            np.trunc(10 + (rates - 0.75) / 0.10 * 10),
+        ],
+        np.maximum(0, np.trunc(rates / 0.75 * 10)),
+    ).astype(np.int32)
+
+
+def score_speeches_batch(counts: np.ndarray) -> np.ndarray:
+    """score_speeches の一括版。"""
+    return np.searchsorted(_SPEECH_THRESHOLDS, np.asarray(counts), side="right").astype(np.int32)
+
+
+def _capped_linear_batch(counts: np.ndarray, full: int, cap: int) -> np.ndarray:
+    counts = np.asarray(counts, dtype=np.int64)
+    raw = np.minimum(cap, np.trunc(counts / full * cap)).astype(np.int32)
+    return np.where(counts <= 0, 0, raw)
+
+
+def score_written_questions_batch(counts: np.ndarray) -> np.ndarray:
+    """score_written_questions の一括版。"""
+    return _capped_linear_batch(counts, 20, 15)
+
+
+def score_sponsored_bills_batch(counts: np.ndarray) -> np.ndarray:
+    """score_sponsored_bills の一括版。"""
+    return _capped_linear_batch(counts, 5, 15)
+
+
+def score_committee_batch(rates: np.ndarray) -> np.ndarray:
+    """score_committee の一括版。"""
+    rates = np.asarray(rates, dtype=np.float64)
+    return np.minimum(10, np.trunc(rates * 10)).astype(np.int32)
+
+
+def calculate_scores(
+    attendance_rate: np.ndarray,
+    speech_count: np.ndarray,
+    written_question_count: np.ndarray,
+    sponsored_bills: np.ndarray,
+    committee_rate: np.ndarray,
+) -> np.ndarray:
+    """
+    MemberStats の各フィールドを列配列で受け取り、
+    shape (議員数, len(SCORE_FIELDS)) の int32 行列を返す。
+    i 行目は calculate_score(i 番目の議員) と同じ値になる。
+    """
+    matrix = np.empty((len(speech_count), len(SCORE_FIELDS)), dtype=np.int32)
+    matrix[:, 0] = score_attendance_batch(attendance_rate)
+    matrix[:, 1] = score_speeches_batch(speech_count)
+    matrix[:, 2] = score_written_questions_batch(written_question_count)
+    matrix[:, 3] = score_sponsored_bills_batch(sponsored_bills)
+    matrix[:, 4] = score_committee_batch(committee_rate)
+    matrix[:, 5] = matrix[:, :5].sum(axis=1)
+    return matrix
+
+
+def breakdown_at(matrix: np.ndarray, i: int) -> ScoreBreakdown:
+    """calculate_scores の i 行目を ScoreBreakdown に戻す。"""
+    return ScoreBreakdown(*(int(v) for v in matrix[i]))
+
+
 # ─── スコアのラベル ───────────────────────────────────────────
 
 def score_label(total: int) -> dict:
@@ -132,3 +224,22 @@ if __name__ == "__main__":
         print(f"ID:{s.member_id} → 合計:{result.total}点 [{label['label']}]")
         print(f"  出席:{result.attendance} 発言:{result.speeches} "
               f"質問:{result.questions} 立法:{result.bills} 委員会:{result.committee}")
+
+    # 一括版とスカラー版の一致確認（境界値を含む格子 + 乱数）
+    rng = np.random.default_rng(0)
+    grid_rates = np.concatenate([np.linspace(0, 1, 1001), [0.75, 0.85, 0.95], rng.random(2000)])
+    n = len(grid_rates)
+    cols = (
+        grid_rates,
+        rng.integers(0, 500, n),
+        rng.integers(0, 40, n),
+        rng.integers(0, 10, n),
+        rng.permutation(grid_rates),
+    )
+    matrix = calculate_scores(*cols)
+    for i in range(n):
+        stats = MemberStats(str(i), *(c[i].item() for c in cols))
+        assert breakdown_at(matrix, i) == calculate_score(stats), (stats, matrix[i])
+    assert np.array_equal(score_speeches_batch(np.arange(0, 100_000)),
+                          [score_speeches(c) for c in range(0, 100_000)])
+    print(f"一括版: {n} 件 スカラー版と一致")
@@ -0,0 +1,47 @@
+-- ============================================================
+-- Migration 015: bulk_update 関数（複数行の一括 UPDATE）
+-- ============================================================
+-- 目的: scoring.py が members を 1 行ずつ UPDATE していた（約1,400往復/回）のを
+--       1 回の RPC にまとめる。
+-- upsert（INSERT ... ON CONFLICT）ではなく UPDATE ... FROM のみを実行するため、
+-- members.name NOT NULL 違反は起こらず、存在しない id の行は単に無視される。
+--
+-- p_rows は [{"id": ..., "col": ...}, ...] 形式の jsonb 配列。
+-- 全要素が同じキー集合を持つこと（欠けたキーは NULL で上書きされる）。
+-- 呼び出し側: apps/collector/db.py の bulk_update()
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION bulk_update(p_table text, p_rows jsonb, p_key text DEFAULT 'id')
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    set_clause text;
+    updated    integer;
+BEGIN
+    SET LOCAL statement_timeout = 0;
+
+    SELECT string_agg(format('%I = r.%I', k, k), ', ')
+      INTO set_clause
+      FROM (
+          SELECT DISTINCT jsonb_object_keys(e) AS k
+          FROM jsonb_array_elements(p_rows) AS e
+      ) keys
+     WHERE k <> p_key;
+
+    IF set_clause IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    EXECUTE format(
+        'UPDATE %I t SET %s FROM jsonb_populate_recordset(NULL::%I, $1) r WHERE t.%I = r.%I',
+        p_table, set_clause, p_table, p_key, p_key
+    ) USING p_rows;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
+
+-- 書き込み系のため anon / authenticated からは呼べないようにする（service_role のみ）
+REVOKE EXECUTE ON FUNCTION bulk_update(text, jsonb, text) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,143 @@
+-- ============================================================
+-- Migration 016: score_journal（カウンター差分ジャーナル）
+-- ============================================================
+-- 目的: scoring.py が毎日 speeches 等の全履歴を再走査していたのを、
+--       前回ウォーターマーク以降に追加・削除・変更された行の差分だけで
+--       members のカウンターを更新できるようにする。
+--
+-- トリガーが各テーブルの INSERT / UPDATE / DELETE を score_journal に記録する。
+--   INSERT → sign=+1（新しい値）
+--   DELETE → sign=-1（古い値）… truncate_speeches による削除もここで記録される
+--   UPDATE → 集計に関わる列が変わった場合のみ -1（旧値）と +1（新値）の2行
+-- upsert で同じ値が再書き込みされた場合（日次の speeches 再取得等）は記録しない。
+--
+-- 消費側: apps/collector/processors/scoring.py の apply_score_deltas()
+--   ウォーターマークは site_settings.scoring_journal_watermark に保存する。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS score_journal (
+    id          bigserial PRIMARY KEY,
+    source      text     NOT NULL,   -- 発生元テーブル名
+    sign        smallint NOT NULL CHECK (sign IN (1, -1)),
+    member_ids  text[]   NOT NULL,   -- speeches/questions は1要素、bills/petitions は提出者・紹介議員
+    spoken_at   date,                -- speeches のみ（session_count の判定に使う）
+    committee   text,                -- speeches のみ
+    created_at  timestamptz DEFAULT now()
+);
+
+COMMENT ON TABLE score_journal IS 'members カウンターの差分ジャーナル（scoring.py が消費後に削除）';
+
+-- ============================================================
+-- 1. speeches: member_id / spoken_at / committee / is_procedural の変化を記録
+--    議事進行発言（is_procedural = true）はカウント対象外のため記録しない
+-- ============================================================
+CREATE OR REPLACE FUNCTION journal_speech_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.member_id     IS NOT DISTINCT FROM OLD.member_id
+       AND NEW.spoken_at     IS NOT DISTINCT FROM OLD.spoken_at
+       AND NEW.committee     IS NOT DISTINCT FROM OLD.committee
+       AND NEW.is_procedural IS NOT DISTINCT FROM OLD.is_procedural THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE')
+       AND OLD.member_id IS NOT NULL AND NOT COALESCE(OLD.is_procedural, false) THEN
+        INSERT INTO score_journal (source, sign, member_ids, spoken_at, committee)
+        VALUES (TG_TABLE_NAME, -1, ARRAY[OLD.member_id], OLD.spoken_at, OLD.committee);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE')
+       AND NEW.member_id IS NOT NULL AND NOT COALESCE(NEW.is_procedural, false) THEN
+        INSERT INTO score_journal (source, sign, member_ids, spoken_at, committee)
+        VALUES (TG_TABLE_NAME, 1, ARRAY[NEW.member_id], NEW.spoken_at, NEW.committee);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_speeches_score_journal ON speeches;
+CREATE TRIGGER trg_speeches_score_journal
+AFTER INSERT OR UPDATE OR DELETE ON speeches
+FOR EACH ROW EXECUTE FUNCTION journal_speech_change();
+
+-- ============================================================
+-- 2. questions / bills / petitions: 議員参照列（TG_ARGV[0]）の変化を記録
+--    列は member_id（text）または submitter_ids / introducer_ids（text[]）
+-- ============================================================
+CREATE OR REPLACE FUNCTION score_journal_ids(v jsonb)
+RETURNS text[]
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE jsonb_typeof(v)
+        WHEN 'array'  THEN ARRAY(SELECT jsonb_array_elements_text(v))
+        WHEN 'string' THEN ARRAY[v #>> '{}']
+        ELSE '{}'::text[]
+    END;
+$$;
+
+CREATE OR REPLACE FUNCTION journal_member_ref_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    old_ids text[] := '{}';
+    new_ids text[] := '{}';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_ids := score_journal_ids(to_jsonb(OLD) -> TG_ARGV[0]);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_ids := score_journal_ids(to_jsonb(NEW) -> TG_ARGV[0]);
+    END IF;
+
+    IF old_ids = new_ids THEN
+        RETURN NULL;
+    END IF;
+
+    IF cardinality(old_ids) > 0 THEN
+        INSERT INTO score_journal (source, sign, member_ids) VALUES (TG_TABLE_NAME, -1, old_ids);
+    END IF;
+    IF cardinality(new_ids) > 0 THEN
+        INSERT INTO score_journal (source, sign, member_ids) VALUES (TG_TABLE_NAME, 1, new_ids);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_questions_score_journal ON questions;
+CREATE TRIGGER trg_questions_score_journal
+AFTER INSERT OR UPDATE OR DELETE ON questions
+FOR EACH ROW EXECUTE FUNCTION journal_member_ref_change('member_id');
+
+DROP TRIGGER IF EXISTS trg_sangiin_questions_score_journal ON sangiin_questions;
+CREATE TRIGGER trg_sangiin_questions_score_journal
+AFTER INSERT OR UPDATE OR DELETE ON sangiin_questions
+FOR EACH ROW EXECUTE FUNCTION journal_member_ref_change('member_id');
+
+DROP TRIGGER IF EXISTS trg_bills_score_journal ON bills;
+CREATE TRIGGER trg_bills_score_journal
+AFTER INSERT OR UPDATE OR DELETE ON bills
+FOR EACH ROW EXECUTE FUNCTION journal_member_ref_change('submitter_ids');
+
+DROP TRIGGER IF EXISTS trg_petitions_score_journal ON petitions;
+CREATE TRIGGER trg_petitions_score_journal
+AFTER INSERT OR UPDATE OR DELETE ON petitions
+FOR EACH ROW EXECUTE FUNCTION journal_member_ref_change('introducer_ids');
+
+DROP TRIGGER IF EXISTS trg_sangiin_petitions_score_journal ON sangiin_petitions;
+CREATE TRIGGER trg_sangiin_petitions_score_journal
+AFTER INSERT OR UPDATE OR DELETE ON sangiin_petitions
+FOR EACH ROW EXECUTE FUNCTION journal_member_ref_change('introducer_ids');
+
+ALTER TABLE score_journal ENABLE ROW LEVEL SECURITY;
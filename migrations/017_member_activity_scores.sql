@@ -0,0 +1,19 @@
+-- ============================================================
+-- Migration 017: members に活動スコア列を追加
+-- ============================================================
+-- calculator.py の ScoreBreakdown（各指標の点数と合計）を議員ごとに保持する。
+-- 書き込み: apps/collector/processors/scoring.py の update_activity_scores()
+--           （カウンター再計算の直後に全議員分を一括算出して bulk_update）
+--
+-- score_attendance / score_committee は出席率データを収集していないため NULL のまま。
+-- score_total は算出できた指標の合計。
+-- ============================================================
+
+ALTER TABLE members ADD COLUMN IF NOT EXISTS score_attendance smallint;
+ALTER TABLE members ADD COLUMN IF NOT EXISTS score_speeches   smallint;
+ALTER TABLE members ADD COLUMN IF NOT EXISTS score_questions  smallint;
+ALTER TABLE members ADD COLUMN IF NOT EXISTS score_bills      smallint;
+ALTER TABLE members ADD COLUMN IF NOT EXISTS score_committee  smallint;
+ALTER TABLE members ADD COLUMN IF NOT EXISTS score_total      smallint;
+
+COMMENT ON COLUMN members.score_total IS '活動スコア合計（calculator.py。出席系指標は未収集のため除く）';
@@ -0,0 +1,30 @@
+-- ============================================================
+-- Migration 018: member_percentiles（院・政党・選挙区分内のパーセンタイル）
+-- ============================================================
+-- 議員ページの比較表示のために Web が全議員の members 行を取得していたのを、
+-- 1議員1行の事前計算結果を読むだけにする。
+-- 書き込み: apps/collector/processors/scoring.py の update_member_percentiles()
+--
+-- house / party / election_type の各列は次の形式の jsonb（グループ値が NULL の議員は NULL）:
+--   {"group": "衆議院", "n": 465,
+--    "metrics": {"session_count": {"pct": 87.5, "max": 812}, ...}}
+--   pct = グループ内で値が自分以下の議員の割合（%）、max = グループ内の最大値
+-- global_max は全議員での各カウンターの最大値（レーダーチャートの正規化用）:
+--   {"session_count": 812, "question_count": 95, ...}
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS member_percentiles (
+    member_id     text PRIMARY KEY REFERENCES members(id) ON DELETE CASCADE,
+    house         jsonb,
+    party         jsonb,
+    election_type jsonb,
+    global_max    jsonb NOT NULL,
+    updated_at    timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE member_percentiles IS '議員ごとのカウンターのパーセンタイル（scoring.py が日次で再計算）';
+
+ALTER TABLE member_percentiles ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON member_percentiles;
+CREATE POLICY "public read" ON member_percentiles FOR SELECT USING (true);
@@ -0,0 +1,24 @@
+-- ============================================================
+-- Migration 019: member_vote_stats（議員別の採決集計）
+-- ============================================================
+-- 議員ページが votes に count: "exact" のクエリを4本（合計・賛成・反対・欠席）
+-- 発行していたのを、事前集計した1行の主キー参照に置き換える。
+-- 書き込み: apps/collector/sources/votes.py の update_member_vote_stats()
+--           （collect_sessions の最後に votes を1回走査して全議員分を upsert）
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS member_vote_stats (
+    member_id  text PRIMARY KEY REFERENCES members(id) ON DELETE CASCADE,
+    total      integer NOT NULL DEFAULT 0,
+    yea        integer NOT NULL DEFAULT 0,   -- 賛成
+    nay        integer NOT NULL DEFAULT 0,   -- 反対
+    absent     integer NOT NULL DEFAULT 0,   -- 欠席（投票なし）
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE member_vote_stats IS '議員別の採決集計（votes.py が収集後に再計算）';
+
+ALTER TABLE member_vote_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON member_vote_stats;
+CREATE POLICY "public read" ON member_vote_stats FOR SELECT USING (true);
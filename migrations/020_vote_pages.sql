@@ -0,0 +1,25 @@
+-- ============================================================
+-- Migration 020: vote_pages（取り込み済み参院投票ページの記録）
+-- ============================================================
+-- votes.py が毎回 208回以降の全投票ページを取得・再解析していたのを、
+-- 未取り込みのページだけ取得するようにするためのマニフェスト。
+-- 書き込み: apps/collector/sources/votes.py の collect_sessions()
+--
+-- 各回次の索引ページ（vote_ind.htm）も1行として記録し、
+-- content_hash が前回と同じ回次は投票ページの取得自体をスキップする。
+-- record_count は投票ページなら取り込んだ votes 行数、索引ページなら投票ページ数。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS vote_pages (
+    url          text PRIMARY KEY,
+    session      integer NOT NULL,
+    content_hash text NOT NULL,          -- 本文の SHA-256
+    record_count integer NOT NULL DEFAULT 0,
+    fetched_at   timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_vote_pages_session ON vote_pages (session);
+
+COMMENT ON TABLE vote_pages IS '取り込み済みの参院投票ページ（votes.py のマニフェスト）';
+
+ALTER TABLE vote_pages ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,27 @@
+-- ============================================================
+-- Migration 021: party_vote_alignment_breakdowns（回次別・年別の政党間一致率）
+-- ============================================================
+-- party_vote_alignments（全期間）と同じ算出方法で、採決を回次または採決年で
+-- 区切った一致率を保持する。多数決は (期間, 案件名) ごとに決める。
+-- 書き込み: apps/collector/sources/vote_alignment.py の compute_alignment()
+--
+-- period_type: 'session'（period = 国会回次）| 'year'（period = 西暦年）
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS party_vote_alignment_breakdowns (
+    party_a        text    NOT NULL,
+    party_b        text    NOT NULL,
+    period_type    text    NOT NULL CHECK (period_type IN ('session', 'year')),
+    period         integer NOT NULL,
+    alignment_rate real    NOT NULL,
+    sample_size    integer NOT NULL,
+    updated_at     timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (party_a, party_b, period_type, period)
+);
+
+COMMENT ON TABLE party_vote_alignment_breakdowns IS '政党間採決一致率の回次別・年別内訳（vote_alignment.py が算出）';
+
+ALTER TABLE party_vote_alignment_breakdowns ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON party_vote_alignment_breakdowns;
+CREATE POLICY "public read" ON party_vote_alignment_breakdowns FOR SELECT USING (true);
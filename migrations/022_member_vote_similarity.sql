@@ -0,0 +1,23 @@
+-- ============================================================
+-- Migration 022: member_vote_similarity（参院議員間の採決一致率 上位・下位）
+-- ============================================================
+-- 書き込み: apps/collector/sources/member_similarity.py の compute_similarity()
+--
+-- most_similar / least_similar は一致率の高い順・低い順に最大5名:
+--   [{"member_id": "...", "party": "...", "agreement_rate": 0.9731, "sample_size": 412}, ...]
+-- 共通の採決（賛成・反対のみ）が20件未満の相手は候補にしない。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS member_vote_similarity (
+    member_id     text PRIMARY KEY REFERENCES members(id) ON DELETE CASCADE,
+    most_similar  jsonb NOT NULL DEFAULT '[]',
+    least_similar jsonb NOT NULL DEFAULT '[]',
+    updated_at    timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE member_vote_similarity IS '参院議員ごとの採決一致率 上位・下位の議員（member_similarity.py が算出）';
+
+ALTER TABLE member_vote_similarity ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON member_vote_similarity;
+CREATE POLICY "public read" ON member_vote_similarity FOR SELECT USING (true);
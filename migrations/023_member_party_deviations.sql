@@ -0,0 +1,28 @@
+-- ============================================================
+-- Migration 023: member_party_deviations（参院議員の党方針離反）
+-- ============================================================
+-- 書き込み: apps/collector/sources/party_deviation.py の compute_deviations()
+--
+-- 党方針は同一会派議員の80%以上が同じ投票をした採決についてのみ推定する
+-- （party_whip.infer_party_stance_from_voting_pattern と同じ基準）。
+-- judged_votes = 党方針が推定でき、欠席でなかった投票数（離反率の分母）
+-- deviations は新しい順:
+--   [{"bill_title": "...", "session_number": 217, "vote_date": "2025-06-20",
+--     "party_stance": "賛成", "actual_vote": "反対"}, ...]
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS member_party_deviations (
+    member_id       text PRIMARY KEY REFERENCES members(id) ON DELETE CASCADE,
+    party           text NOT NULL,
+    deviation_count integer NOT NULL DEFAULT 0,
+    judged_votes    integer NOT NULL DEFAULT 0,
+    deviations      jsonb NOT NULL DEFAULT '[]',
+    updated_at      timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE member_party_deviations IS '参院議員ごとの党方針離反票（party_deviation.py が算出）';
+
+ALTER TABLE member_party_deviations ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON member_party_deviations;
+CREATE POLICY "public read" ON member_party_deviations FOR SELECT USING (true);
@@ -0,0 +1,35 @@
+-- ============================================================
+-- Migration 024: 政党間一致率の差分更新用の状態
+-- ============================================================
+-- vote_alignment.py の update_alignment() は、前回以降に取り込まれた
+-- vote_pages（fetched_at）の採決だけ多数決を再計算し、ペアカウンターに差分を反映する。
+--
+-- vote_alignment_majorities       : 投票ページ×政党の多数決（+1=賛成 / −1=反対）
+--                                   1ページ＝1採決のため vote_pages.url をキーにする
+-- vote_alignment_pairs            : 政党ペアごとの比較件数・一致件数（party_a < party_b）
+--
+-- 書き込み: apps/collector/sources/vote_alignment.py
+--   （compute_alignment() が全件再計算で置換、apply_alignment_deltas() が差分更新）
+-- 内部状態のため公開読み取りポリシーは付けない。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS vote_alignment_majorities (
+    page_url text     NOT NULL REFERENCES vote_pages(url) ON DELETE CASCADE,
+    party    text     NOT NULL,
+    majority smallint NOT NULL CHECK (majority IN (-1, 1)),
+    PRIMARY KEY (page_url, party)
+);
+
+CREATE TABLE IF NOT EXISTS vote_alignment_pairs (
+    party_a    text    NOT NULL,
+    party_b    text    NOT NULL,
+    both_count integer NOT NULL,
+    same_count integer NOT NULL,
+    PRIMARY KEY (party_a, party_b)
+);
+
+COMMENT ON TABLE vote_alignment_majorities IS '政党間一致率の差分更新用: 投票ページ×政党の多数決';
+COMMENT ON TABLE vote_alignment_pairs IS '政党間一致率の差分更新用: 政党ペアの比較件数・一致件数';
+
+ALTER TABLE vote_alignment_majorities ENABLE ROW LEVEL SECURITY;
+ALTER TABLE vote_alignment_pairs ENABLE ROW LEVEL SECURITY;
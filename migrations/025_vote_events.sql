@@ -0,0 +1,82 @@
+-- ============================================================
+-- Migration 025: vote_events（採決ごとの整数 ID）
+-- ============================================================
+-- 採決（参院本会議の投票ページ）ごとに1行を持ち、votes の各行は event_id で参照する。
+-- 集計（vote_alignment / member_similarity / party_deviation）は長い案件名の
+-- 文字列ではなく event_id で採決を区別する。同じ案件名でも回次が違えば別の採決になる。
+--
+-- votes.bill_title / vote_date / session_number は Web 側の一覧表示用に残す。
+-- 採決は votes.id（回次・案件名・議員のハッシュ）と同じく (session, bill_title) で一意。
+-- url は最後に取り込んだ投票ページ、fetched_at は最後に取り込んだ日時
+-- （vote_alignment の差分更新がこの列で変更された採決を探す）。
+--
+-- 書き込み: apps/collector/sources/votes.py の collect_sessions()
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS vote_events (
+    id         integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    house      text    NOT NULL DEFAULT '参議院',
+    session    integer NOT NULL,
+    bill_title text    NOT NULL,
+    vote_date  date,
+    url        text,
+    fetched_at timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (session, bill_title)
+);
+
+CREATE INDEX IF NOT EXISTS idx_vote_events_fetched_at ON vote_events (fetched_at);
+
+COMMENT ON TABLE vote_events IS '採決（参院本会議の投票ページ）ごとの整数 ID・回次・採決日・案件名';
+
+-- 既存の votes から採決を登録
+INSERT INTO vote_events (house, session, bill_title, vote_date)
+SELECT '参議院', session_number, bill_title, min(vote_date)
+FROM votes
+WHERE session_number IS NOT NULL AND bill_title IS NOT NULL
+GROUP BY session_number, bill_title
+ON CONFLICT (session, bill_title) DO NOTHING;
+
+ALTER TABLE votes ADD COLUMN IF NOT EXISTS event_id integer REFERENCES vote_events(id) ON DELETE CASCADE;
+
+UPDATE votes v
+SET event_id = e.id
+FROM vote_events e
+WHERE v.event_id IS NULL
+  AND v.session_number = e.session
+  AND v.bill_title = e.bill_title;
+
+CREATE INDEX IF NOT EXISTS idx_votes_event_id ON votes (event_id);
+
+ALTER TABLE vote_events ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON vote_events;
+CREATE POLICY "public read" ON vote_events FOR SELECT USING (true);
+
+-- ------------------------------------------------------------
+-- 政党間一致率の多数決のキーを投票ページ URL（Migration 024）から event_id に移す
+-- 既存の採決は URL を持たず（url は次回の取り込みで入る）行を対応付けられないため、
+-- 多数決は空にして移す。update_alignment() はウォーターマーク
+-- （alignment_events_watermark）が未設定なら全件再計算し、多数決とペアカウンターを置き換える。
+-- ------------------------------------------------------------
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+         WHERE table_schema = 'public'
+           AND table_name = 'vote_alignment_majorities'
+           AND column_name = 'page_url'
+    ) THEN
+        TRUNCATE vote_alignment_majorities;
+        ALTER TABLE vote_alignment_majorities
+            DROP CONSTRAINT vote_alignment_majorities_pkey,
+            DROP COLUMN page_url,
+            ADD COLUMN event_id integer NOT NULL REFERENCES vote_events(id) ON DELETE CASCADE,
+            ADD PRIMARY KEY (event_id, party);
+    END IF;
+END;
+$$;
+
+COMMENT ON TABLE vote_alignment_majorities IS '政党間一致率の差分更新用: 採決×政党の多数決';
+
+-- Migration 024 時点のウォーターマーク（vote_pages.fetched_at）は使わない
+DELETE FROM site_settings WHERE key = 'alignment_pages_watermark';
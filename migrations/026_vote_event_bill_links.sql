@@ -0,0 +1,14 @@
+-- ============================================================
+-- Migration 026: vote_events.bill_id（採決と法案の紐付け）
+-- ============================================================
+-- 参院の採決（vote_events）の案件名を bills の法案名と照合し、対応する法案 ID を保持する。
+-- Web 側は votes → vote_events!inner(bill_id) で法案ごとの議員の賛否を引ける。
+--
+-- bill_match_score: 正規化した名前の文字 bigram 集合の Dice 係数（0〜1）
+-- 書き込み: apps/collector/sources/vote_bill_links.py の link_vote_events()
+-- ============================================================
+
+ALTER TABLE vote_events ADD COLUMN IF NOT EXISTS bill_id text REFERENCES bills(id) ON DELETE SET NULL;
+ALTER TABLE vote_events ADD COLUMN IF NOT EXISTS bill_match_score real;
+
+CREATE INDEX IF NOT EXISTS idx_vote_events_bill_id ON vote_events (bill_id);
@@ -0,0 +1,27 @@
+-- ============================================================
+-- Migration 027: bills.kaiji_status（kaijiページの生ステータス）
+-- ============================================================
+-- bills.py の collect_bills() は kaiji 行を保存済みの bills 行と比較し、
+-- 生ステータスが変わった法案（と新規・提出者未取得の議員立法）だけ keika ページを取得する。
+-- status は正規化後の値（本院議了 → 廃案 など）のため、比較用に生の値を別に保持する。
+-- NULL の既存行は次回の収集で1回だけ keika を取得して埋まる。
+--
+-- bills_skipped: 参院送り（本院議了・衆院可決）でスキップした衆法は bills に保存しないため、
+--                kaiji_status をここに1法案1行で持ち、同じく差分の対象にする。
+--                対象会期の kaiji に現れなくなった行・スキップでなくなった行は削除する。
+-- ============================================================
+
+ALTER TABLE bills ADD COLUMN IF NOT EXISTS kaiji_status text;
+
+CREATE TABLE IF NOT EXISTS bills_skipped (
+    id             text PRIMARY KEY,          -- bills.id と同じ形式
+    session_number integer NOT NULL,
+    kaiji_status   text    NOT NULL,
+    updated_at     timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_bills_skipped_session ON bills_skipped (session_number);
+
+COMMENT ON TABLE bills_skipped IS '参院送りで bills に保存しない衆法の kaiji_status（bills.py の差分用）';
+
+ALTER TABLE bills_skipped ENABLE ROW LEVEL SECURITY;
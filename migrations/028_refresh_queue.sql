@@ -0,0 +1,96 @@
+-- ============================================================
+-- Migration 028: refresh_queue（未確定レコードの再確認キュー）
+-- ============================================================
+-- 目的: 答弁書の受領・請願の結果は登録後に確定するため、これまでは
+--       回次ごとの全件再スクレイプでしか拾えなかった。未確定のレコードだけを
+--       キューに持ち、指数バックオフで再確認する。
+--
+-- 未確定の条件（TG_ARGV[0] の列が NULL）:
+--   questions          answered_at IS NULL（答弁書未受領）
+--   petitions          result IS NULL（結果未定）
+--   sangiin_petitions  result IS NULL（結果未定）
+--
+-- トリガーがキューを保守する:
+--   INSERT / UPDATE で未確定 → キューに追加（既にあればそのまま。バックオフ状態を保つ）
+--   UPDATE で確定 / DELETE   → キューから削除
+-- 新規レコードは日次収集でも再取得されるため、最初の再確認は1日後から。
+--
+-- 消費側: apps/collector/sources/refresh_queue.py の refresh_pending()
+--   next_check_at が来たものを古い順に REFRESH_PAGE_BUDGET ページ分だけ再確認し、
+--   未確定のままなら attempts を増やして next_check_at を延ばす。
+-- 内部状態のため公開読み取りポリシーは付けない。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS refresh_queue (
+    source          text        NOT NULL,   -- 対象テーブル名
+    record_id       text        NOT NULL,   -- 対象テーブルの id
+    attempts        integer     NOT NULL DEFAULT 0,
+    enqueued_at     timestamptz NOT NULL DEFAULT now(),
+    next_check_at   timestamptz NOT NULL DEFAULT now() + interval '1 day',
+    last_checked_at timestamptz,
+    PRIMARY KEY (source, record_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_queue_due ON refresh_queue (next_check_at, enqueued_at);
+
+COMMENT ON TABLE refresh_queue IS '答弁・結果が未確定のレコードの再確認キュー（refresh_queue.py が消費）';
+
+ALTER TABLE refresh_queue ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION refresh_queue_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM refresh_queue WHERE source = TG_TABLE_NAME AND record_id = OLD.id;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE'
+       AND (to_jsonb(NEW) ->> TG_ARGV[0]) IS NOT DISTINCT FROM (to_jsonb(OLD) ->> TG_ARGV[0]) THEN
+        RETURN NULL;
+    END IF;
+
+    IF (to_jsonb(NEW) ->> TG_ARGV[0]) IS NULL THEN
+        INSERT INTO refresh_queue (source, record_id) VALUES (TG_TABLE_NAME, NEW.id)
+        ON CONFLICT (source, record_id) DO NOTHING;
+    ELSE
+        DELETE FROM refresh_queue WHERE source = TG_TABLE_NAME AND record_id = NEW.id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_questions_refresh_queue ON questions;
+CREATE TRIGGER trg_questions_refresh_queue
+AFTER INSERT OR UPDATE OR DELETE ON questions
+FOR EACH ROW EXECUTE FUNCTION refresh_queue_sync('answered_at');
+
+DROP TRIGGER IF EXISTS trg_petitions_refresh_queue ON petitions;
+CREATE TRIGGER trg_petitions_refresh_queue
+AFTER INSERT OR UPDATE OR DELETE ON petitions
+FOR EACH ROW EXECUTE FUNCTION refresh_queue_sync('result');
+
+DROP TRIGGER IF EXISTS trg_sangiin_petitions_refresh_queue ON sangiin_petitions;
+CREATE TRIGGER trg_sangiin_petitions_refresh_queue
+AFTER INSERT OR UPDATE OR DELETE ON sangiin_petitions
+FOR EACH ROW EXECUTE FUNCTION refresh_queue_sync('result');
+
+-- ============================================================
+-- 既存の未確定レコードを投入（初回の再確認は次の実行から）
+-- ============================================================
+INSERT INTO refresh_queue (source, record_id, next_check_at)
+SELECT 'questions', id, now() FROM questions WHERE answered_at IS NULL
+ON CONFLICT (source, record_id) DO NOTHING;
+
+INSERT INTO refresh_queue (source, record_id, next_check_at)
+SELECT 'petitions', id, now() FROM petitions WHERE result IS NULL
+ON CONFLICT (source, record_id) DO NOTHING;
+
+INSERT INTO refresh_queue (source, record_id, next_check_at)
+SELECT 'sangiin_petitions', id, now() FROM sangiin_petitions WHERE result IS NULL
+ON CONFLICT (source, record_id) DO NOTHING;
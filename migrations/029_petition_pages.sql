@@ -0,0 +1,32 @@
+-- ============================================================
+-- Migration 029: 請願の差分収集（petition_pages・list_hash）
+-- ============================================================
+-- petitions.py は対象回次の一覧ページを取得したうえで、全請願の詳細ページ
+-- （衆院: 詳細 / 参院: futaku）を毎回取得していた。これを差分収集にする。
+--
+-- petition_pages        : 回次ごとの一覧ページの本文ハッシュ（vote_pages と同じ考え方）
+--                         前回と同じなら、その回次は詳細ページを1枚も取得しない
+-- petitions.list_hash   : 一覧ページ上の各請願の行（番号・件名・リンク・委員会）のハッシュ
+-- sangiin_petitions.list_hash
+--                         未登録または行が変わった請願だけ詳細ページを取得する
+-- 書き込み: apps/collector/sources/petitions.py の collect_*_petitions()
+-- 結果の確定（詳細ページのみの変化）は refresh_queue（migrations/028）が拾う。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS petition_pages (
+    url          text PRIMARY KEY,
+    house        text    NOT NULL,
+    session      integer NOT NULL,
+    content_hash text    NOT NULL,          -- 本文の SHA-256
+    record_count integer NOT NULL DEFAULT 0, -- 一覧の請願数
+    fetched_at   timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_petition_pages_session ON petition_pages (house, session);
+
+COMMENT ON TABLE petition_pages IS '取得済みの請願一覧ページ（petitions.py のマニフェスト）';
+
+ALTER TABLE petition_pages ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE petitions         ADD COLUMN IF NOT EXISTS list_hash text;
+ALTER TABLE sangiin_petitions ADD COLUMN IF NOT EXISTS list_hash text;
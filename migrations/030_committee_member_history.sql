@@ -0,0 +1,94 @@
+-- ============================================================
+-- Migration 030: committee_member_history（委員会所属の履歴）
+-- ============================================================
+-- 目的: committees.py は院ごとに committee_members を全件削除して再登録していた
+--       （毎日数千行の書き込み、入れ替え中は所属が空になる）。
+--       差分（就任・退任・役職の変更）だけを反映するようにし、
+--       その変化を valid_from / valid_to 付きの履歴として残す。
+--
+-- トリガーが committee_members の変化を履歴に記録する:
+--   INSERT                        → 在任中の行を追加（valid_to = NULL）
+--   UPDATE で委員会・役職が変化   → 在任中の行を閉じ、新しい行を追加
+--   UPDATE で member_id・氏名のみ → 在任中の行をそのまま更新（在任期間は続く）
+--   DELETE                        → 在任中の行を閉じる
+-- 日付は日本時間の日付。同日に閉じた行は valid_from = valid_to になりうる。
+--
+-- 書き込み: apps/collector/sources/committees.py の _sync_house()
+-- 既存の所属はこの migration の適用日を valid_from として投入する（それ以前は不明）。
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS committee_member_history (
+    id            bigserial PRIMARY KEY,
+    membership_id text NOT NULL,          -- committee_members.id
+    house         text NOT NULL,
+    committee     text,
+    member_id     text,
+    name          text,
+    role          text,
+    valid_from    date NOT NULL,
+    valid_to      date                    -- NULL は在任中
+);
+
+CREATE INDEX IF NOT EXISTS idx_committee_member_history_member ON committee_member_history (member_id, valid_from);
+CREATE INDEX IF NOT EXISTS idx_committee_member_history_committee ON committee_member_history (house, committee, valid_from);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_committee_member_history_open
+    ON committee_member_history (membership_id) WHERE valid_to IS NULL;
+
+COMMENT ON TABLE committee_member_history IS '委員会所属の在任期間（committee_members のトリガーが記録）';
+
+ALTER TABLE committee_member_history ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "public read" ON committee_member_history;
+CREATE POLICY "public read" ON committee_member_history FOR SELECT USING (true);
+
+CREATE OR REPLACE FUNCTION committee_member_history_sync()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    today date := (now() AT TIME ZONE 'Asia/Tokyo')::date;
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.committee IS NOT DISTINCT FROM OLD.committee
+       AND NEW.role      IS NOT DISTINCT FROM OLD.role
+       AND NEW.house     IS NOT DISTINCT FROM OLD.house THEN
+        IF NEW.member_id IS DISTINCT FROM OLD.member_id OR NEW.name IS DISTINCT FROM OLD.name THEN
+            UPDATE committee_member_history
+               SET member_id = NEW.member_id, name = NEW.name
+             WHERE membership_id = NEW.id AND valid_to IS NULL;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE committee_member_history
+           SET valid_to = today
+         WHERE membership_id = OLD.id AND valid_to IS NULL;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO committee_member_history (membership_id, house, committee, member_id, name, role, valid_from)
+        VALUES (NEW.id, NEW.house, NEW.committee, NEW.member_id, NEW.name, NEW.role, today);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_committee_member_history ON committee_members;
+CREATE TRIGGER trg_committee_member_history
+AFTER INSERT OR UPDATE OR DELETE ON committee_members
+FOR EACH ROW EXECUTE FUNCTION committee_member_history_sync();
+
+-- ============================================================
+-- 既存の所属を在任中として投入
+-- ============================================================
+INSERT INTO committee_member_history (membership_id, house, committee, member_id, name, role, valid_from)
+SELECT cm.id, cm.house, cm.committee, cm.member_id, cm.name, cm.role, (now() AT TIME ZONE 'Asia/Tokyo')::date
+  FROM committee_members cm
+ WHERE NOT EXISTS (
+       SELECT 1 FROM committee_member_history h
+        WHERE h.membership_id = cm.id AND h.valid_to IS NULL
+   );
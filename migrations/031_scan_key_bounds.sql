@@ -0,0 +1,38 @@
+-- ============================================================
+-- Migration 031: scan_key_bounds 関数（分割走査の境界値）
+-- ============================================================
+-- 目的: db.fetch_columns() はキー範囲を分割して並行走査する。その境界値を
+--       .order(key).range(o, o) の OFFSET 1行取得で標本化していたため、
+--       speeches ではテーブルの 7/8 まで OFFSET でインデックスを辿っていた
+--       （OFFSET 不使用で statement timeout を避ける方針に反する）。
+--       統計情報（pg_stats.histogram_bounds）から境界値を選ぶようにし、
+--       テーブル本体は読まない。
+--
+-- 戻り値: {"rows": 推定行数（pg_class.reltuples、未 ANALYZE なら -1）,
+--          "bounds": key 列のヒストグラム境界（昇順の text 配列、統計がなければ null）}
+-- ヒストグラムは ANALYZE 時点の標本のため、境界は行数の目安にすぎない。
+-- 範囲外に増えた行は最後の範囲（上限なし）が拾う。
+-- 呼び出し側: apps/collector/db.py の _key_bounds()
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION scan_key_bounds(p_table text, p_key text)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT jsonb_build_object(
+        'rows', (
+            SELECT c.reltuples::bigint
+              FROM pg_catalog.pg_class c
+             WHERE c.oid = to_regclass(format('public.%I', p_table))
+        ),
+        'bounds', (
+            SELECT to_jsonb(s.histogram_bounds::text::text[])
+              FROM pg_catalog.pg_stats s
+             WHERE s.schemaname = 'public' AND s.tablename = p_table AND s.attname = p_key
+        )
+    );
+$$;
+
+REVOKE EXECUTE ON FUNCTION scan_key_bounds(text, text) FROM PUBLIC, anon, authenticated;
@@ -20,6 +20,7 @@ import logging
 import time
 from typing import Optional
 import httpx
+import numpy as np
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,58 @@ def infer_party_stance_from_voting_pattern(
     return None  # 判定不能（党内で割れている）
 
 
+# ─── 一括判定（NumPy） ────────────────────────────────────────
+# 全政党×全法案の党方針推定と離反判定を1回のベクトル演算で行う。
+# 判定基準は infer_party_stance_from_voting_pattern / find_deviations と同じ。
+
+STANCE_THRESHOLD = 0.80   # 党方針とみなす同一投票の割合
+STANCE_MIN_VOTES = 3      # これ未満の政党は推定しない
+
+# 投票・党方針の符号（0 は方針不明、または賛成・反対以外の投票）
+CHOICE_SIGN = {"賛成": 1, "反対": -1}
+
+
+def infer_party_stances(
+    party: np.ndarray,
+    bill: np.ndarray,
+    sign: np.ndarray,
+    n_parties: int,
+    n_bills: int,
+) -> np.ndarray:
+    """
+    全投票（政党コード・法案コード・CHOICE_SIGN の符号）から政党×法案の党方針行列を返す。
+    +1 = 賛成、−1 = 反対、0 = 判定不能（サンプル不足・党内で割れている）。
+    分母は欠席・棄権を含むその政党の全投票数。
+    """
+    cell = party.astype(np.int64) * n_bills + bill
+    size = n_parties * n_bills
+    total = np.bincount(cell, minlength=size).reshape(n_parties, n_bills)
+    yes = np.bincount(cell, weights=sign == 1, minlength=size).reshape(n_parties, n_bills)
+    no = np.bincount(cell, weights=sign == -1, minlength=size).reshape(n_parties, n_bills)
+    enough = total >= STANCE_MIN_VOTES
+    denom = np.maximum(total, 1)
+    return np.select(
+        [enough & (yes / denom >= STANCE_THRESHOLD), enough & (no / denom >= STANCE_THRESHOLD)],
+        [1, -1],
+        0,
+    ).astype(np.int8)
+
+
+def find_deviations_batch(
+    stances: np.ndarray,
+    party: np.ndarray,
+    bill: np.ndarray,
+    sign: np.ndarray,
+    is_absent: np.ndarray,
+) -> np.ndarray:
+    """
+    各投票が党方針からの離反かどうかの真偽配列を返す。
+    欠席は離反扱いしない。棄権（符号 0）は方針が判定できていれば離反。
+    """
+    stance = stances[party, bill]
+    return (stance != 0) & ~is_absent & (sign != stance)
+
+
 def find_deviations(
     bill_id: str,
     bill_name: str,
@@ -140,3 +193,33 @@ def scrape_ldp_statements(keyword: str) -> list[dict]:
     except Exception as e:
         logger.warning(f"自民党サイトスクレイピング失敗: {e}")
         return []
+
+
+# ─── テスト用 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    # 一括版とスカラー版の一致確認
+    rng = np.random.default_rng(0)
+    choices = np.array(["賛成", "反対", "欠席", "棄権"])
+    n = 5000
+    party = rng.integers(0, 6, n)
+    bill = rng.integers(0, 80, n)
+    # 政党ごとに賛成寄り・反対寄りの偏りを持たせる
+    bias = rng.random((6, 80))
+    picked = np.where(rng.random(n) < 0.85, np.where(bias[party, bill] < 0.5, 0, 1), rng.integers(0, 4, n))
+    choice = choices[picked]
+    sign = np.array([CHOICE_SIGN.get(c, 0) for c in choice])
+
+    stances = infer_party_stances(party, bill, sign, 6, 80)
+    flags = find_deviations_batch(stances, party, bill, sign, choice == "欠席")
+    label = {1: "賛成", -1: "反対", 0: None}
+    for b in range(80):
+        votes = [{"member_id": str(i), "member_name": str(i), "party": int(party[i]), "choice": choice[i]}
+                 for i in np.flatnonzero(bill == b)]
+        for p in range(6):
+            stance = infer_party_stance_from_voting_pattern(str(b), p, votes)
+            assert label[int(stances[p, b])] == stance, (b, p)
+            expected = {d["member_id"] for d in find_deviations(str(b), "", stance, p, "inferred", votes)} if stance else set()
+            got = {str(i) for i in np.flatnonzero((bill == b) & (party == p) & flags)}
+            assert got == expected, (b, p)
+    print(f"一括版: {n} 票 スカラー版と一致（離反 {int(flags.sum())} 票）")
+